@@ -1,20 +1,246 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import grpc
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
+from qdrant_client.http.exceptions import UnexpectedResponse
 from sentence_transformers import SentenceTransformer
 from loguru import logger
-from typing import List, Dict, Optional
+from typing import Any, Iterable, List, Dict, Optional, Sequence, Tuple, Union
+import math
 import numpy as np
 from app.core.settings import settings
+from app.utils.embedding_text import EMBED_MODEL_NAME, build_movie_text, embedding_text_hash
+from app.utils.genres import split_genres
+
+
+# Payload fields copied from the movie (plus "text_hash")
+PAYLOAD_FIELDS = [
+    "id", "tmdb_id", "title", "overview", "genres", "original_language",
+    "release_year", "popularity", "poster_path",
+]
+
+
+# Payload indexes backing the filters of `search_similar` (and tmdb_id lookups)
+PAYLOAD_INDEXES = {
+    "genres": models.PayloadSchemaType.KEYWORD,
+    "original_language": models.PayloadSchemaType.KEYWORD,
+    "release_year": models.PayloadSchemaType.INTEGER,
+    "popularity": models.PayloadSchemaType.FLOAT,
+    "tmdb_id": models.PayloadSchemaType.INTEGER,
+}
+
+
+def _plain(value: Any):
+    """numpy scalars -> Python, NaN -> None (JSON-safe payload values)."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+# --------------------------
+# Collection schema (settings.qdrant.hnsw / quantization)
+# --------------------------
+def hnsw_config() -> models.HnswConfigDiff:
+    cfg = settings.qdrant.hnsw
+    return models.HnswConfigDiff(m=cfg.m, ef_construct=cfg.ef_construct, full_scan_threshold=cfg.full_scan_threshold)
+
+
+def quantization_config(mode: Optional[str] = None):
+    """'scalar' (int8), 'product' (x16) or 'none' -> Qdrant quantization config (None when off)."""
+    cfg = settings.qdrant.quantization
+    mode = (mode or cfg.mode).lower()
+    if mode == "scalar":
+        return models.ScalarQuantization(scalar=models.ScalarQuantizationConfig(
+            type=models.ScalarType.INT8, quantile=cfg.quantile, always_ram=cfg.always_ram,
+        ))
+    if mode == "product":
+        return models.ProductQuantization(product=models.ProductQuantizationConfig(
+            compression=models.CompressionRatio.X16, always_ram=cfg.always_ram,
+        ))
+    if mode == "none":
+        return None
+    raise ValueError(f"Unknown quantization mode '{mode}'")
+
+
+def search_params(
+    mode: Optional[str] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: bool = False,
+) -> Optional[models.SearchParams]:
+    """Per-call search params: HNSW ef / exact, and rescoring of quantized candidates."""
+    cfg = settings.qdrant.quantization
+    quantization = None
+    if (mode or cfg.mode).lower() != "none":
+        quantization = models.QuantizationSearchParams(rescore=cfg.rescore, oversampling=cfg.oversampling)
+    if quantization is None and hnsw_ef is None and not exact:
+        return None
+    return models.SearchParams(quantization=quantization, hnsw_ef=hnsw_ef, exact=exact)
+
+
+def candidate_ef(top: int) -> int:
+    """HNSW ef for a candidate pool of `top`: enough beam for recall, capped for latency."""
+    cfg = settings.qdrant.search
+    return min(max(cfg.ef_min, int(top * cfg.ef_factor)), cfg.ef_max)
+
+
+def create_movie_collection(
+    client: QdrantClient,
+    name: str,
+    vector_size: int,
+    quantization: Optional[str] = None,
+    payload_indexes: bool = True,
+):
+    """Create a movie collection with the configured HNSW / quantization and payload indexes."""
+    client.create_collection(
+        collection_name=name,
+        vectors_config=models.VectorParams(size=vector_size, distance=models.Distance.COSINE),
+        hnsw_config=hnsw_config(),
+        quantization_config=quantization_config(quantization),
+        on_disk_payload=True,
+    )
+    if payload_indexes:
+        ensure_payload_indexes(client, name)
+
+
+def ensure_payload_indexes(client: QdrantClient, name: str) -> List[str]:
+    """Create the PAYLOAD_INDEXES missing on a collection; returns the created fields."""
+    existing = client.get_collection(name).payload_schema or {}
+    created = []
+    for field, schema in PAYLOAD_INDEXES.items():
+        if field in existing:
+            continue
+        client.create_payload_index(collection_name=name, field_name=field, field_schema=schema, wait=True)
+        created.append(field)
+    if created:
+        logger.info(f"🗂️ Created payload indexes on '{name}': {created}")
+    return created
+
+
+def collection_config_drift(client: QdrantClient, name: str) -> Dict[str, bool]:
+    """Which of the collection's HNSW / quantization settings differ from settings."""
+    info = client.get_collection(name)
+    wanted_hnsw = hnsw_config()
+    current_hnsw = info.config.hnsw_config
+    hnsw_changed = (current_hnsw.m, current_hnsw.ef_construct, current_hnsw.full_scan_threshold) != (
+        wanted_hnsw.m, wanted_hnsw.ef_construct, wanted_hnsw.full_scan_threshold,
+    )
+
+    wanted_quant = quantization_config()
+    current_quant = info.config.quantization_config
+    quant_changed = type(current_quant) is not type(wanted_quant) or (
+        wanted_quant is not None and current_quant.model_dump() != wanted_quant.model_dump()
+    )
+    return {"hnsw": hnsw_changed, "quantization": quant_changed}
+
+
+def sync_collection_config(client: QdrantClient, name: str) -> Dict[str, bool]:
+    """
+    Apply settings changes (HNSW, quantization) to an existing collection.
+    Qdrant rebuilds the index / quantized vectors in the background, so this
+    is only run on request (`reindex_qdrant --sync-config`), never at startup.
+    """
+    drift = collection_config_drift(client, name)
+    if any(drift.values()):
+        wanted_quant = quantization_config()
+        client.update_collection(
+            collection_name=name,
+            hnsw_config=hnsw_config() if drift["hnsw"] else None,
+            quantization_config=(wanted_quant or models.Disabled.DISABLED) if drift["quantization"] else None,
+        )
+        logger.info(f"⚙️ Updated '{name}' config (hnsw: {drift['hnsw']}, quantization: {drift['quantization']})")
+    return drift
+
+
+def build_filter(filters: Optional[Dict]) -> Optional[models.Filter]:
+    """
+    {"genres": [...], "original_language": [...], "release_year": {"gte", "lte"}, key: value}
+    -> Qdrant filter (lists match any, gte/lte dicts are ranges, the rest exact).
+    """
+    if not filters:
+        return None
+    must = []
+
+    for key, val in filters.items():
+
+        # LIST MATCH (genres, language)
+        if isinstance(val, list):
+            must.append(
+                models.FieldCondition(
+                    key=key,
+                    match=models.MatchAny(any=val)
+                )
+            )
+
+        # RANGE MATCH (release_year)
+        elif isinstance(val, dict) and ("gte" in val or "lte" in val):
+            must.append(
+                models.FieldCondition(
+                    key=key,
+                    range=models.Range(
+                        gte=val.get("gte"),
+                        lte=val.get("lte"),
+                    )
+                )
+            )
+
+        # EXACT MATCH
+        else:
+            must.append(
+                models.FieldCondition(
+                    key=key,
+                    match=models.MatchValue(value=val)
+                )
+            )
+
+    return models.Filter(must=must)
+
+
+def merge_hits(
+    batches: Iterable[List[Dict]],
+    exclude: Iterable[int] = (),
+    limit: Optional[int] = None,
+    agg: str = "max",
+) -> Tuple[List[int], List[float]]:
+    """
+    Merge the hit lists of several seeds into one ranking: per movie the best
+    ("max") or summed ("sum") score, `exclude`d ids dropped, best first.
+    """
+    pairs = [(h["id"], h["score"]) for hits in batches for h in hits]
+    if not pairs:
+        return [], []
+    ids = np.fromiter((p[0] for p in pairs), dtype=np.int64, count=len(pairs))
+    scores = np.fromiter((p[1] for p in pairs), dtype=np.float32, count=len(pairs))
+
+    exclude = np.fromiter(exclude, dtype=np.int64)
+    if exclude.size:
+        keep = ~np.isin(ids, exclude)
+        ids, scores = ids[keep], scores[keep]
+
+    uniq, inverse = np.unique(ids, return_inverse=True)
+    if agg == "sum":
+        merged = np.zeros(len(uniq), dtype=np.float32)
+        np.add.at(merged, inverse, scores)
+    else:
+        merged = np.full(len(uniq), -np.inf, dtype=np.float32)
+        np.maximum.at(merged, inverse, scores)
+
+    order = np.argsort(-merged, kind="stable")[:limit]
+    return uniq[order].tolist(), merged[order].tolist()
 
 
 class Qdrant:
     def __init__(self):
         self.client = QdrantClient(
             url=settings.qdrant.url,
+            # gRPC: binary protobuf instead of JSON, cheaper for large id/score responses
+            prefer_grpc=settings.qdrant.prefer_grpc,
+            grpc_port=settings.qdrant.grpc_port,
         )
 
         # Sentence-transformer for movie embeddings
-        self.embedding_model = SentenceTransformer("sentence-transformers/all-mpnet-base-v2")
+        self.embedding_model = SentenceTransformer(EMBED_MODEL_NAME)
         self.collection_name = settings.qdrant.collection
 
         # Ensure the collection exists
@@ -23,77 +249,211 @@ class Qdrant:
     # --------------------------
     # Collection Management
     # --------------------------
+    # `settings.qdrant.collection` is an alias onto a versioned collection
+    # (movies_v1, movies_v<timestamp>, ...) so a full reindex can build a new
+    # collection next to the live one and switch over atomically.
     def _ensure_collection(self):
-        """Ensure the Qdrant collection for movies exists and has correct config."""
-        try:
-            collection_info = self.client.get_collection(self.collection_name)
-            if collection_info.config.params.vectors.size != 768:
-                logger.warning(f"⚠️ Collection '{self.collection_name}' has incorrect vector size. Recreating...")
-                self.client.delete_collection(self.collection_name)
-                raise Exception("Collection deleted due to config mismatch")
-            
+        """Ensure the movie collection (alias) exists; never drops data."""
+        current = self.get_alias_target()
+        if current is not None or self.client.collection_exists(self.collection_name):
+            info = self.client.get_collection(current or self.collection_name)
+            if info.config.params.vectors.size != self.vector_size:
+                logger.error(
+                    f"❌ Collection '{self.collection_name}' has vector size {info.config.params.vectors.size}, "
+                    f"model produces {self.vector_size}. Run `python -m app.pipelines.data.reindex_qdrant`."
+                )
+                return
+            ensure_payload_indexes(self.client, current or self.collection_name)
+            drift = collection_config_drift(self.client, current or self.collection_name)
+            if any(drift.values()):
+                logger.warning(
+                    f"⚠️ Collection '{self.collection_name}' config differs from settings ({drift}). "
+                    f"Apply with `python -m app.pipelines.data.reindex_qdrant --sync-config` or a full reindex."
+                )
             logger.info(f"✅ Qdrant collection '{self.collection_name}' exists with correct config.")
-        except Exception:
-            logger.info(f"⚙️ Creating Qdrant collection '{self.collection_name}'...")
-            self.client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config=models.VectorParams(size=768, distance=models.Distance.COSINE),
-                on_disk_payload=True,
-            )
+            return
+
+        target = f"{self.collection_name}_v1"
+        logger.info(f"⚙️ Creating Qdrant collection '{target}' (alias '{self.collection_name}')...")
+        if not self.client.collection_exists(target):
+            self.create_movie_collection(target)
+        self.switch_alias(target)
+
+    @property
+    def vector_size(self) -> int:
+        return self.embedding_model.get_sentence_embedding_dimension()
+
+    def create_movie_collection(self, name: str):
+        """Create an empty movie collection with the current model's vector size."""
+        create_movie_collection(self.client, name, self.vector_size)
+
+    def get_alias_target(self) -> Optional[str]:
+        """Collection the alias currently points to (None if it is a plain collection or missing)."""
+        for alias in self.client.get_aliases().aliases:
+            if alias.alias_name == self.collection_name:
+                return alias.collection_name
+        return None
+
+    def has_legacy_collection(self) -> bool:
+        """True while a plain (pre-alias) collection holds the alias name."""
+        return self.get_alias_target() is None and self.client.collection_exists(self.collection_name)
+
+    def switch_alias(self, target: str, replace_legacy: bool = False) -> Optional[str]:
+        """
+        Atomically repoint the alias to `target`; returns the previous collection.
+
+        A plain (pre-alias) collection with the alias name has to be dropped
+        before the alias can be created, so search is down until the alias
+        exists. That one-off migration only runs with `replace_legacy`.
+        """
+        previous = self.get_alias_target()
+        if previous is None and self.client.collection_exists(self.collection_name):
+            if not replace_legacy:
+                raise ValueError(
+                    f"'{self.collection_name}' is a plain collection; replacing it with an alias "
+                    f"is a maintenance step (reindex_qdrant --replace-legacy)."
+                )
+            logger.warning(f"⚠️ Dropping legacy collection '{self.collection_name}' to replace it with an alias.")
+            self.client.delete_collection(self.collection_name)
+
+        operations = []
+        if previous is not None:
+            operations.append(models.DeleteAliasOperation(delete_alias=models.DeleteAlias(alias_name=self.collection_name)))
+        operations.append(models.CreateAliasOperation(create_alias=models.CreateAlias(
+            collection_name=target, alias_name=self.collection_name,
+        )))
+        self.client.update_collection_aliases(change_aliases_operations=operations)
+        logger.info(f"🔀 Alias '{self.collection_name}' -> '{target}' (was '{previous}').")
+        return previous
 
     # --------------------------
-    # Embedding Helper
+    # Embedding Helpers
     # --------------------------
-    def _build_movie_embedding(self, title: str, overview: str, genres: List[str]) -> np.ndarray:
-        """Generate a dense embedding for a movie."""
-        text = f"{title}. {overview or ''}. Genres: {', '.join(genres or [])}."
-        return self.embedding_model.encode(text, normalize_embeddings=True).tolist()
+    def _movie_payload(self, movie: Dict, text_hash: str) -> Dict:
+        payload = {key: _plain(movie.get(key)) for key in PAYLOAD_FIELDS}
+        if payload["genres"] is None or isinstance(payload["genres"], str):
+            payload["genres"] = split_genres(payload["genres"])
+        # Same types from every path (pandas turns nullable ints into floats)
+        for key in ("id", "tmdb_id", "release_year"):
+            if payload[key] is not None:
+                payload[key] = int(payload[key])
+        if payload["popularity"] is not None:
+            payload["popularity"] = float(payload["popularity"])
+        payload["text_hash"] = text_hash
+        return payload
+
+    def _stored_hashes(self, ids: List[int], collection: str) -> Dict[int, str]:
+        """text_hash of already indexed points, fetched without vectors."""
+        size = settings.qdrant.upsert_batch_size
+        hashes = {}
+        for start in range(0, len(ids), size):
+            records = self.client.retrieve(
+                collection_name=collection,
+                ids=ids[start:start + size],
+                with_payload=["text_hash"],
+                with_vectors=False,
+            )
+            for r in records:
+                if r.payload and r.payload.get("text_hash"):
+                    hashes[int(r.id)] = r.payload["text_hash"]
+        return hashes
 
     # --------------------------
     # CRUD Operations
     # --------------------------
-    def upsert_movies(self, movies: List[Dict]):
+    def upsert_movies(
+        self,
+        movies: List[Dict],
+        force: bool = False,
+        encoder=None,
+        collection: Optional[str] = None,
+    ) -> Dict[str, int]:
         """
-        Upsert multiple movie vectors into Qdrant.
-        Each movie dict should include:
-        {
-            "id": int,
-            "title": str,
-            "overview": str,
-            "genres": list[str],
-            "release_year": int,
-            "popularity": float
-        }
+        Upsert movie vectors into Qdrant. Each movie dict needs "id" plus the
+        embedding text fields (title, overview, genres, tagline, keywords,
+        original_language) and may carry the other PAYLOAD_FIELDS.
+
+        Movies whose embedding text hash matches the stored one only get their
+        payload refreshed; the rest are encoded in length-sorted batches and
+        upserted in chunks, with up to `upsert_parallel` requests in flight
+        while the next chunk is encoded. `force` re-embeds everything.
+
+        `encoder` (an EmbeddingPool) encodes chunks in worker processes instead
+        of the local model; vectors are upserted as each chunk completes.
+        `collection` targets another collection than the live alias (reindex).
         """
         if not movies:
             logger.warning("⚠️ No movies to upsert into Qdrant.")
-            return
+            return {"embedded": 0, "payload_only": 0}
 
-        logger.info(f"🚀 Upserting {len(movies)} movies into Qdrant...")
+        cfg = settings.qdrant
+        collection = collection or self.collection_name
+        movies = [{**m, "id": int(m["id"])} for m in movies]
+        texts = {m["id"]: build_movie_text(m) for m in movies}
+        hashes = {mid: embedding_text_hash(text) for mid, text in texts.items()}
+        stored = {} if force else self._stored_hashes(list(texts), collection)
 
-        vectors = []
-        payloads = []
+        to_embed = [m for m in movies if stored.get(m["id"]) != hashes[m["id"]]]
+        unchanged = [m for m in movies if stored.get(m["id"]) == hashes[m["id"]]]
+        # Similar lengths per batch -> less padding in the transformer
+        to_embed.sort(key=lambda m: len(texts[m["id"]]))
 
-        for m in movies:
-            vector = self._build_movie_embedding(m["title"], m.get("overview", ""), m.get("genres", []))
-            vectors.append(vector)
-            payloads.append({
-                "id": m["id"],
-                "title": m["title"],
-                "genres": m.get("genres", []),
-                "release_year": m.get("release_year"),
-                "popularity": m.get("popularity"),
-            })
-
-        self.client.upsert(
-            collection_name=self.collection_name,
-            points=[
-                models.PointStruct(id=m["id"], vector=vectors[i], payload=payloads[i])
-                for i, m in enumerate(movies)
-            ],
+        logger.info(
+            f"🚀 Upserting {len(movies)} movies into Qdrant "
+            f"({len(to_embed)} to embed, {len(unchanged)} payload-only)..."
         )
 
-        logger.info(f"✅ Upserted {len(movies)} movies to Qdrant.")
+        size = cfg.upsert_batch_size
+        with ThreadPoolExecutor(max_workers=cfg.upsert_parallel) as pool:
+            pending = set()
+
+            def submit(fn, **kwargs):
+                nonlocal pending
+                # Bounded: wait for a slot before queueing more requests
+                while len(pending) >= cfg.upsert_parallel:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for f in done:
+                        f.result()
+                pending.add(pool.submit(fn, collection_name=collection, **kwargs))
+
+            chunks = [to_embed[start:start + size] for start in range(0, len(to_embed), size)]
+            if not chunks:
+                encoded = iter(())
+            elif encoder is not None:
+                encoded = (
+                    (chunks[idx], vectors)
+                    for idx, vectors in encoder.encode_chunks([texts[m["id"]] for m in c] for c in chunks)
+                )
+            else:
+                encoded = (
+                    (chunk, self.embedding_model.encode(
+                        [texts[m["id"]] for m in chunk],
+                        batch_size=cfg.embed_batch_size,
+                        normalize_embeddings=True,
+                    ))
+                    for chunk in chunks
+                )
+
+            for chunk, vectors in encoded:
+                submit(self.client.upsert, points=[
+                    models.PointStruct(id=m["id"], vector=vec.tolist(), payload=self._movie_payload(m, hashes[m["id"]]))
+                    for m, vec in zip(chunk, vectors)
+                ])
+
+            for start in range(0, len(unchanged), size):
+                submit(self.client.batch_update_points, update_operations=[
+                    models.SetPayloadOperation(set_payload=models.SetPayload(
+                        payload=self._movie_payload(m, hashes[m["id"]]),
+                        points=[m["id"]],
+                    ))
+                    for m in unchanged[start:start + size]
+                ])
+
+            for f in pending:
+                f.result()
+
+        logger.info(f"✅ Upserted {len(movies)} movies to Qdrant ({len(to_embed)} embedded).")
+        return {"embedded": len(to_embed), "payload_only": len(unchanged)}
 
     def delete_movie(self, movie_id: int):
         """Delete a single movie vector from Qdrant."""
@@ -104,8 +464,8 @@ class Qdrant:
         logger.info(f"🗑️ Deleted movie {movie_id} from Qdrant.")
 
     def clear_collection(self):
-        """Delete all movie vectors (use carefully)."""
-        self.client.delete_collection(self.collection_name)
+        """Delete all movie vectors (use carefully); with an alias, its target collection."""
+        self.client.delete_collection(self.get_alias_target() or self.collection_name)
         logger.warning(f"⚠️ Collection '{self.collection_name}' deleted.")
 
     # --------------------------
@@ -125,48 +485,11 @@ class Qdrant:
         else:
             raise ValueError("Either query or movie_vector must be provided.")
 
-        qdrant_filter = None
-        if filters:
-            must = []
-
-            for key, val in filters.items():
-
-                # LIST MATCH (genres, language)
-                if isinstance(val, list):
-                    must.append(
-                        models.FieldCondition(
-                            key=key,
-                            match=models.MatchAny(any=val)
-                        )
-                    )
-
-                # RANGE MATCH (release_year)
-                elif isinstance(val, dict) and ("gte" in val or "lte" in val):
-                    must.append(
-                        models.FieldCondition(
-                            key=key,
-                            range=models.Range(
-                                gte=val.get("gte"),
-                                lte=val.get("lte"),
-                            )
-                        )
-                    )
-
-                # EXACT MATCH
-                else:
-                    must.append(
-                        models.FieldCondition(
-                            key=key,
-                            match=models.MatchValue(value=val)
-                        )
-                    )
-
-            qdrant_filter = models.Filter(must=must)
-
         results = self.client.search(
             collection_name=self.collection_name,
             query_vector=vector,
-            query_filter=qdrant_filter,
+            query_filter=build_filter(filters),
+            search_params=search_params(),
             limit=top,
         )
 
@@ -176,7 +499,7 @@ class Qdrant:
                 "title": r.payload["title"],
                 "genres": r.payload.get("genres"),
                 "release_year": r.payload.get("release_year"),
-                "language": r.payload.get("language"),
+                "language": r.payload.get("original_language"),
                 "poster_path": r.payload.get("poster_path"),
                 "popularity": r.payload.get("popularity"),
                 "score": r.score,
@@ -184,6 +507,95 @@ class Qdrant:
             for r in results
         ]
 
+    @staticmethod
+    def _query_input(q):
+        """Movie id (search from its stored vector) or a vector."""
+        if isinstance(q, (int, np.integer)):
+            return int(q)
+        return np.asarray(q, dtype=np.float32).tolist()
+
+    @staticmethod
+    def _lean_hits(points, fields: Optional[List[str]]) -> List[Dict]:
+        if not fields:
+            return [{"id": int(p.id), "score": p.score} for p in points]
+        return [{"id": int(p.id), "score": p.score, **{f: (p.payload or {}).get(f) for f in fields}} for p in points]
+
+    def search_ids(
+        self,
+        query: Union[int, Sequence[float], np.ndarray],
+        top: int = 10,
+        filters: Optional[Dict] = None,
+        fields: Optional[List[str]] = None,
+        hnsw_ef: Optional[int] = None,
+        exact: bool = False,
+    ) -> List[Dict]:
+        """
+        Lean candidate search: [{"id", "score"}] plus only the payload `fields`
+        asked for, no vectors. `hnsw_ef` defaults to one sized for `top`
+        (candidate_ef); `exact` forces a full scan.
+        """
+        response = self.client.query_points(
+            collection_name=self.collection_name,
+            query=self._query_input(query),
+            query_filter=build_filter(filters),
+            search_params=search_params(hnsw_ef=hnsw_ef or candidate_ef(top), exact=exact),
+            limit=top,
+            with_payload=fields or False,
+            with_vectors=False,
+        )
+        return self._lean_hits(response.points, fields)
+
+    def search_similar_batch(
+        self,
+        queries: Sequence[Union[int, Sequence[float], np.ndarray]],
+        top: int = 10,
+        filters: Optional[Dict] = None,
+        fields: Optional[List[str]] = None,
+        hnsw_ef: Optional[int] = None,
+        exact: bool = False,
+    ) -> List[List[Dict]]:
+        """
+        Many nearest-neighbour searches in one request (Qdrant batch query API).
+        Each query is a vector, or a movie id whose stored vector is used
+        (no re-encoding). Returns one lean hit list (see `search_ids`) per
+        query, in order.
+        """
+        if not len(queries):
+            return []
+
+        params = search_params(hnsw_ef=hnsw_ef or candidate_ef(top), exact=exact)
+        try:
+            responses = self.client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=[
+                    models.QueryRequest(
+                        query=self._query_input(q),
+                        filter=build_filter(filters),
+                        params=params,
+                        limit=top,
+                        with_payload=fields or False,
+                        with_vector=False,
+                    )
+                    for q in queries
+                ],
+            )
+        except (UnexpectedResponse, grpc.RpcError):
+            # A movie id without a point fails the whole batch: resolve ids to vectors and drop the missing
+            ids = [int(q) for q in queries if isinstance(q, (int, np.integer))]
+            if not ids:
+                raise
+            found = {
+                int(p.id): p.vector
+                for p in self.client.retrieve(self.collection_name, ids=ids, with_payload=False, with_vectors=True)
+            }
+            resolved = [found.get(int(q)) if isinstance(q, (int, np.integer)) else q for q in queries]
+            present = [q for q in resolved if q is not None]
+            results = iter(self.search_similar_batch(
+                present, top=top, filters=filters, fields=fields, hnsw_ef=hnsw_ef, exact=exact,
+            ))
+            return [next(results) if q is not None else [] for q in resolved]
+
+        return [self._lean_hits(response.points, fields) for response in responses]
 
 
 # -----------------------------
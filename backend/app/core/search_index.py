@@ -0,0 +1,359 @@
+import bisect
+import heapq
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+from sqlalchemy import func, text
+
+from app.core.db import SessionLocal
+from app.models.movies import Movie
+from app.models.catalog import CatalogVersion
+
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+# --------------------------
+# Text normalization
+# --------------------------
+def normalize_text(text: Optional[str]) -> str:
+    """Lowercase, strip accents and collapse punctuation to single spaces."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return normalize_text(text).split()
+
+
+def trigrams(token: str) -> Set[str]:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class MovieSearchIndex:
+    """
+    In-memory inverted index over movie title, tagline and keywords.
+
+    - token -> movie ids postings (title and tagline/keywords kept apart so
+      title matches rank first)
+    - sorted vocabulary for prefix (autocomplete) expansion via bisect
+    - trigram -> token map for substring matches inside words
+    - normalized full title -> ids for exact title resolution
+
+    Results are ranked by (all tokens matched in title, popularity).
+    The index is refreshed incrementally whenever the catalog version changes,
+    in a background thread: rows written by transactions at or above the
+    previous pass's snapshot xmin (`movies.xid`) are re-read, so a long
+    transaction committing late is never skipped.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._docs: Dict[int, tuple] = {}
+        self._title_postings: Dict[str, Set[int]] = defaultdict(set)
+        self._text_postings: Dict[str, Set[int]] = defaultdict(set)
+        self._exact_titles: Dict[str, Set[int]] = defaultdict(set)
+        self._token_trigrams: Dict[str, Set[str]] = defaultdict(set)
+        self._vocab: List[str] = []
+
+        self.ready = False
+        self.version: Optional[int] = None
+        self.cursor: Optional[int] = None
+        self._refreshing = threading.Lock()
+
+    # --------------------------
+    # Document management
+    # --------------------------
+    def _add_token(self, token: str):
+        # Called only for tokens that are new to the vocabulary
+        bisect.insort(self._vocab, token)
+        for tri in trigrams(token):
+            self._token_trigrams[tri].add(token)
+
+    def _drop_token(self, token: str):
+        i = bisect.bisect_left(self._vocab, token)
+        if i < len(self._vocab) and self._vocab[i] == token:
+            self._vocab.pop(i)
+        for tri in trigrams(token):
+            bucket = self._token_trigrams.get(tri)
+            if bucket is not None:
+                bucket.discard(token)
+                if not bucket:
+                    del self._token_trigrams[tri]
+
+    def _is_known(self, token: str) -> bool:
+        return token in self._title_postings or token in self._text_postings
+
+    def upsert(self, row, bulk: bool = False):
+        """Add or replace one movie. `row` needs the columns selected in `_rows_query`."""
+        with self._lock:
+            if row.id in self._docs:
+                self.remove(row.id)
+
+            title_tokens = frozenset(tokenize(row.title))
+            text_tokens = frozenset(tokenize(row.tagline)) | frozenset(tokenize((row.keywords or "").replace(",", " ")))
+            norm_title = normalize_text(row.title)
+
+            self._docs[row.id] = (
+                float(row.popularity or 0.0),
+                title_tokens,
+                text_tokens,
+                norm_title,
+                {
+                    "id": row.id,
+                    "tmdb_id": row.tmdb_id,
+                    "title": row.title,
+                    "release_year": row.release_year,
+                    "poster_path": row.poster_path,
+                },
+            )
+
+            for token in title_tokens:
+                if not bulk and not self._is_known(token):
+                    self._add_token(token)
+                self._title_postings[token].add(row.id)
+            for token in text_tokens:
+                if not bulk and not self._is_known(token):
+                    self._add_token(token)
+                self._text_postings[token].add(row.id)
+            self._exact_titles[norm_title].add(row.id)
+
+    def remove(self, movie_id: int):
+        with self._lock:
+            doc = self._docs.pop(movie_id, None)
+            if doc is None:
+                return
+            _, title_tokens, text_tokens, norm_title, _ = doc
+
+            for postings, tokens in ((self._title_postings, title_tokens), (self._text_postings, text_tokens)):
+                for token in tokens:
+                    ids = postings.get(token)
+                    if ids is None:
+                        continue
+                    ids.discard(movie_id)
+                    if not ids:
+                        del postings[token]
+                        if not self._is_known(token):
+                            self._drop_token(token)
+
+            exact = self._exact_titles.get(norm_title)
+            if exact is not None:
+                exact.discard(movie_id)
+                if not exact:
+                    del self._exact_titles[norm_title]
+
+    def _finalize_bulk(self):
+        """Build vocabulary and trigram map once after a bulk load."""
+        self._vocab = sorted(set(self._title_postings) | set(self._text_postings))
+        self._token_trigrams = defaultdict(set)
+        for token in self._vocab:
+            for tri in trigrams(token):
+                self._token_trigrams[tri].add(token)
+
+    def __len__(self):
+        return len(self._docs)
+
+    # --------------------------
+    # Token expansion
+    # --------------------------
+    def _prefix_tokens(self, prefix: str) -> List[str]:
+        lo = bisect.bisect_left(self._vocab, prefix)
+        hi = bisect.bisect_left(self._vocab, prefix + "\uffff")
+        return self._vocab[lo:hi]
+
+    def _substring_tokens(self, fragment: str) -> List[str]:
+        if len(fragment) < 3:
+            return []
+        buckets = [self._token_trigrams.get(tri, set()) for tri in trigrams(fragment)]
+        if not buckets:
+            return []
+        buckets.sort(key=len)
+        found = set(buckets[0]).intersection(*buckets[1:])
+        return [t for t in found if fragment in t]
+
+    def _postings_for(self, tokens) -> Set[int]:
+        out = set()
+        for t in tokens:
+            out |= self._title_postings.get(t, set())
+            out |= self._text_postings.get(t, set())
+        return out
+
+    def _match_token(self, token: str, prefix: bool) -> Tuple[Set[int], Set[str]]:
+        """Ids matching a query token and the vocabulary tokens it expanded to."""
+        expanded = self._prefix_tokens(token) if prefix else ([token] if self._is_known(token) else [])
+        if not expanded:
+            expanded = self._substring_tokens(token)
+        return self._postings_for(expanded), set(expanded)
+
+    # --------------------------
+    # Queries
+    # --------------------------
+    def search(self, query: str, limit: int = 10, offset: int = 0, prefix: bool = True) -> Tuple[List[int], int]:
+        """
+        Return (ranked ids for the requested window, total matches).
+        Every query token must match; the last token also matches as a prefix.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return [], 0
+
+        with self._lock:
+            matched = []
+            expansions = []
+            for i, token in enumerate(tokens):
+                is_last = i == len(tokens) - 1
+                ids, expanded = self._match_token(token, prefix=prefix and is_last)
+                if not ids:
+                    return [], 0
+                matched.append(ids)
+                expansions.append(expanded)
+
+            matched.sort(key=len)
+            candidates = matched[0].intersection(*matched[1:])
+
+            docs = self._docs
+
+            def rank(mid):
+                popularity, title_tokens, _, _, _ = docs[mid]
+                in_title = all(not exp.isdisjoint(title_tokens) for exp in expansions)
+                return (in_title, popularity)
+
+            top = heapq.nlargest(offset + limit, candidates, key=rank)
+            return top[offset:offset + limit], len(candidates)
+
+    def suggest(self, query: str, limit: int = 10) -> List[dict]:
+        """Autocomplete suggestions served entirely from memory."""
+        ids, _ = self.search(query, limit=limit, prefix=True)
+        with self._lock:
+            return [self._docs[mid][4] for mid in ids if mid in self._docs]
+
+    def resolve_title(self, title: str) -> Optional[int]:
+        """Most popular movie whose normalized title equals `title`."""
+        with self._lock:
+            ids = self._exact_titles.get(normalize_text(title))
+            if not ids:
+                return None
+            return max(ids, key=lambda mid: self._docs[mid][0])
+
+    # --------------------------
+    # Loading / refresh
+    # --------------------------
+    @staticmethod
+    def _rows_query(db):
+        return db.query(
+            Movie.id,
+            Movie.tmdb_id,
+            Movie.title,
+            Movie.tagline,
+            Movie.keywords,
+            Movie.popularity,
+            Movie.release_year,
+            Movie.poster_path,
+        )
+
+    @staticmethod
+    def _catalog_version(db) -> int:
+        return db.query(CatalogVersion.version).filter(CatalogVersion.id == 1).scalar() or 0
+
+    @staticmethod
+    def _horizon(db) -> int:
+        """Snapshot xmin: every transaction below it has committed or aborted."""
+        return db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")).scalar()
+
+    def build(self, db):
+        """Full build from Postgres, streaming rows in chunks."""
+        version = self._catalog_version(db)
+        # Taken before reading: later commits are picked up by the next refresh
+        horizon = self._horizon(db)
+        count = 0
+        for row in self._rows_query(db).yield_per(10000):
+            self.upsert(row, bulk=True)
+            count += 1
+        with self._lock:
+            self._finalize_bulk()
+        self.version = version
+        self.cursor = horizon
+        self.ready = True
+        logger.info(f"✅ Search index built with {count} movies (catalog v{version}).")
+
+    def refresh(self, db):
+        """Apply rows changed since the last refresh; rebuild if deletes were missed."""
+        version = self._catalog_version(db)
+        if self.ready and version == self.version:
+            return
+
+        if not self.ready:
+            self.build(db)
+            return
+
+        horizon = self._horizon(db)
+        changed = 0
+        for row in self._rows_query(db).filter(Movie.xid >= self.cursor).yield_per(10000):
+            self.upsert(row)
+            changed += 1
+
+        total = db.query(func.count(Movie.id)).scalar()
+        if total != len(self):
+            # Movies were deleted by another process: rebuild off to the side and swap
+            logger.info("🔄 Search index out of sync with catalog, rebuilding...")
+            fresh = MovieSearchIndex()
+            fresh.build(db)
+            _swap_instance(fresh)
+            return
+
+        self.version = version
+        self.cursor = horizon
+        logger.info(f"🔄 Search index refreshed: {changed} changed movies (catalog v{version}).")
+
+    def ensure_fresh(self, catalog_version: Optional[int] = None):
+        """Kick off a background refresh when the catalog version moved on."""
+        if self.ready and catalog_version == self.version:
+            return
+        if not self._refreshing.acquire(blocking=False):
+            return
+
+        def run():
+            db = SessionLocal()
+            try:
+                self.refresh(db)
+            except Exception as e:
+                logger.error(f"Search index refresh failed: {e}")
+            finally:
+                db.close()
+                self._refreshing.release()
+
+        threading.Thread(target=run, daemon=True).start()
+
+
+# -----------------------------
+# ✅ Singleton instance helper
+# -----------------------------
+_search_index: Optional[MovieSearchIndex] = None
+_instance_lock = threading.Lock()
+
+
+def _swap_instance(index: MovieSearchIndex):
+    global _search_index
+    with _instance_lock:
+        _search_index = index
+
+
+def get_search_index() -> MovieSearchIndex:
+    """Return the process-wide search index (may not be ready yet)."""
+    global _search_index
+    with _instance_lock:
+        if _search_index is None:
+            _search_index = MovieSearchIndex()
+        return _search_index
+
+
+def warm_search_index():
+    """Build the index at startup; callers fall back to SQL until it is ready."""
+    get_search_index().ensure_fresh()
@@ -1,20 +1,51 @@
-from fastapi import Depends, HTTPException, status
+import time
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.core.db import get_global_db_session
+from app.core.settings import settings
 from app.utils.auth import decode_token
+from app.utils.cache import TTLCache
 from app.model_handlers.user_handler import UserHandler, UserResponse
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login/token")
 
+# Resolved users keyed by (token subject, token expiry): each live token of a user has its own entry
+USER_CACHE = TTLCache(ttl=settings.auth.user_cache_ttl)
+
+
+def invalidate_user_cache(*emails: str):
+    """Forget cached users after profile, password or account changes."""
+    subjects = {email for email in emails if email}
+    if subjects:
+        USER_CACHE.pop_where(lambda key: key[0] in subjects)
+
+
 def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_global_db_session)
 ) -> UserResponse:
+    # Resolve once per request even if used as router dependency and parameter
+    cached_user = getattr(request.state, "current_user", None)
+    if cached_user is not None:
+        return cached_user
+
     payload = decode_token(token)
     if not payload or "sub" not in payload:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
-    user = UserHandler(db).get_by_email(payload["sub"])
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-    return user
\ No newline at end of file
+
+    sub, exp = payload["sub"], payload.get("exp")
+    user = USER_CACHE.get((sub, exp))
+    if user is None:
+        user = UserHandler(db).get_by_email(sub)
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found")
+        # Never keep a user cached past its token's expiry
+        ttl = min(settings.auth.user_cache_ttl, exp - time.time()) if exp else settings.auth.user_cache_ttl
+        if ttl > 0:
+            USER_CACHE.set((sub, exp), user, ttl=ttl)
+
+    request.state.current_user = user
+    return user
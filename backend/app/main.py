@@ -1,9 +1,11 @@
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 import threading
 
 from app.model_state import load_model, model_watcher_thread
+from app.core.search_index import warm_search_index
 from app.routes.auth import auth_router
 from app.routes.users import user_router
 from app.routes.user_feedback import user_feedback_router
@@ -25,6 +27,9 @@ async def lifespan(app: FastAPI):
     thread.start()
 
     print("⚡ Background model watcher running.")
+
+    # Build the in-memory title/keyword search index in the background
+    warm_search_index()
     
     yield
     
@@ -56,6 +61,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON bodies (catalog grids, recommendation lists)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Register routers
 app.include_router(auth_router)
 app.include_router(user_router, dependencies=[Depends(get_current_user)])
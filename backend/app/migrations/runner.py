@@ -0,0 +1,82 @@
+import os
+from loguru import logger
+from sqlalchemy import text
+
+from app.core.db import get_postgresql_engine
+
+
+VERSIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "versions")
+
+
+# ----------------------------------------
+# Helpers
+# ----------------------------------------
+def _split_statements(sql: str):
+    """
+    Split a migration file into single statements.
+    Each statement runs on its own (autocommit) so that
+    `CREATE INDEX CONCURRENTLY` is allowed. Semicolons inside
+    `$$ ... $$` bodies (plpgsql functions) do not end a statement.
+    """
+    lines = [l for l in sql.splitlines() if not l.strip().startswith("--")]
+    statements = []
+    current = []
+    for i, part in enumerate("\n".join(lines).split("$$")):
+        if i % 2:
+            current.append("$$" + part + "$$")
+            continue
+        pieces = part.split(";")
+        current.append(pieces[0])
+        for piece in pieces[1:]:
+            statements.append("".join(current))
+            current = [piece]
+    statements.append("".join(current))
+    return [s.strip() for s in statements if s.strip()]
+
+
+def list_migrations():
+    """Return migration file names sorted by version prefix."""
+    return sorted(f for f in os.listdir(VERSIONS_DIR) if f.endswith(".sql"))
+
+
+# ----------------------------------------
+# Runner
+# ----------------------------------------
+def run_migrations():
+    engine = get_postgresql_engine()
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version TEXT PRIMARY KEY,
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            )
+            """
+        ))
+        applied = {r[0] for r in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+        pending = [m for m in list_migrations() if m not in applied]
+        if not pending:
+            logger.info("✅ Schema is up to date.")
+            return []
+
+        for name in pending:
+            logger.info(f"⚙️ Applying migration {name}...")
+            with open(os.path.join(VERSIONS_DIR, name), "r") as f:
+                statements = _split_statements(f.read())
+
+            for stmt in statements:
+                conn.execute(text(stmt))
+
+            conn.execute(
+                text("INSERT INTO schema_migrations (version) VALUES (:v)"),
+                {"v": name},
+            )
+            logger.info(f"✅ Applied {name}")
+
+    return pending
+
+
+if __name__ == "__main__":
+    run_migrations()
@@ -0,0 +1,201 @@
+"""
+EXPLAIN-based verification of the hot-path indexes.
+
+Runs every hot handler query against the local (seeded) database, captures
+the SQL it emits and checks its plan: a sequential scan on a table larger
+than --min-rows fails the run (exit code 1).
+
+Usage (from backend/, after `python -m app.migrations.runner`):
+    python -m app.migrations.verify_indexes --min-rows 10000
+"""
+
+import argparse
+import sys
+import threading
+
+from loguru import logger
+from sqlalchemy import event, func, text
+
+from app.core.db import SessionLocal, get_postgresql_engine
+from app.core.search_index import get_search_index
+from app.model_handlers.feedback_change_handler import FeedbackChangeHandler
+from app.model_handlers.movie_handler import MovieHandler
+from app.model_handlers.user_feedback_handler import UserFeedbackHandler, USER_STATS_CACHE
+from app.model_handlers.user_handler import UserHandler
+from app.models.movies import Movie
+from app.models.user_feedback import UserFeedback
+from app.models.users import User
+
+
+# ----------------------------------------
+# SQL capture
+# ----------------------------------------
+class StatementRecorder:
+    """Collect SELECTs issued on the calling thread while recording."""
+
+    def __init__(self, engine):
+        self._thread = threading.get_ident()
+        self.statements = []
+        self.recording = False
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not self.recording or threading.get_ident() != self._thread:
+            return
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            self.statements.append((statement, parameters))
+
+    def capture(self, fn):
+        self.statements = []
+        self.recording = True
+        try:
+            fn()
+        finally:
+            self.recording = False
+        return self.statements
+
+
+# ----------------------------------------
+# Plan inspection
+# ----------------------------------------
+def walk_plan(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from walk_plan(child)
+
+
+def seq_scans(conn, statement, parameters):
+    raw = conn.connection.cursor()
+    raw.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+    plan = raw.fetchone()[0][0]["Plan"]
+    return [n["Relation Name"] for n in walk_plan(plan) if n["Node Type"] == "Seq Scan"]
+
+
+def table_sizes(conn, tables):
+    rows = conn.execute(
+        text("SELECT relname, reltuples::bigint FROM pg_class WHERE relname = ANY(:names) AND relkind = 'r'"),
+        {"names": list(tables)},
+    )
+    return {name: max(int(n), 0) for name, n in rows}
+
+
+# ----------------------------------------
+# Scenarios
+# ----------------------------------------
+def sample_values(db):
+    """Realistic arguments taken from the seeded data."""
+    heavy_user = (
+        db.query(UserFeedback.user_id)
+        .group_by(UserFeedback.user_id)
+        .order_by(func.count().desc())
+        .limit(1)
+        .scalar()
+    )
+    movie = db.query(Movie).order_by(Movie.popularity.desc().nullslast()).limit(1).one()
+    email = db.query(User.email).filter(User.id == heavy_user).scalar() if heavy_user else None
+    return heavy_user, movie, email
+
+
+def build_scenarios(db):
+    heavy_user, movie, email = sample_values(db)
+    movies = MovieHandler(db)
+    feedbacks = UserFeedbackHandler(db)
+    changes = FeedbackChangeHandler(db)
+    title = movie.title or ""
+
+    def second_cursor_page(**filters):
+        _, cursor = movies.query_movies_by_cursor(limit=50, cursor=None, **filters)
+        if cursor:
+            movies.query_movies_by_cursor(limit=50, cursor=cursor, **filters)
+
+    explore = dict(title=None, genre=None, language=None, release_year=None, search_bar=False)
+
+    scenarios = [
+        ("movies.get_by_tmdb_id", lambda: movies.get_by_tmdb_id(movie.tmdb_id)),
+        ("movies.get_by_title", lambda: movies.get_by_title(title)),
+        ("movies.get_by_ids", lambda: movies.get_by_ids([movie.id])),
+        ("movies.get_by_genres", lambda: movies.get_by_genres(["Drama"], limit=10)),
+        ("explore.popularity", lambda: second_cursor_page(**explore, sort_by="popularity", order="desc")),
+        ("explore.release_year", lambda: second_cursor_page(**explore, sort_by="release_year", order="desc")),
+        ("explore.title", lambda: second_cursor_page(**explore, sort_by="title", order="asc")),
+        ("explore.language", lambda: second_cursor_page(**{**explore, "language": movie.original_language or "en"}, sort_by="popularity", order="desc")),
+        ("explore.genre", lambda: second_cursor_page(**{**explore, "genre": "Drama"}, sort_by="popularity", order="desc")),
+        ("explore.year", lambda: second_cursor_page(**{**explore, "release_year": movie.release_year}, sort_by="popularity", order="desc")),
+        ("explore.title_prefix", lambda: second_cursor_page(**{**explore, "title": title[:4]}, sort_by="popularity", order="desc")),
+        ("explore.title_substring", lambda: second_cursor_page(**{**explore, "title": title[1:5], "search_bar": True}, sort_by="popularity", order="desc")),
+        ("feedback.movie_feedbacks", lambda: feedbacks.get_movie_feedbacks(movie.id)),
+        ("changes.count_pending", lambda: changes.count_pending("training")),
+    ]
+
+    if heavy_user:
+        def stats():
+            USER_STATS_CACHE.pop(heavy_user)
+            feedbacks.get_user_stats(heavy_user)
+
+        def history_pages(**filters):
+            _, cursor = feedbacks.get_user_feedbacks_page(heavy_user, limit=20, **filters)
+            if cursor:
+                feedbacks.get_user_feedbacks_page(heavy_user, limit=20, cursor=cursor, **filters)
+
+        scenarios += [
+            ("users.get_by_email", lambda: UserHandler(db).get_by_email(email)),
+            ("feedback.by_user_movie", lambda: feedbacks.get_by_user_movie(heavy_user, movie.id)),
+            ("feedback.movie_ids", lambda: feedbacks.get_user_movie_ids(heavy_user)),
+            ("feedback.recent_ids", lambda: feedbacks.get_recent_movie_ids(heavy_user, limit=10, status="watched")),
+            ("feedback.history", lambda: history_pages()),
+            ("feedback.history_watched", lambda: history_pages(status="watched", min_rating=3.5)),
+            ("feedback.watchlist", lambda: history_pages(status="watchlist")),
+            ("feedback.stats", stats),
+        ]
+    else:
+        logger.warning("⚠️ No feedback rows found: per-user scenarios skipped (seed the database first).")
+
+    return scenarios
+
+
+# ----------------------------------------
+# Runner
+# ----------------------------------------
+def verify(min_rows: int) -> bool:
+    engine = get_postgresql_engine()
+    recorder = StatementRecorder(engine)
+
+    # Keep the handlers on their SQL paths instead of the in-memory search index
+    get_search_index()._refreshing.acquire()
+
+    db = SessionLocal()
+    failures = []
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("ANALYZE movies"))
+            conn.execute(text("ANALYZE user_feedback"))
+            conn.commit()
+            sizes = table_sizes(conn, ["movies", "user_feedback", "users", "feedback_changes"])
+            large = {t for t, n in sizes.items() if n >= min_rows}
+            logger.info(f"Table sizes: {sizes} (checking seq scans on: {sorted(large) or 'none'})")
+            if not large:
+                logger.warning(f"⚠️ No table has ≥ {min_rows} rows: plans on tiny tables prove nothing.")
+
+            for name, fn in build_scenarios(db):
+                statements = recorder.capture(fn)
+                db.rollback()
+                for i, (statement, parameters) in enumerate(statements):
+                    scanned = [t for t in seq_scans(conn, statement, parameters) if t in large]
+                    if scanned:
+                        failures.append((name, i, scanned, statement))
+                        logger.error(f"❌ {name}[{i}]: Seq Scan on {', '.join(scanned)}")
+                    else:
+                        logger.info(f"✅ {name}[{i}]")
+    finally:
+        db.close()
+
+    for name, i, scanned, statement in failures:
+        logger.error(f"{name}[{i}] seq-scans {scanned}:\n{statement}")
+    return not failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--min-rows", type=int, default=10000, help="Tables at least this large must not be seq-scanned")
+    args = parser.parse_args()
+    sys.exit(0 if verify(args.min_rows) else 1)
@@ -0,0 +1,8 @@
+-- Composite (sort key, id) indexes backing keyset pagination on /movies/explore.
+-- Btree indexes can be scanned in both directions, so each one serves asc and desc.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_movies_popularity_id ON movies (popularity, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_movies_title_id ON movies (title, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_movies_release_year_id ON movies (release_year, id);
@@ -0,0 +1,10 @@
+-- Single-row catalog version, bumped by ingestion and movie CRUD.
+-- API processes key their catalog-derived caches (explore totals, search) on it.
+
+CREATE TABLE IF NOT EXISTS catalog_version (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+INSERT INTO catalog_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING;
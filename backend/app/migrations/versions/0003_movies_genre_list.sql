@@ -0,0 +1,15 @@
+-- Normalized genre representation: TEXT[] with a GIN index, so genre filters
+-- use exact element overlap (&&) instead of ILIKE '%genre%' substring scans.
+
+ALTER TABLE movies ADD COLUMN IF NOT EXISTS genre_list TEXT[];
+
+-- Backfill existing rows from the comma-joined genres column
+UPDATE movies
+SET genre_list = ARRAY(
+    SELECT btrim(g) FROM unnest(string_to_array(genres, ',')) AS g WHERE btrim(g) <> ''
+)
+WHERE genres IS NOT NULL AND genre_list IS NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_movies_genre_list ON movies USING GIN (genre_list);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_movies_original_language ON movies (original_language);
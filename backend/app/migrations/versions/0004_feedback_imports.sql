@@ -0,0 +1,17 @@
+-- Status/progress resource for asynchronous bulk ratings imports.
+
+CREATE TABLE IF NOT EXISTS feedback_imports (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    total_rows INTEGER DEFAULT 0,
+    processed_rows INTEGER DEFAULT 0,
+    imported INTEGER DEFAULT 0,
+    unresolved INTEGER DEFAULT 0,
+    invalid INTEGER DEFAULT 0,
+    error TEXT,
+    created_at TIMESTAMPTZ DEFAULT now(),
+    updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS ix_feedback_imports_user_id ON feedback_imports (user_id);
@@ -0,0 +1,47 @@
+-- Append-only change log of user_feedback, written by a trigger in the same
+-- transaction as every feedback write (ORM, bulk upserts, COPY imports, cascades).
+-- Downstream consumers keep a cursor in feedback_consumers and read deltas.
+
+CREATE TABLE IF NOT EXISTS feedback_changes (
+    id BIGSERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    movie_id INTEGER NOT NULL,
+    op VARCHAR(10) NOT NULL,
+    rating DOUBLE PRECISION,
+    status VARCHAR,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
+
+CREATE TABLE IF NOT EXISTS feedback_consumers (
+    name VARCHAR(64) PRIMARY KEY,
+    last_change_id BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION log_feedback_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO feedback_changes (user_id, movie_id, op, rating, status)
+        VALUES (OLD.user_id, OLD.movie_id, 'delete', OLD.rating, OLD.status);
+        RETURN NULL;
+    END IF;
+
+    -- Review-only edits do not affect any consumer
+    IF TG_OP = 'UPDATE'
+       AND NEW.rating IS NOT DISTINCT FROM OLD.rating
+       AND NEW.status IS NOT DISTINCT FROM OLD.status
+       AND NEW.movie_id = OLD.movie_id THEN
+        RETURN NULL;
+    END IF;
+
+    INSERT INTO feedback_changes (user_id, movie_id, op, rating, status)
+    VALUES (NEW.user_id, NEW.movie_id, lower(TG_OP), NEW.rating, NEW.status);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_user_feedback_changes ON user_feedback;
+
+CREATE TRIGGER trg_user_feedback_changes
+AFTER INSERT OR UPDATE OR DELETE ON user_feedback
+FOR EACH ROW EXECUTE FUNCTION log_feedback_change();
@@ -0,0 +1,12 @@
+-- Keyset pagination of a user's feedback history and watchlist:
+-- WHERE user_id = ? [AND status = ?] ORDER BY updated_at DESC, id DESC
+
+UPDATE user_feedback SET updated_at = COALESCE(created_at, now()) WHERE updated_at IS NULL;
+
+ALTER TABLE user_feedback ALTER COLUMN updated_at SET NOT NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_feedback_user_updated
+    ON user_feedback (user_id, updated_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_feedback_user_status_updated
+    ON user_feedback (user_id, status, updated_at, id);
@@ -0,0 +1,21 @@
+-- Indexes for the remaining hot handler queries (verified by app.migrations.verify_indexes).
+-- Already covered elsewhere: popularity / title / release_year keyset (0001),
+-- genre_list and original_language (0003), user_feedback history (0006).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Case-insensitive title equality and prefix search: lower(title) = ? / LIKE 'abc%'
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_movies_title_lower
+    ON movies (lower(title) text_pattern_ops);
+
+-- Search-bar substring fallback: lower(title) LIKE '%abc%'
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_movies_title_trgm
+    ON movies USING GIN (lower(title) gin_trgm_ops);
+
+-- Recent activity seeds and per-user created_at windows (stats)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_feedback_user_created
+    ON user_feedback (user_id, created_at);
+
+-- Feedbacks of a movie, and ON DELETE CASCADE from movies
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_feedback_movie_id
+    ON user_feedback (movie_id);
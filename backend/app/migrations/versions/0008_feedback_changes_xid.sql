@@ -0,0 +1,23 @@
+-- Order the feedback change log by transaction id instead of insert time.
+-- A change is safe to consume once its xid is below the snapshot xmin: every
+-- transaction older than that has committed or aborted, so no late commit can
+-- still land behind a consumer's cursor. Sequence ids and clock_timestamp()
+-- are taken at insert time and give no such guarantee.
+-- xid8 is stored as BIGINT so it compares and indexes like a plain cursor.
+
+-- Rows logged before this migration are committed long ago: xid 0
+ALTER TABLE feedback_changes ADD COLUMN IF NOT EXISTS xid BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE feedback_changes ALTER COLUMN xid SET DEFAULT pg_current_xact_id()::text::bigint;
+
+-- Consumers have processed every change with xid < last_xid
+ALTER TABLE feedback_consumers ADD COLUMN IF NOT EXISTS last_xid BIGINT NOT NULL DEFAULT 0;
+
+-- Consumers that were fully caught up keep skipping the pre-migration rows
+UPDATE feedback_consumers SET last_xid = 1
+WHERE last_xid = 0
+  AND last_change_id >= COALESCE((SELECT max(id) FROM feedback_changes), 0);
+
+ALTER TABLE feedback_consumers DROP COLUMN IF EXISTS last_change_id;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_feedback_changes_xid
+    ON feedback_changes (xid);
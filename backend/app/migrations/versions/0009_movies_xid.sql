@@ -0,0 +1,25 @@
+-- Writing transaction id of every movie row, for incremental readers (search
+-- index refresh, Qdrant reindex catch-up). updated_at is now() = transaction
+-- start, so a long ingest committing late can carry an updated_at older than a
+-- reader's watermark. Readers instead keep the snapshot xmin of their last pass
+-- as cursor and re-read rows with xid >= cursor (see 0008 for feedback_changes).
+
+-- Existing rows count as committed long ago: xid 0
+ALTER TABLE movies ADD COLUMN IF NOT EXISTS xid BIGINT NOT NULL DEFAULT 0;
+
+-- Set by trigger so every writer (ORM, psycopg2 ingest upserts) is covered
+CREATE OR REPLACE FUNCTION set_movie_xid() RETURNS trigger AS $$
+BEGIN
+    NEW.xid := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_movies_xid ON movies;
+
+CREATE TRIGGER trg_movies_xid
+BEFORE INSERT OR UPDATE ON movies
+FOR EACH ROW EXECUTE FUNCTION set_movie_xid();
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_movies_xid
+    ON movies (xid);
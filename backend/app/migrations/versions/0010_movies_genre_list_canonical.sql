@@ -0,0 +1,33 @@
+-- Re-backfill movies.genre_list with the same canonicalization as
+-- app.utils.genres.normalize_genres. 0003 only trimmed and split the raw
+-- `genres` text, so 'drama' / ' DRAMA' stayed as given while ORM and ingest
+-- writes store 'Drama', and genre_list @> ARRAY['Drama'] missed those rows.
+
+-- Trim, map official TMDB genres to their canonical spelling (case-insensitive),
+-- keep unknown genres as given, drop blanks and duplicates (first one wins).
+CREATE OR REPLACE FUNCTION normalize_genre_list(genres TEXT) RETURNS TEXT[] AS $$
+    SELECT COALESCE(array_agg(name ORDER BY first_pos), '{}')
+    FROM (
+        SELECT name, min(pos) AS first_pos
+        FROM (
+            SELECT COALESCE(c.name, g.trimmed) AS name, g.pos
+            FROM (
+                SELECT btrim(raw, E' \t\n\r\f' || chr(11)) AS trimmed, pos
+                FROM unnest(string_to_array(genres, ',')) WITH ORDINALITY AS u(raw, pos)
+            ) AS g
+            LEFT JOIN (VALUES
+                ('Action'), ('Adventure'), ('Animation'), ('Comedy'), ('Crime'),
+                ('Documentary'), ('Drama'), ('Family'), ('Fantasy'), ('History'),
+                ('Horror'), ('Music'), ('Mystery'), ('Romance'), ('Science Fiction'),
+                ('TV Movie'), ('Thriller'), ('War'), ('Western')
+            ) AS c(name) ON lower(c.name) = lower(g.trimmed)
+            WHERE g.trimmed <> ''
+        ) AS t
+        GROUP BY name
+    ) AS d
+$$ LANGUAGE sql IMMUTABLE;
+
+UPDATE movies
+SET genre_list = normalize_genre_list(genres)
+WHERE genres IS NOT NULL
+  AND genre_list IS DISTINCT FROM normalize_genre_list(genres);
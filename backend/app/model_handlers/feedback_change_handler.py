@@ -0,0 +1,76 @@
+from typing import Optional
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.feedback_changes import FeedbackChange, FeedbackConsumer
+
+
+# ---------- Handler ----------
+class FeedbackChangeHandler:
+    """
+    Cursor-based reader over the feedback change log.
+
+    Rows are appended by the `trg_user_feedback_changes` trigger with the id of
+    the writing transaction. Consumers read in xid order and only up to the
+    snapshot xmin: every transaction below it has committed or aborted, so a
+    late commit can never land behind a cursor.
+    """
+
+    def __init__(self, db: Session):
+        self._db = db
+
+    def get_cursor(self, consumer: str) -> int:
+        """Changes with xid below this are processed by `consumer` (0 when it never ran)."""
+        return (
+            self._db.query(FeedbackConsumer.last_xid)
+            .filter(FeedbackConsumer.name == consumer)
+            .scalar()
+        ) or 0
+
+    def head(self) -> int:
+        """Commit horizon: every change with xid below it is committed and visible."""
+        return self._db.execute(
+            text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+        ).scalar()
+
+    def count_pending(self, consumer: str, upto: Optional[int] = None) -> int:
+        """Number of committed changes `consumer` has not processed yet (xid range scan)."""
+        return (
+            self._db.query(func.count(FeedbackChange.id))
+            .filter(
+                FeedbackChange.xid >= self.get_cursor(consumer),
+                FeedbackChange.xid < (self.head() if upto is None else upto),
+            )
+            .scalar()
+        ) or 0
+
+    def advance(self, consumer: str, horizon: int):
+        """Move the consumer's cursor forward to a `head()` value (never backwards) and commit."""
+        stmt = insert(FeedbackConsumer).values(
+            name=consumer,
+            last_xid=horizon,
+            updated_at=func.now(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FeedbackConsumer.name],
+            set_={
+                "last_xid": func.greatest(FeedbackConsumer.last_xid, stmt.excluded.last_xid),
+                "updated_at": func.now(),
+            },
+        )
+        self._db.execute(stmt)
+        self._db.commit()
+
+    def prune(self) -> int:
+        """Delete changes every registered consumer has already processed."""
+        low = self._db.query(func.min(FeedbackConsumer.last_xid)).scalar()
+        if not low:
+            return 0
+        deleted = (
+            self._db.query(FeedbackChange)
+            .filter(FeedbackChange.xid < low)
+            .delete(synchronize_session=False)
+        )
+        self._db.commit()
+        return deleted
@@ -0,0 +1,70 @@
+from datetime import datetime
+from typing import Optional, List
+from pydantic import BaseModel, Field, ConfigDict
+from sqlalchemy.orm import Session
+
+from . import CRUDManager
+from app.models.feedback_imports import FeedbackImport
+
+
+# ---------- Pydantic Schemas ----------
+class FeedbackImportCreate(BaseModel):
+    user_id: int = Field(..., description="User the ratings belong to")
+    status: str = Field("pending", description="pending|running|completed|failed")
+    total_rows: int = Field(0, description="Rows found in the upload")
+
+
+class FeedbackImportUpdate(BaseModel):
+    status: Optional[str] = None
+    total_rows: Optional[int] = None
+    processed_rows: Optional[int] = None
+    imported: Optional[int] = None
+    unresolved: Optional[int] = None
+    invalid: Optional[int] = None
+    error: Optional[str] = None
+
+
+class FeedbackImportResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    user_id: int
+    status: str
+    total_rows: Optional[int]
+    processed_rows: Optional[int]
+    imported: Optional[int]
+    unresolved: Optional[int]
+    invalid: Optional[int]
+    error: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+
+# ---------- Handler ----------
+class FeedbackImportHandler(CRUDManager[FeedbackImport, FeedbackImportCreate, FeedbackImportUpdate, FeedbackImportResponse]):
+    def __init__(self, db: Session):
+        super().__init__(db=db, model=FeedbackImport, response_schema=FeedbackImportResponse)
+
+    def create(self, obj_in: FeedbackImportCreate) -> FeedbackImportResponse:
+        return super().create(obj_in)
+
+    def read(self, id: int) -> FeedbackImportResponse:
+        return super().read(id)
+
+    def update(self, id: int, obj_in: FeedbackImportUpdate) -> FeedbackImportResponse:
+        return super().update(id, obj_in)
+
+    def delete(self, id: int) -> dict:
+        return super().delete(id)
+
+    def list_all(self, skip: int = 0, limit: int = 20) -> List[FeedbackImportResponse]:
+        return super().list_all(skip, limit)
+
+    def get_user_import(self, user_id: int, import_id: int) -> Optional[FeedbackImportResponse]:
+        """Get an import job owned by the user."""
+        job = (
+            self._db.query(FeedbackImport)
+            .filter(FeedbackImport.id == import_id, FeedbackImport.user_id == user_id)
+            .first()
+        )
+        return FeedbackImportResponse.model_validate(job) if job else None
@@ -1,12 +1,18 @@
 from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel, Field, ConfigDict
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy.orm.exc import NoResultFound
-from sqlalchemy import or_
+from sqlalchemy import or_, and_, tuple_, func, select
 
 from . import CRUDManager
+from app.core.settings import settings
 from app.models.movies import Movie
+from app.models.catalog import CatalogVersion
+from app.core.search_index import get_search_index
+from app.utils.cache import TTLCache
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.genres import normalize_genres, split_genres
 
 
 # ---------- Pydantic Schemas ----------
@@ -58,30 +64,107 @@ class MovieResponse(BaseModel):
 
 
 # ---------- Handler ----------
+# Sortable columns for explore; each has a (column, id) index for keyset seeks
+EXPLORE_SORT_COLUMNS = {
+    "popularity": Movie.popularity,
+    "title": Movie.title,
+    "release_year": Movie.release_year,
+}
+
+# Columns that exports and `fields=` projections may select
+MOVIE_FIELDS = tuple(MovieResponse.model_fields)
+
+# Explore totals keyed by (normalized filters, catalog version)
+EXPLORE_TOTALS_CACHE = TTLCache(ttl=settings.explore.total_cache_ttl)
+# Catalog version is re-read at most every few seconds per process
+CATALOG_VERSION_CACHE = TTLCache(ttl=settings.explore.catalog_version_ttl, maxsize=1)
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input only matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def invalidate_catalog_caches():
+    """Drop catalog-derived caches held by this process."""
+    CATALOG_VERSION_CACHE.clear()
+    EXPLORE_TOTALS_CACHE.clear()
+
+
+def explore_filters_key(
+    title: Optional[str],
+    genre: Optional[str],
+    language: Optional[str],
+    release_year: Optional[int],
+    search_bar: bool = False,
+) -> tuple:
+    """Normalize explore filters so equivalent requests share a cache entry."""
+    if title:
+        return ("title", title.strip().lower(), bool(search_bar))
+
+    def split(value, lower):
+        values = (v.strip() for v in value.split(",")) if value else ()
+        return tuple(sorted({v.lower() if lower else v for v in values if v}))
+
+    # Genres are canonicalized by split_genres; the language filter is case-sensitive
+    return ("filters", split(genre, lower=True), split(language, lower=False), release_year)
+
+
 class MovieHandler(CRUDManager[Movie, MovieCreate, MovieUpdate, MovieResponse]):
     def __init__(self, db: Session):
         super().__init__(db=db, model=Movie, response_schema=MovieResponse)
 
     def create(self, obj_in: MovieCreate) -> MovieResponse:
-        return super().create(obj_in)
+        self.bump_catalog_version()
+        created = super().create(obj_in)
+        invalidate_catalog_caches()
+        return created
 
     def read(self, id: int) -> MovieResponse:
         return super().read(id)
 
     def update(self, id: int, obj_in: MovieUpdate) -> MovieResponse:
-        return super().update(id, obj_in)
+        self.bump_catalog_version()
+        updated = super().update(id, obj_in)
+        invalidate_catalog_caches()
+        return updated
 
     def delete(self, id: int) -> dict:
-        return super().delete(id)
+        self.bump_catalog_version()
+        deleted = super().delete(id)
+        invalidate_catalog_caches()
+        get_search_index().remove(id)
+        return deleted
 
     def list_all(self, skip: int = 0, limit: int = 20) -> List[MovieResponse]:
         return super().list_all(skip, limit)
 
+    def bump_catalog_version(self):
+        """Bump the catalog version; committed together with the caller's write."""
+        self._db.query(CatalogVersion).filter(CatalogVersion.id == 1).update(
+            {CatalogVersion.version: CatalogVersion.version + 1, CatalogVersion.updated_at: func.now()},
+            synchronize_session=False,
+        )
+
+    def get_catalog_version(self) -> int:
+        """Current catalog version (briefly cached per process)."""
+        def load():
+            version = self._db.query(CatalogVersion.version).filter(CatalogVersion.id == 1).scalar()
+            return version or 0
+
+        return CATALOG_VERSION_CACHE.get_or_set("version", load)
+
     def get_by_title(self, title: str) -> Optional[MovieResponse]:
         """Retrieve a movie by title."""
+        index = self._ready_search_index()
+        if index is not None:
+            movie_id = index.resolve_title(title)
+            return self.get_by_id(movie_id) if movie_id is not None else None
+
         try:
             # movie = self._db.query(Movie).filter(Movie.title.ilike(f"{title}%")).first()
-            movie = self._db.query(Movie).filter(Movie.title.ilike(title)).first()
+            # lower(title) equality is served by ix_movies_title_lower
+            movie = self._db.query(Movie).filter(func.lower(Movie.title) == title.strip().lower()).first()
             return MovieResponse.model_validate(movie) if movie else None
         except NoResultFound:
             return None
@@ -96,74 +179,265 @@ class MovieHandler(CRUDManager[Movie, MovieCreate, MovieUpdate, MovieResponse]):
         movie = self._db.query(Movie).filter(Movie.id == id).first()
         return MovieResponse.model_validate(movie) if movie else None
 
+    def get_by_ids(self, ids: List[int], fields: Optional[List[str]] = None) -> list:
+        """Retrieve many movies in one query, preserving the order of `ids`."""
+        if not ids:
+            return []
+        query = self._project(self._db.query(Movie).filter(Movie.id.in_(ids)), fields)
+        by_id = {m.id: m for m in query.all()}
+        return self._serialize([by_id[i] for i in ids if i in by_id], fields)
+
+    # ----- Projection helpers -----
+    @staticmethod
+    def _project(query, fields: Optional[List[str]], *extra: str):
+        """Load only the requested columns (plus any needed for ordering/cursors)."""
+        if not fields:
+            return query
+        names = dict.fromkeys([*fields, *extra])
+        return query.options(load_only(*[getattr(Movie, f) for f in names]))
+
+    @staticmethod
+    def _serialize(movies, fields: Optional[List[str]]) -> list:
+        """Full MovieResponse models, or plain dicts of the projected fields."""
+        if not fields:
+            return [MovieResponse.model_validate(m) for m in movies]
+        return [{f: getattr(m, f) for f in fields} for m in movies]
+
+    def iter_export_chunks(self, fields: List[str], chunk_size: int = 5000, after_id: int = 0):
+        """
+        Stream projected movie rows ordered by id through a server-side cursor,
+        yielding lists of dicts of at most `chunk_size` rows (constant memory).
+        `after_id` resumes after the last row already processed.
+        """
+        columns = [getattr(Movie, f) for f in fields]
+        result = self._db.execute(
+            select(*columns)
+            .where(Movie.id > after_id)
+            .order_by(Movie.id)
+            .execution_options(stream_results=True, yield_per=chunk_size)
+        )
+        for partition in result.mappings().partitions(chunk_size):
+            yield [dict(row) for row in partition]
+
+    def _ready_search_index(self):
+        """The in-memory search index if built, refreshing it in the background when stale."""
+        index = get_search_index()
+        index.ensure_fresh(self.get_catalog_version())
+        return index if index.ready else None
+
+    def search_titles(self, query: str, limit: int, offset: int = 0, fields: Optional[List[str]] = None):
+        """
+        Search-bar lookup over title, tagline and keywords via the in-memory index.
+        Returns (movies, total), or None while the index is still warming up.
+        """
+        index = self._ready_search_index()
+        if index is None:
+            return None
+        ids, total = index.search(query, limit=limit, offset=offset)
+        return self.get_by_ids(ids, fields), total
+
+    def autocomplete(self, query: str, limit: int = 10) -> Optional[List[dict]]:
+        """Title suggestions served from memory; None while the index is warming up."""
+        index = self._ready_search_index()
+        if index is None:
+            return None
+        return index.suggest(query, limit=limit)
+
     def get_by_genres(self, genres: List[str], limit: int = 10) -> List[MovieResponse]:
         """Retrieve movies by genres."""
         movies = (
                 self._db.query(Movie)
                 .filter(Movie.runtime >= 60)
-                .filter(
-                    or_(*[Movie.genres.ilike(f"%{genre}%") for genre in genres[:3]])
-                )
+                .filter(Movie.genre_list.overlap(normalize_genres(genres[:3])))
                 .order_by(Movie.popularity.desc())
                 .limit(limit)
             )
         return [MovieResponse.model_validate(m) for m in movies]
 
 
-    def query_movies_paginated(
+    def _explore_query(
         self,
-        page: int,
-        limit: int,
         title: Optional[str],
         genre: Optional[str],
         language: Optional[str],
         release_year: Optional[int],
-        sort_by: str,
-        order: str,
         search_bar: bool = False,
     ):
+        """Build the filtered (unsorted, unpaginated) explore query."""
         query = self._db.query(Movie)
 
         # ----- Search -----
         if title:
             # When title is provided, ignore all other filters
-            pattern = f"%{title}%" if search_bar else f"{title}%"
+            # prefix -> ix_movies_title_lower (text_pattern_ops), substring -> ix_movies_title_trgm
+            escaped = escape_like(title.strip().lower())
+            pattern = f"%{escaped}%" if search_bar else f"{escaped}%"
             query = query.filter(
-                Movie.title.ilike(pattern)
+                func.lower(Movie.title).like(pattern, escape="\\")
             )
 
         else:
             # ----- Genre Filter -----
             if genre:
-                genres_list = [g.strip() for g in genre.split(",")]
+                genres_list = split_genres(genre)
                 # Use OR logic for genres (match ANY of the selected genres)
-                query = query.filter(
-                    or_(*[Movie.genres.ilike(f"%{g}%") for g in genres_list])
-                )
+                if genres_list:
+                    query = query.filter(Movie.genre_list.overlap(genres_list))
 
             # ----- Other Filters -----
             if language:
                 # Language comes as comma-separated string, split it
-                languages_list = [l.strip() for l in language.split(",")]
-                query = query.filter(Movie.original_language.in_(languages_list))
+                languages_list = [l.strip() for l in language.split(",") if l.strip()]
+                if languages_list:
+                    query = query.filter(Movie.original_language.in_(languages_list))
 
             if release_year:
                 query = query.filter(Movie.release_year == release_year)
 
+        return query
+
+    def query_movies_paginated(
+        self,
+        page: int,
+        limit: int,
+        title: Optional[str],
+        genre: Optional[str],
+        language: Optional[str],
+        release_year: Optional[int],
+        sort_by: str,
+        order: str,
+        search_bar: bool = False,
+        fields: Optional[List[str]] = None,
+    ):
+        # ----- Search bar: in-memory index ranked by relevance + popularity -----
+        if title and search_bar:
+            found = self.search_titles(title, limit=limit, offset=(page - 1) * limit, fields=fields)
+            if found is not None:
+                movies, total = found
+                return movies, total, False
+
+        query = self._explore_query(title, genre, language, release_year, search_bar)
+
         # ----- Sorting -----
-        sort_map = {
-            "popularity": Movie.popularity,
-            "title": Movie.title,
-            "release_year": Movie.release_year,
-        }
-        column = sort_map.get(sort_by, Movie.popularity)
-        query = query.order_by(column.desc() if order == "desc" else column.asc())
+        # id is the tie-breaker so pages stay stable when sort keys repeat
+        column = EXPLORE_SORT_COLUMNS.get(sort_by, Movie.popularity)
+        if order == "desc":
+            query = query.order_by(column.desc(), Movie.id.desc())
+        else:
+            query = query.order_by(column.asc(), Movie.id.asc())
 
         # ----- Count Total -----
-        total = query.count()
+        filters_key = explore_filters_key(title, genre, language, release_year, search_bar)
+        total, approximate = self.count_explore_total(query, filters_key)
 
         # ----- Pagination -----
         skip = (page - 1) * limit
-        items = query.offset(skip).limit(limit).all()
+        items = self._project(query, fields).offset(skip).limit(limit).all()
+
+        return self._serialize(items, fields), total, approximate
+
+    def count_explore_total(self, query, filters_key: tuple):
+        """
+        Total rows for an explore filter set, as (total, is_approximate).
+        Served from a short-TTL cache keyed by the filters and catalog version;
+        on a miss, very large result sets use the planner's row estimate.
+        """
+        key = (filters_key, self.get_catalog_version())
+        cached = EXPLORE_TOTALS_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+        result = None
+        if settings.explore.approximate_totals:
+            estimate = self._estimate_rows(query.order_by(None))
+            if estimate is not None and estimate >= settings.explore.estimate_threshold:
+                result = (estimate, True)
+
+        if result is None:
+            result = (query.order_by(None).count(), False)
+
+        EXPLORE_TOTALS_CACHE.set(key, result)
+        return result
+
+    def _estimate_rows(self, query) -> Optional[int]:
+        """Planner row estimate for a query via EXPLAIN (no execution)."""
+        compiled = query.statement.compile(
+            dialect=self._db.get_bind().dialect,
+            compile_kwargs={"render_postcompile": True},
+        )
+        # Savepoint: a failed EXPLAIN must not leave the session's transaction aborted
+        savepoint = self._db.begin_nested()
+        try:
+            row = self._db.connection().exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+            ).fetchone()
+            savepoint.commit()
+            return int(row[0][0]["Plan"]["Plan Rows"])
+        except Exception:
+            savepoint.rollback()
+            return None
+
+    def query_movies_by_cursor(
+        self,
+        limit: int,
+        cursor: Optional[str],
+        title: Optional[str],
+        genre: Optional[str],
+        language: Optional[str],
+        release_year: Optional[int],
+        sort_by: str,
+        order: str,
+        search_bar: bool = False,
+        fields: Optional[List[str]] = None,
+    ):
+        """
+        Keyset pagination: seek past the last (sort key, id) seen instead of
+        OFFSET, so every page costs the same regardless of depth.
+        Ordering follows Postgres defaults (ASC NULLS LAST / DESC NULLS FIRST)
+        so a single (sort key, id) btree index serves both directions.
+        """
+        if sort_by not in EXPLORE_SORT_COLUMNS:
+            sort_by = "popularity"
+        order = "desc" if order == "desc" else "asc"
+        column = EXPLORE_SORT_COLUMNS[sort_by]
+
+        query = self._explore_query(title, genre, language, release_year, search_bar)
+
+        # ----- Seek -----
+        last = decode_cursor(cursor, sort_by, order) if cursor else None
+        if last:
+            key, last_id = last["key"], last["id"]
+            if order == "desc":
+                if key is None:
+                    query = query.filter(or_(
+                        and_(column.is_(None), Movie.id < last_id),
+                        column.isnot(None),
+                    ))
+                else:
+                    query = query.filter(tuple_(column, Movie.id) < tuple_(key, last_id))
+            else:
+                if key is None:
+                    query = query.filter(column.is_(None), Movie.id > last_id)
+                else:
+                    query = query.filter(or_(
+                        tuple_(column, Movie.id) > tuple_(key, last_id),
+                        column.is_(None),
+                    ))
+
+        # ----- Sorting -----
+        if order == "desc":
+            query = query.order_by(column.desc(), Movie.id.desc())
+        else:
+            query = query.order_by(column.asc(), Movie.id.asc())
+
+        # Fetch one extra row to know whether another page exists
+        rows = self._project(query, fields, sort_by).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        items = rows[:limit]
+
+        next_cursor = None
+        if has_more and items:
+            tail = items[-1]
+            next_cursor = encode_cursor(sort_by, order, getattr(tail, sort_by), tail.id)
 
-        return [MovieResponse.model_validate(m) for m in items], total
+        return self._serialize(items, fields), next_cursor
@@ -1,11 +1,19 @@
-from datetime import datetime
-from typing import Optional, List
+from datetime import datetime, timezone
+from typing import Iterable, Optional, List, Tuple
+import numpy as np
 from pydantic import BaseModel, Field, ConfigDict
+from fastapi import HTTPException
+from sqlalchemy import text, literal_column, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.exc import NoResultFound
 
 from . import CRUDManager
+from app.core.settings import settings
+from app.models.movies import Movie
 from app.models.user_feedback import UserFeedback
+from app.utils.cache import TTLCache
+from app.utils.pagination import encode_cursor, decode_cursor
 
 
 from app.model_handlers.movie_handler import MovieResponse
@@ -34,16 +42,124 @@ class UserFeedbackResponse(BaseModel):
     rating: Optional[float]
     review: Optional[str]
     status: Optional[str]
+    updated_at: Optional[datetime] = None
     movie: Optional[MovieResponse] = None
 
 
+FEEDBACK_FIELDS = tuple(f for f in UserFeedbackResponse.model_fields if f != "movie")
+
+
+# ---------- Watched sets ----------
+class WatchedSet:
+    """
+    Immutable sorted int32 array of the movie ids a user has feedback for
+    (watched or watchlisted). Membership is a binary search, and `exclude`
+    filters a whole candidate list in one vectorized call.
+    """
+
+    __slots__ = ("ids",)
+
+    def __init__(self, ids: Iterable[int] = ()):
+        self.ids = np.unique(np.fromiter(ids, dtype=np.int32))
+
+    def __contains__(self, movie_id) -> bool:
+        i = np.searchsorted(self.ids, movie_id)
+        return bool(i < len(self.ids) and self.ids[i] == movie_id)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def exclude(self, movie_ids: List[int]) -> List[int]:
+        """Keep the candidates not in the set, preserving their order."""
+        if not len(self.ids) or not movie_ids:
+            return list(movie_ids)
+        candidates = np.asarray(movie_ids, dtype=np.int64)
+        keep = ~np.isin(candidates, self.ids, assume_unique=False)
+        return candidates[keep].tolist()
+
+    def with_changes(self, added: Iterable[int] = (), removed: Iterable[int] = ()) -> "WatchedSet":
+        ids = np.union1d(self.ids, np.fromiter(added, dtype=np.int32))
+        removed = np.fromiter(removed, dtype=np.int32)
+        if len(removed):
+            ids = np.setdiff1d(ids, removed, assume_unique=True)
+        updated = WatchedSet()
+        updated.ids = ids.astype(np.int32)
+        return updated
+
+
+# ---------- Per-user caches ----------
+USER_STATS_CACHE = TTLCache(ttl=settings.feedback.stats_cache_ttl)
+WATCHED_SET_CACHE = TTLCache(ttl=settings.feedback.watched_cache_ttl, maxsize=settings.feedback.watched_cache_size)
+
+
+def invalidate_feedback_caches(*user_ids: int):
+    """Drop per-user caches derived from feedback rows after a write."""
+    for user_id in user_ids:
+        USER_STATS_CACHE.pop(user_id)
+        WATCHED_SET_CACHE.pop(user_id)
+
+
+def update_watched_set(user_id: int, added: Iterable[int] = (), removed: Iterable[int] = ()):
+    """
+    Apply a write to the cached watched set in place of reloading it.
+    Only the stats cache is dropped; a user without a cached set is left alone.
+    """
+    USER_STATS_CACHE.pop(user_id)
+    cached = WATCHED_SET_CACHE.get(user_id)
+    if cached is not None:
+        WATCHED_SET_CACHE.set(user_id, cached.with_changes(added, removed))
+
+
+# Watch stats in one round trip: totals, top genres and a 12-month histogram
+USER_STATS_SQL = text(
+    """
+    WITH watched AS (
+        SELECT f.rating, f.created_at, m.original_language, m.genre_list
+        FROM user_feedback f
+        JOIN movies m ON m.id = f.movie_id
+        WHERE f.user_id = :user_id AND f.status = 'watched'
+    ),
+    genres AS (
+        SELECT g AS genre, count(*) AS n
+        FROM watched, unnest(genre_list) AS g
+        GROUP BY g
+        ORDER BY n DESC, g
+        LIMIT :top_genres
+    ),
+    months AS (
+        SELECT to_char(date_trunc('month', created_at), 'YYYY-MM') AS month, count(*) AS n
+        FROM watched
+        WHERE created_at >= date_trunc('month', now()) - interval '11 months'
+        GROUP BY 1
+    )
+    SELECT
+        count(*) AS total_watched,
+        count(DISTINCT original_language) AS total_languages_watched,
+        count(*) FILTER (WHERE created_at >= date_trunc('month', now())) AS watched_this_month,
+        count(*) FILTER (WHERE created_at >= date_trunc('year', now())) AS watched_this_year,
+        avg(rating) AS average_rating,
+        COALESCE(
+            (SELECT json_agg(json_build_object('genre', genre, 'count', n) ORDER BY n DESC, genre) FROM genres),
+            '[]'
+        ) AS top_genres,
+        COALESCE(
+            (SELECT json_agg(json_build_object('month', month, 'count', n) ORDER BY month) FROM months),
+            '[]'
+        ) AS monthly_watched
+    FROM watched
+    """
+)
+
+
 # ---------- Handler ----------
 class UserFeedbackHandler(CRUDManager[UserFeedback, UserFeedbackCreate, UserFeedbackUpdate, UserFeedbackResponse]):
     def __init__(self, db: Session):
         super().__init__(db=db, model=UserFeedback, response_schema=UserFeedbackResponse)
 
     def create(self, obj_in: UserFeedbackCreate) -> UserFeedbackResponse:
-        return super().create(obj_in)
+        created = super().create(obj_in)
+        update_watched_set(created.user_id, added=[created.movie_id])
+        return created
 
     def read(self, id: int) -> UserFeedbackResponse:
         return super().read(id)
@@ -62,12 +178,17 @@ class UserFeedbackHandler(CRUDManager[UserFeedback, UserFeedbackCreate, UserFeed
 
         self._db.commit()
         self._db.refresh(feedback)
+        update_watched_set(feedback.user_id)
 
         return UserFeedbackResponse.model_validate(feedback)
 
         
     def delete(self, id: int) -> dict:
-        return super().delete(id)
+        row = self._db.query(UserFeedback.user_id, UserFeedback.movie_id).filter(UserFeedback.id == id).first()
+        deleted = super().delete(id)
+        if row:
+            update_watched_set(row.user_id, removed=[row.movie_id])
+        return deleted
     
     def list_all(self, skip: int = 0, limit: int = 20) -> List[UserFeedbackResponse]:
         return super().list_all(skip, limit)
@@ -76,6 +197,63 @@ class UserFeedbackHandler(CRUDManager[UserFeedback, UserFeedbackCreate, UserFeed
         objs = [self._model(**fb.dict()) for fb in feedback_list]
         self._db.bulk_save_objects(objs)
         self._db.commit()
+        invalidate_feedback_caches(*{fb.user_id for fb in feedback_list})
+
+    def upsert_many(self, user_id: int, items: List[UserFeedbackCreate]) -> List[Tuple[UserFeedbackResponse, bool]]:
+        """
+        Create or update several feedbacks of one user in a single
+        INSERT ... ON CONFLICT (user_id, movie_id) DO UPDATE ... RETURNING
+        statement and one commit. Returns (feedback, was_inserted) pairs.
+        """
+        # One row per movie: a statement cannot update the same row twice
+        latest = {item.movie_id: item for item in items}
+        if not latest:
+            return []
+
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "user_id": user_id,
+                "movie_id": item.movie_id,
+                "rating": item.rating,
+                "review": item.review,
+                "status": item.status,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for item in latest.values()
+        ]
+
+        stmt = insert(UserFeedback).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            constraint="_user_movie_uc",
+            set_={
+                "rating": stmt.excluded.rating,
+                "review": stmt.excluded.review,
+                "status": stmt.excluded.status,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ).returning(
+            UserFeedback.id,
+            UserFeedback.user_id,
+            UserFeedback.movie_id,
+            UserFeedback.rating,
+            UserFeedback.review,
+            UserFeedback.status,
+            UserFeedback.updated_at,
+            # xmax is 0 only for freshly inserted tuples
+            literal_column("(xmax = 0)").label("inserted"),
+        )
+
+        result = self._db.execute(stmt).mappings().all()
+        self._db.commit()
+        update_watched_set(user_id, added=latest.keys())
+
+        return [(UserFeedbackResponse.model_validate(dict(r)), bool(r["inserted"])) for r in result]
+
+    def upsert(self, user_id: int, item: UserFeedbackCreate) -> Tuple[UserFeedbackResponse, bool]:
+        """Create or update one feedback in a single round trip."""
+        return self.upsert_many(user_id, [item])[0]
 
     def get_by_user_movie(self, user_id: int, movie_id: int) -> Optional[UserFeedbackResponse]:
         """Get feedback by user and movie."""
@@ -90,6 +268,23 @@ class UserFeedbackHandler(CRUDManager[UserFeedback, UserFeedbackCreate, UserFeed
         except NoResultFound:
             return None
 
+    def get_user_movie_ids(self, user_id: int) -> List[int]:
+        """Movie ids of all feedbacks of a user (id-only, no ORM objects)."""
+        rows = self._db.query(UserFeedback.movie_id).filter(UserFeedback.user_id == user_id).all()
+        return [r[0] for r in rows]
+
+    def get_watched_set(self, user_id: int) -> WatchedSet:
+        """Cached compact set of movie ids to exclude from the user's recommendations."""
+        return WATCHED_SET_CACHE.get_or_set(user_id, lambda: WatchedSet(self.get_user_movie_ids(user_id)))
+
+    def get_recent_movie_ids(self, user_id: int, limit: int = 10, status: Optional[str] = None) -> List[int]:
+        """Most recently added movie ids of a user, newest first."""
+        query = self._db.query(UserFeedback.movie_id).filter(UserFeedback.user_id == user_id)
+        if status:
+            query = query.filter(UserFeedback.status == status)
+        rows = query.order_by(UserFeedback.created_at.desc()).limit(limit).all()
+        return [r[0] for r in rows]
+
     def get_user_feedbacks(self, user_id: int) -> List[UserFeedbackResponse]:
         """List all feedbacks given by a user."""
         feedbacks = (
@@ -101,6 +296,64 @@ class UserFeedbackHandler(CRUDManager[UserFeedback, UserFeedbackCreate, UserFeed
         )
         return [UserFeedbackResponse.model_validate(fb) for fb in feedbacks]
 
+    def get_user_feedbacks_page(
+        self,
+        user_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        min_rating: Optional[float] = None,
+        max_rating: Optional[float] = None,
+        movie_fields: Optional[List[str]] = None,
+    ) -> Tuple[list, Optional[str]]:
+        """
+        One page of a user's feedbacks, newest first, as (items, next_cursor).
+        Keyset seek on (updated_at, id) served by the (user_id[, status], updated_at, id)
+        indexes, so every page costs the same regardless of history length.
+        `movie_fields` limits the columns loaded for the nested movie.
+        """
+        query = self._db.query(UserFeedback).filter(UserFeedback.user_id == user_id)
+        if status:
+            query = query.filter(UserFeedback.status == status)
+        if min_rating is not None:
+            query = query.filter(UserFeedback.rating >= min_rating)
+        if max_rating is not None:
+            query = query.filter(UserFeedback.rating <= max_rating)
+
+        last = decode_cursor(cursor, "updated_at", "desc") if cursor else None
+        if last:
+            try:
+                last_key = datetime.fromisoformat(last["key"])
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            query = query.filter(tuple_(UserFeedback.updated_at, UserFeedback.id) < tuple_(last_key, last["id"]))
+
+        movie_loader = joinedload(UserFeedback.movie)
+        if movie_fields:
+            movie_loader = movie_loader.load_only(*[getattr(Movie, f) for f in movie_fields])
+
+        rows = (
+            query.options(movie_loader)
+            .order_by(UserFeedback.updated_at.desc(), UserFeedback.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor("updated_at", "desc", rows[-1].updated_at.isoformat(), rows[-1].id)
+
+        if not movie_fields:
+            return [UserFeedbackResponse.model_validate(fb) for fb in rows], next_cursor
+
+        items = []
+        for fb in rows:
+            item = {f: getattr(fb, f) for f in FEEDBACK_FIELDS}
+            item["movie"] = {f: getattr(fb.movie, f) for f in movie_fields} if fb.movie else None
+            items.append(item)
+        return items, next_cursor
+
     def get_movie_feedbacks(self, movie_id: int) -> List[UserFeedbackResponse]:
         """List all feedbacks for a movie."""
         feedbacks = self._db.query(UserFeedback).filter(UserFeedback.movie_id == movie_id).all()
@@ -116,47 +369,22 @@ class UserFeedbackHandler(CRUDManager[UserFeedback, UserFeedbackCreate, UserFeed
         )
         return [UserFeedbackResponse.model_validate(fb) for fb in feedbacks]
 
-    def get_user_stats(self, user_id: int, movie_handler) -> dict:
-        """Return user watch statistics."""
-        feedbacks = (
-            self._db.query(UserFeedback)
-            .filter(UserFeedback.user_id == user_id, UserFeedback.status == "watched")
-            .all()
-        )
-
-        if not feedbacks:
-            return {
-                "total_watched": 0,
-                "total_languages_watched": 0,
-                "watched_this_month": 0,
-                "watched_this_year": 0,
-            }
+    def get_user_stats(self, user_id: int) -> dict:
+        """Return user watch statistics (single aggregate query, cached per user)."""
+        cached = USER_STATS_CACHE.get(user_id)
+        if cached is not None:
+            return cached
 
-        now = datetime.utcnow()
+        row = self._db.execute(USER_STATS_SQL, {"user_id": user_id, "top_genres": 5}).mappings().one()
 
-        total_watched = len(feedbacks)
-        watched_this_month = 0
-        watched_this_year = 0
-        languages = set()
-
-        for fb in feedbacks:
-            movie = movie_handler.get_by_id(fb.movie_id)
-
-            if movie and movie.original_language:
-                languages.add(movie.original_language)
-
-            # Month filter
-            if fb.created_at.year == now.year and fb.created_at.month == now.month:
-                watched_this_month += 1
-
-            # Year filter
-            if fb.created_at.year == now.year:
-                watched_this_year += 1
-
-        return {
-            "total_watched": total_watched,
-            "total_languages_watched": len(languages),
-            "watched_this_month": watched_this_month,
-            "watched_this_year": watched_this_year,
+        stats = {
+            "total_watched": row["total_watched"],
+            "total_languages_watched": row["total_languages_watched"],
+            "watched_this_month": row["watched_this_month"],
+            "watched_this_year": row["watched_this_year"],
+            "average_rating": round(float(row["average_rating"]), 2) if row["average_rating"] is not None else None,
+            "top_genres": row["top_genres"],
+            "monthly_watched": row["monthly_watched"],
         }
-        
+        USER_STATS_CACHE.set(user_id, stats)
+        return stats
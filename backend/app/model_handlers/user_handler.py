@@ -1,11 +1,15 @@
-from datetime import datetime
-from typing import Optional, List
+from datetime import datetime, timezone
+from typing import Optional, List, Dict
+from loguru import logger
 from pydantic import BaseModel, Field, ConfigDict
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.exc import NoResultFound
 
 from . import CRUDManager
 from app.models.users import User
+from app.utils.auth import hash_passwords_parallel
 
 
 class UserCreate(BaseModel):
@@ -69,3 +73,49 @@ class UserHandler(CRUDManager[User, UserCreate, UserUpdate, UserResponse]):
     def get_by_id(self, id: int) -> UserResponse:
         user = self._db.query(User).filter(User.id == id).one()
         return self._response_schema.model_validate(user)
+
+    def bulk_create(
+        self,
+        users: List[UserCreate],
+        hash_passwords: bool = True,
+        batch_size: int = 1000,
+        processes: Optional[int] = None,
+        rounds: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        Provision many users at once: passwords are hashed in parallel across
+        processes, rows are inserted in batches (one commit per batch) and
+        existing emails are skipped. A failed batch is rolled back and skipped;
+        earlier batches stay committed. Returns {email: id} for inserted users.
+        """
+        if not users:
+            return {}
+
+        passwords = [u.hashed_password for u in users]
+        if hash_passwords:
+            passwords = hash_passwords_parallel(passwords, processes=processes, rounds=rounds)
+
+        now = datetime.now(timezone.utc)
+        rows = [
+            {**u.model_dump(), "hashed_password": pw, "created_at": now, "updated_at": now}
+            for u, pw in zip(users, passwords)
+        ]
+
+        created = {}
+        for i in range(0, len(rows), batch_size):
+            stmt = (
+                insert(User)
+                .values(rows[i:i + batch_size])
+                .on_conflict_do_nothing(index_elements=[User.email])
+                .returning(User.id, User.email)
+            )
+            try:
+                inserted = {email: id for id, email in self._db.execute(stmt)}
+                self._db.commit()
+            except SQLAlchemyError as e:
+                self._db.rollback()
+                logger.error(f"❌ User batch {i // batch_size} ({len(rows[i:i + batch_size])} rows) failed: {e}")
+                continue
+            created.update(inserted)
+
+        return created
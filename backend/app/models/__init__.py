@@ -1,9 +1,16 @@
 from app.models.users import User
 from app.models.movies import Movie
 from app.models.user_feedback import UserFeedback
+from app.models.catalog import CatalogVersion
+from app.models.feedback_imports import FeedbackImport
+from app.models.feedback_changes import FeedbackChange, FeedbackConsumer
 
 __all__ = [
     "User",
     "Movie",
-    "UserFeedback"
+    "UserFeedback",
+    "CatalogVersion",
+    "FeedbackImport",
+    "FeedbackChange",
+    "FeedbackConsumer"
 ]
\ No newline at end of file
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, TIMESTAMP, SmallInteger, BigInteger
+from sqlalchemy.sql import func
+from app.core.base import Base
+
+
+class CatalogVersion(Base):
+    """Single-row counter bumped whenever the movie catalog changes."""
+    __tablename__ = "catalog_version"
+
+    id = Column(SmallInteger, primary_key=True, default=1)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
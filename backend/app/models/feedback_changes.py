@@ -0,0 +1,28 @@
+from sqlalchemy import Column, TIMESTAMP, String, Integer, BigInteger, Float
+from sqlalchemy.sql import func, text
+from app.core.base import Base
+
+
+class FeedbackChange(Base):
+    """Append-only log of user_feedback writes, filled by a database trigger."""
+    __tablename__ = "feedback_changes"
+
+    id = Column(BigInteger, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    movie_id = Column(Integer, nullable=False)
+    op = Column(String(10), nullable=False)  # insert|update|delete
+    rating = Column(Float)
+    status = Column(String)
+    changed_at = Column(TIMESTAMP(timezone=True), server_default=func.clock_timestamp())
+    # Writing transaction (pg_current_xact_id()); consumers read in xid order
+    xid = Column(BigInteger, nullable=False, index=True, server_default=text("pg_current_xact_id()::text::bigint"))
+
+
+class FeedbackConsumer(Base):
+    """Cursor of a downstream consumer into feedback_changes."""
+    __tablename__ = "feedback_consumers"
+
+    name = Column(String(64), primary_key=True)
+    # Every change with xid below this has been processed
+    last_xid = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, TIMESTAMP, String, Integer, Text, ForeignKey
+from sqlalchemy.sql import func
+from app.core.base import Base
+
+
+class FeedbackImport(Base):
+    __tablename__ = "feedback_imports"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(String(20), nullable=False, default="pending")  # pending|running|completed|failed
+    total_rows = Column(Integer, default=0)
+    processed_rows = Column(Integer, default=0)
+    imported = Column(Integer, default=0)
+    unresolved = Column(Integer, default=0)
+    invalid = Column(Integer, default=0)
+    error = Column(Text)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
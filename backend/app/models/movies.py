@@ -1,7 +1,9 @@
-from sqlalchemy import Column, TIMESTAMP, String, Text, Integer, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, TIMESTAMP, String, Text, Integer, BigInteger, Float, Index
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from app.core.base import Base
+from app.utils.genres import split_genres
 
 
 class Movie(Base):
@@ -12,6 +14,7 @@ class Movie(Base):
     title = Column(Text, nullable=False)
     overview = Column(Text)
     genres = Column(Text)
+    genre_list = Column(ARRAY(Text))  # normalized genres, kept in sync with `genres`
     original_language = Column(String(50))
     tagline = Column(Text)
     keywords = Column(Text)
@@ -21,6 +24,24 @@ class Movie(Base):
     release_year = Column(Integer)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    # Writing transaction (set by trg_movies_xid); incremental readers use it as cursor
+    xid = Column(BigInteger, nullable=False, server_default="0", index=True)
+
+    # (sort key, id) indexes for keyset pagination on explore
+    __table_args__ = (
+        Index("ix_movies_popularity_id", "popularity", "id"),
+        Index("ix_movies_title_id", "title", "id"),
+        Index("ix_movies_release_year_id", "release_year", "id"),
+        Index("ix_movies_genre_list", "genre_list", postgresql_using="gin"),
+        Index("ix_movies_original_language", "original_language"),
+        Index("ix_movies_title_lower", func.lower(title).label("title_lower"), postgresql_ops={"title_lower": "text_pattern_ops"}),
+        Index("ix_movies_title_trgm", func.lower(title).label("title_lower"), postgresql_using="gin", postgresql_ops={"title_lower": "gin_trgm_ops"}),
+    )
+
+    @validates("genres")
+    def _sync_genre_list(self, key, value):
+        self.genre_list = split_genres(value)
+        return value
 
     # relationships
     feedbacks = relationship("UserFeedback", back_populates="movie", cascade="all, delete")
@@ -1,7 +1,7 @@
 from typing import Any
 
 
-from sqlalchemy import Column, TIMESTAMP, String, Integer, ForeignKey, UniqueConstraint, Float
+from sqlalchemy import Column, TIMESTAMP, String, Integer, ForeignKey, UniqueConstraint, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.base import Base
@@ -16,9 +16,16 @@ class UserFeedback(Base):
     review = Column(String)
     status = Column(String)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
-    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
 
-    __table_args__ = (UniqueConstraint("user_id", "movie_id", name="_user_movie_uc"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "movie_id", name="_user_movie_uc"),
+        # Keyset pagination of history / watchlist (see migrations/0006)
+        Index("ix_user_feedback_user_updated", "user_id", "updated_at", "id"),
+        Index("ix_user_feedback_user_status_updated", "user_id", "status", "updated_at", "id"),
+        Index("ix_user_feedback_user_created", "user_id", "created_at"),
+        Index("ix_user_feedback_movie_id", "movie_id"),
+    )
 
     # relationships
     user = relationship("User", back_populates="feedbacks")
@@ -23,7 +23,6 @@ from faker import Faker
 from tqdm import tqdm
 
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
 
 # robust repo import
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -71,6 +70,9 @@ CLUSTER_POOL_SIZE = CONFIG["CLUSTER_POOL_SIZE"]
 CLUSTER_POOL_OVERLAP = CONFIG["CLUSTER_POOL_OVERLAP"]
 
 FEEDBACK_BATCH_SIZE = CONFIG["FEEDBACK_BATCH_SIZE"]
+USER_BATCH_SIZE = CONFIG.get("USER_BATCH_SIZE", 1000)
+# bcrypt cost for synthetic accounts (None = application default)
+USER_HASH_ROUNDS = CONFIG.get("USER_HASH_ROUNDS")
 
 FRACTION_CLUSTER_POOL = CONFIG["FRACTION_CLUSTER_POOL"]
 FRACTION_POPULARITY = CONFIG["FRACTION_POPULARITY"]
@@ -335,50 +337,59 @@ def generate():
     except Exception as e:
         print("Failed to create fixed user:", e)
 
-    # create remaining users
+    # create remaining users (hashed in parallel, inserted in batches)
     users_per_cluster = math.ceil((TOTAL_USERS - len(users)) / CLUSTERS)
     uid = 2
+    pending = []
     for cidx, c in enumerate(tqdm(clusters_info, desc="Clusters")):
         for _ in range(users_per_cluster):
-            if len(users) >= TOTAL_USERS:
+            if len(users) + len(pending) >= TOTAL_USERS:
                 break
-            try:
-                email = f"{fake.user_name()}_{uid}_{random.randint(1000,9999)}@filmy.com"
-                user = auth.register(UserCreate(
+            email = f"{fake.user_name()}_{uid}_{random.randint(1000,9999)}@filmy.com"
+            # build prefs: start with cluster's two genres then ensure 4-6
+            prefs = list(c["genres"])
+            extras = [g for g in popular_genres if g not in prefs]
+            random.shuffle(extras)
+            while len(prefs) < MIN_USER_GENRES and extras:
+                prefs.append(extras.pop())
+            # occasionally add a 5th/6th genre
+            while len(prefs) < MAX_USER_GENRES and (random.random() < 0.35):
+                if extras:
+                    prefs.append(extras.pop())
+                else:
+                    break
+            # final padding if still short
+            if len(prefs) < MIN_USER_GENRES:
+                pad_candidates = [g for g in GENRES if g not in prefs]
+                random.shuffle(pad_candidates)
+                while len(prefs) < MIN_USER_GENRES and pad_candidates:
+                    prefs.append(pad_candidates.pop())
+            pending.append((
+                UserCreate(
                     email=email,
                     firstname=fake.first_name(),
                     lastname=fake.last_name(),
                     hashed_password=random_password(),
-                ))
-                # build prefs: start with cluster's two genres then ensure 4-6
-                prefs = list(c["genres"])
-                extras = [g for g in popular_genres if g not in prefs]
-                random.shuffle(extras)
-                while len(prefs) < MIN_USER_GENRES and extras:
-                    prefs.append(extras.pop())
-                # occasionally add a 5th/6th genre
-                while len(prefs) < MAX_USER_GENRES and (random.random() < 0.35):
-                    if extras:
-                        prefs.append(extras.pop())
-                    else:
-                        break
-                # final padding if still short
-                if len(prefs) < MIN_USER_GENRES:
-                    pad_candidates = [g for g in GENRES if g not in prefs]
-                    random.shuffle(pad_candidates)
-                    while len(prefs) < MIN_USER_GENRES and pad_candidates:
-                        prefs.append(pad_candidates.pop())
-                user.genre_preferences = ",".join(prefs)
-                user_handler.update(user.id, user)
-                users.append({"id": user.id, "cluster": cidx, "prefs": prefs, "strict": False})
-                uid += 1
-            except SQLAlchemyError as e:
-                print("User creation error:", e)
-                try:
-                    user_handler.db.rollback()
-                except Exception:
-                    pass
-                continue
+                    genre_preferences=",".join(prefs),
+                ),
+                cidx,
+                prefs,
+            ))
+            uid += 1
+
+    print(f"🔐 Provisioning {len(pending)} users in bulk...")
+    # Failed batches are rolled back inside bulk_create; committed ones are kept
+    created = user_handler.bulk_create(
+        [spec for spec, _, _ in pending],
+        batch_size=USER_BATCH_SIZE,
+        rounds=USER_HASH_ROUNDS,
+    )
+    if len(created) < len(pending):
+        print(f"⚠️ {len(pending) - len(created)} users not created (existing emails or failed batches)")
+
+    for spec, cidx, prefs in pending:
+        if spec.email in created:
+            users.append({"id": created[spec.email], "cluster": cidx, "prefs": prefs, "strict": False})
 
     print(f"Created {len(users)} users.")
 
@@ -482,8 +493,7 @@ def generate():
             reason = "naturalistic"
 
         # avoid inserting duplicates already existing in DB for this user
-        existing_fbs = feedback_handler.get_user_feedbacks(user_id)
-        existing_set = {fb.movie_id for fb in existing_fbs} if existing_fbs else set()
+        existing_set = set(feedback_handler.get_user_movie_ids(user_id))
         filtered_ids = [mid for mid in final_ids if mid not in existing_set]
 
         # top-up if we removed some due to existing entries
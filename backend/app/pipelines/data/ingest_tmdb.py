@@ -1,10 +1,14 @@
+import json
 import os
+import resource
+import shutil
 import time
 import logging
 from datetime import datetime, timedelta
 from loguru import logger
 
 import pandas as pd
+import pyarrow.dataset as ds
 import psycopg2
 import psycopg2.extras
 
@@ -12,24 +16,32 @@ from app.pipelines.utils.storage import (
     get_s3fs,
     write_obj_to_minio,
     read_json_from_minio,
-    upload_local_file_to_minio,
     dvc_config_remote,
     dvc_add_and_push,
 )
 
-from app.pipelines.utils.tmdb_client import (
-    discover_new_movie_ids,
-    fetch_movie,
+from app.pipelines.utils.tmdb_async import (
+    discover_new_movie_ids_concurrent,
+    iter_movie_chunks,
 )
+from app.pipelines.utils.streaming import StreamingPipeline
 
 from app.core.settings import settings
+from app.utils.genres import normalize_genres
 from app.pipelines.utils.index_embeddings import embed_and_index
+from app.pipelines.data.master_dataset import (
+    S3_ROOT,
+    PARTITION_KEY,
+    write_part,
+    append_parts,
+    migrate_legacy_master,
+    list_partitions,
+    compact_master,
+)
 
 
-BUCKET = os.getenv("MINIO_DATA_BUCKET", "filmy-data")
-MASTER_KEY = "cleaned/tmdb_dataset_cleaned.parquet"
-S3_ROOT = f"s3://{BUCKET}"
-MASTER_PATH = f"{S3_ROOT}/{MASTER_KEY}"
+# Per-run parquet parts of committed chunks, appended to the master at the end
+STAGING_PREFIX = "staging/ingest"
 
 username = settings.db.username
 password = settings.DB_PASSWORD
@@ -60,15 +72,16 @@ BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
 DATA_DIR = os.path.join(BASE_DIR, "backend", "data")
 os.makedirs(DATA_DIR, exist_ok=True)
 
-TMP_LOCAL = os.path.join(DATA_DIR, "master_ingest.parquet")
-TMP_LOCAL_DVC = os.path.join(DATA_DIR, "master_for_dvc.parquet")
+# Local copy of the day's partition, versioned with DVC
+DVC_LOCAL_DIR = os.path.join(DATA_DIR, "tmdb_master")
 
 
 # ----------------------------------------
 # Normalize TMDB data
 # ----------------------------------------
 def normalize_movie(m: dict) -> dict:
-    genres = ",".join([g["name"] for g in m.get("genres", [])]) if m.get("genres") else None
+    genre_list = normalize_genres([g["name"] for g in m.get("genres", [])])
+    genres = ",".join(genre_list) if genre_list else None
 
     keywords = None
     try:
@@ -84,9 +97,10 @@ def normalize_movie(m: dict) -> dict:
         "title": m.get("title"),
         "overview": m.get("overview") if m.get("overview") else "",
         "genres": genres,
+        "genre_list": genre_list,
         "original_language": lang_full,
         "tagline": m.get("tagline") if m.get("tagline") else "",
-        "keywords": kw,
+        "keywords": keywords,
         "runtime": m.get("runtime") if m.get("runtime") else 0,
         "popularity": m.get("popularity") if m.get("popularity") else 0,
         "poster_path": m.get("poster_path") if m.get("poster_path") else "",
@@ -97,21 +111,32 @@ def normalize_movie(m: dict) -> dict:
 # ----------------------------------------
 # Database Upsert
 # ----------------------------------------
-def upsert_into_postgres(df: pd.DataFrame):
+# Columns handed to the embed stage straight from RETURNING (no re-SELECT)
+EMBED_COLUMNS = [
+    "id", "tmdb_id", "title", "overview", "genres", "original_language",
+    "tagline", "keywords", "runtime", "popularity", "release_year", "poster_path",
+]
+
+
+def upsert_into_postgres(df: pd.DataFrame) -> pd.DataFrame:
+    """Upsert normalized movies; returns their DB rows (EMBED_COLUMNS). Raises on failure."""
     if df.empty:
         logger.info("No rows to upsert into Postgres.")
-        return pd.DataFrame()
+        return pd.DataFrame(columns=EMBED_COLUMNS)
 
     cols = list(df.columns)
     col_sql = ",".join([f'"{c}"' for c in cols])
     update_sql = ",".join([f'"{c}" = EXCLUDED."{c}"' for c in cols if c != "tmdb_id"])
+    # updated_at drives incremental refreshes of the API search index
+    update_sql += ', "updated_at" = now()'
+    returning_sql = ",".join([f'"{c}"' for c in EMBED_COLUMNS])
 
     insert_sql = f"""
         INSERT INTO movies ({col_sql})
         VALUES %s
         ON CONFLICT (tmdb_id)
         DO UPDATE SET {update_sql}
-        RETURNING id, tmdb_id;
+        RETURNING {returning_sql};
     """
 
     records = df.to_dict(orient="records")
@@ -119,49 +144,123 @@ def upsert_into_postgres(df: pd.DataFrame):
     conn = psycopg2.connect(POSTGRES_DSN)
     try:
         with conn.cursor() as cur:
-            psycopg2.extras.execute_values(cur, insert_sql, records, page_size=500)
-            result = cur.fetchall()     # list of (id, tmdb_id)
+            template = "(" + ",".join([f"%({c})s" for c in cols]) + ")"
+            result = psycopg2.extras.execute_values(
+                cur, insert_sql, records, template=template, page_size=500, fetch=True
+            )
+
+            # Invalidate API catalog caches (explore totals, ...) in the same transaction
+            cur.execute("UPDATE catalog_version SET version = version + 1, updated_at = now() WHERE id = 1;")
         conn.commit()
     except Exception as e:
         conn.rollback()
-        logger.exception("Upsert failed: %s", e)
-        return pd.DataFrame()
+        logger.exception(f"Upsert failed: {e}")
+        raise
     finally:
         conn.close()
 
-    # convert to dataframe
-    return pd.DataFrame(result, columns=["id", "tmdb_id"])
+    return pd.DataFrame(result, columns=EMBED_COLUMNS)
 
 
 # ----------------------------------------
-# Fetch movies by tmdb_ids
+# Filter + normalize fetched movies
 # ----------------------------------------
-def fetch_movies_by_tmdb_ids(tmdb_ids):
-    if not tmdb_ids:
-        return pd.DataFrame()
-
-    conn = psycopg2.connect(POSTGRES_DSN)
-    df = pd.read_sql(
-        """
-        SELECT id, tmdb_id, title, overview, genres, original_language,
-               tagline, keywords, runtime, popularity, release_year
-        FROM movies
-        WHERE tmdb_id = ANY(%s)
-        ORDER BY id ASC
-        """,
-        conn,
-        params=[list(tmdb_ids)]
+def keep_movie(m: dict) -> bool:
+    """Released, not adult, allowed language, has a title and release date."""
+    lang = (m.get("original_language") or "").lower()
+    return (
+        m.get("status") == "Released"
+        and m.get("adult") is not True
+        and lang in LANGUAGE_MAP
+        and m.get("title") != ""
+        and m.get("release_date") != ""
     )
-    conn.close()
-    return df
+
+
+def normalize_chunk(fetched) -> dict:
+    """
+    [(tmdb_id, details | None)] -> {"ids": done ids, "rows": normalized rows}.
+    Failed fetches are left out of "ids" so a re-run retries them.
+    """
+    ids, rows = [], []
+    for mid, m in fetched:
+        if m is None:
+            continue
+        ids.append(mid)
+        if not keep_movie(m):
+            continue
+        try:
+            rows.append(normalize_movie(m))
+        except Exception as e:
+            logger.error(f"Error normalizing movie {mid}: {e}")
+    return {"ids": ids, "rows": rows}
+
+
+# ----------------------------------------
+# Checkpointing
+# ----------------------------------------
+class IngestCheckpoint:
+    """
+    Progress of one ingest run, kept in MinIO next to last_ingest.json.
+    A chunk is committed only after its movies are in Postgres, Qdrant and
+    the staging area, so a crashed run resumes after the last committed chunk.
+
+    Every chunk writes only its own ids (`done-NNNNN.json` in the staging
+    area); the checkpoint object holds the committed chunk count.
+    """
+
+    KEY = "metadata/ingest_checkpoint.json"
+
+    def __init__(self, fs, from_date: str, chunks: int = 0):
+        self.fs = fs
+        self.from_date = from_date
+        self.chunks = chunks
+        self.done = set()
+
+    @classmethod
+    def load(cls, fs, from_date: str) -> "IngestCheckpoint":
+        data = read_json_from_minio(cls.KEY) or {}
+        if data.get("from_date") != from_date:
+            return cls(fs, from_date)
+        cp = cls(fs, from_date, data.get("chunks", 0))
+        for i in range(cp.chunks):
+            with fs.open(cp._done_path(i), "r") as f:
+                cp.done.update(json.load(f))
+        logger.info(f"♻️ Resuming ingest: {len(cp.done)} movies in {cp.chunks} committed chunks")
+        return cp
+
+    @property
+    def staging_dir(self) -> str:
+        return f"{S3_ROOT}/{STAGING_PREFIX}/{self.from_date}"
+
+    def _done_path(self, chunk: int) -> str:
+        return f"{self.staging_dir}/done-{chunk:05d}.json"
+
+    def commit(self, ids):
+        ids = list(ids)
+        # Chunk ids first: the chunk counts as committed once the count is written
+        with self.fs.open(self._done_path(self.chunks), "w") as f:
+            json.dump(ids, f)
+        self.done.update(ids)
+        self.chunks += 1
+        write_obj_to_minio({"from_date": self.from_date, "chunks": self.chunks}, self.KEY)
+
+    def clear(self):
+        write_obj_to_minio({}, self.KEY)
 
 
 # ----------------------------------------
 # MAIN INGEST PIPELINE
 # ----------------------------------------
 def run_daily_ingest():
-
+    """
+    Streaming ingest: fetch -> filter/normalize -> Postgres upsert -> embed + Qdrant
+    run concurrently on chunks connected by bounded queues. Committed chunks are
+    checkpointed and staged as parquet parts, then appended to the partitioned
+    master as today's partition; the master is never read or rewritten here.
+    """
     fs = get_s3fs()
+    cfg = settings.ingest
 
     # Load last ingest date
     meta = read_json_from_minio("metadata/last_ingest.json")
@@ -170,89 +269,77 @@ def run_daily_ingest():
 
     logger.info(f"Fetching movies since {last_ingest}")
 
-    # 1. Discover new movies
-    movie_ids = discover_new_movie_ids("2025-11-20")
-
-    rows = []
-    for mid in movie_ids:
+    from_date = "2025-11-20"
+    checkpoint = IngestCheckpoint.load(fs, from_date)
+
+    # 1. Discover new movies (discovery pages fetched in parallel), minus committed ones
+    movie_ids = [mid for mid in discover_new_movie_ids_concurrent(from_date) if mid not in checkpoint.done]
+    logger.info(f"{len(movie_ids)} movies to ingest")
+
+    # 2. Stream the stages
+    pipeline = StreamingPipeline("ingest")
+    q_fetched = pipeline.queue(cfg.queue_size)
+    q_normalized = pipeline.queue(cfg.queue_size)
+    q_upserted = pipeline.queue(cfg.queue_size)
+
+    def upsert(chunk):
+        chunk["db_rows"] = upsert_into_postgres(pd.DataFrame(chunk["rows"]))
+        return chunk
+
+    def embed_and_commit(chunk):
+        embed_and_index(chunk["db_rows"])
+        if chunk["rows"]:
+            write_part(fs, f"{checkpoint.staging_dir}/part-{checkpoint.chunks:05d}.parquet", chunk["rows"])
+        checkpoint.commit(chunk["ids"])
+
+    pipeline.source("fetch", lambda: iter_movie_chunks(movie_ids, cfg.chunk_size), q_fetched)
+    pipeline.stage("normalize", normalize_chunk, q_fetched, q_normalized)
+    pipeline.stage("upsert", upsert, q_normalized, q_upserted)
+    pipeline.stage("embed", embed_and_commit, q_upserted)
+    stage_stats = pipeline.run()
+
+    # 3. Append staged parts (this run and any resumed one) as today's partition
+    parts = sorted(fs.glob(f"{checkpoint.staging_dir}/part-*.parquet"))
+    migrate_legacy_master(fs)
+    published = append_parts(fs, parts, today) if parts else []
+    new_movies = ds.dataset(published, format="parquet", filesystem=fs).count_rows() if published else 0
+    logger.info(f"{new_movies} new movies after filtering")
+
+    # 4. DVC tracking: only the files added to today's partition
+    if published:
         try:
-            m = fetch_movie(mid)
-
-            lang = m.get("original_language", "").lower()
-
-            # Filters: released, not adult, allowed languages
-            if m.get("status") != "Released":
-                continue
-            if m.get("adult") is True:
-                continue
-            if lang not in LANGUAGE_MAP:
-                continue
-            if m.get("title") == "":
-                continue
-            if m.get("release_date") == "":
-                continue
+            local_dir = os.path.join(DVC_LOCAL_DIR, f"{PARTITION_KEY}={today}")
+            os.makedirs(local_dir, exist_ok=True)
+            for path in published:
+                fs.get(path, os.path.join(local_dir, os.path.basename(path)))
 
-            rows.append(normalize_movie(m))
-
-        except Exception as e:
-            logger.error(f"Error fetching movie {mid}: {e}")
+            dvc_config_remote()
+            dvc_add_and_push(local_dir)
 
-    df_new = pd.DataFrame(rows)
-    logger.info(f"{len(df_new)} new movies after filtering")
+            shutil.rmtree(local_dir, ignore_errors=True)
 
-    # 2. Load master
-    if fs.exists(MASTER_PATH):
-        with fs.open(MASTER_PATH, "rb") as f:
-            df_old = pd.read_parquet(f)
-    else:
-        df_old = pd.DataFrame()
-
-    # 3. Merge + dedupe
-    df_all = pd.concat([df_old, df_new], ignore_index=True)
-    df_all = df_all.drop_duplicates(subset=["tmdb_id"], keep="last")
-
-    # 4. Write new master parquet locally
-    df_all.to_parquet(TMP_LOCAL, index=False)
-    upload_local_file_to_minio(TMP_LOCAL, MASTER_KEY, bucket=BUCKET)
-    logger.info("Uploaded updated master to MinIO")
-
-    # Delete local file after upload
-    if os.path.exists(TMP_LOCAL):
-        os.remove(TMP_LOCAL)
-
-    # 5. DVC tracking
-    try:
-        fs.get(MASTER_PATH, TMP_LOCAL_DVC)
-
-        dvc_config_remote()
-        dvc_add_and_push(TMP_LOCAL_DVC)
-
-        # clean tmp file
-        os.remove(TMP_LOCAL_DVC)
-
-        logger.info("DVC updated with new dataset version")
-    except Exception as e:
-        logger.error(f"DVC update failed: {e}")
-
-    # 6. Upsert new movies into Postgres → returns IDs
-    df_upserted = upsert_into_postgres(df_new)
-
-    # df_upserted contains: id, tmdb_id
-    tmdb_ids = df_upserted["tmdb_id"].tolist()
-
-    # 7. Fetch full movie rows including DB IDs
-    df_final_new = fetch_movies_by_tmdb_ids(tmdb_ids)
-
-    # 8. Embed + index to Qdrant
-    embed_and_index(df_final_new)
-
-    # 9. Update metadata
+            logger.info("DVC updated with new dataset partition")
+        except Exception as e:
+            logger.error(f"DVC update failed: {e}")
+
+    # 5. Fold partitions together once there are too many
+    partitions = list_partitions(fs)
+    if len(partitions) > cfg.compact_after_partitions:
+        compact_master(fs)
+        partitions = list_partitions(fs)
+
+    # 6. Run complete: drop staging + checkpoint, update metadata
+    if fs.exists(checkpoint.staging_dir):
+        fs.rm(checkpoint.staging_dir, recursive=True)
+    checkpoint.clear()
     write_obj_to_minio({"last_ingest": today}, "metadata/last_ingest.json")
 
     return {
-        "new_movies": len(df_new),
-        "total_master_rows": len(df_all),
+        "new_movies": new_movies,
+        "master_partitions": len(partitions),
         "last_ingest": today,
+        "stages": stage_stats,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
     }
 
 
@@ -0,0 +1,249 @@
+"""
+Master TMDB dataset, stored as a hive-partitioned Parquet dataset in MinIO:
+
+    s3://filmy-data/cleaned/tmdb_master/ingest_date=YYYY-MM-DD/part-*.parquet
+
+Ingest runs only append a new partition; nothing is rewritten daily. A movie
+re-ingested later lands in a newer partition, and readers keep the row from
+the latest ingest_date. `compact_master` periodically folds all partitions into
+one deduplicated partition.
+
+DVC versions only the daily deltas (the files each ingest appends, under
+data/tmdb_master/ingest_date=*); compacted files are not tracked. Any master
+state is rebuilt from those deltas with `latest_per_movie`, on top of the
+pre-partitioning baseline (the last tmdb_dataset_cleaned.parquet.dvc pointer
+in git history).
+
+Usage (from backend/):
+    python -m app.pipelines.data.master_dataset compact
+    python -m app.pipelines.data.master_dataset stats
+"""
+
+import argparse
+import os
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from loguru import logger
+
+from app.pipelines.utils.storage import get_s3fs
+
+
+BUCKET = os.getenv("MINIO_DATA_BUCKET", "filmy-data")
+S3_ROOT = f"s3://{BUCKET}"
+MASTER_PREFIX = "cleaned/tmdb_master"
+# fsspec-style path (no scheme) as used by s3fs.glob / pyarrow
+MASTER_DIR = f"{BUCKET}/{MASTER_PREFIX}"
+
+# Single-file master written by older ingest runs
+LEGACY_MASTER_KEY = "cleaned/tmdb_dataset_cleaned.parquet"
+LEGACY_PARTITION = "1970-01-01"
+
+PARTITION_KEY = "ingest_date"
+# Virtual column with the source file of every row (pyarrow dataset)
+FILENAME_FIELD = "__filename"
+
+# Explicit schema so parts with all-null columns still unify
+MASTER_SCHEMA = pa.schema([
+    ("tmdb_id", pa.int64()),
+    ("title", pa.string()),
+    ("overview", pa.string()),
+    ("genres", pa.string()),
+    ("genre_list", pa.list_(pa.string())),
+    ("original_language", pa.string()),
+    ("tagline", pa.string()),
+    ("keywords", pa.string()),
+    ("runtime", pa.int64()),
+    ("popularity", pa.float64()),
+    ("poster_path", pa.string()),
+    ("release_year", pa.int64()),
+])
+
+PARTITIONING = ds.partitioning(pa.schema([(PARTITION_KEY, pa.string())]), flavor="hive")
+
+
+def partition_dir(ingest_date: str) -> str:
+    return f"{MASTER_DIR}/{PARTITION_KEY}={ingest_date}"
+
+
+# ----------------------------------------
+# Writing
+# ----------------------------------------
+def write_part(fs, path: str, rows: List[dict]):
+    """Write normalized movie rows as one Parquet file in MASTER_SCHEMA."""
+    table = pa.Table.from_pylist(rows, schema=MASTER_SCHEMA)
+    with fs.open(path, "wb") as f:
+        pq.write_table(table, f)
+
+
+def append_parts(fs, parts: List[str], ingest_date: str) -> List[str]:
+    """
+    Publish staged parts into the `ingest_date` partition (server-side copies,
+    no download). Files are named by publish time, so several runs on one day
+    add up and the later one wins; a retried publish only adds duplicates.
+    """
+    target = partition_dir(ingest_date)
+    batch = datetime.now().strftime("%H%M%S%f")
+
+    published = []
+    for i, part in enumerate(sorted(parts)):
+        dest = f"{target}/part-{batch}-{i:05d}.parquet"
+        fs.copy(part, dest)
+        published.append(dest)
+
+    logger.info(f"📦 Appended {len(published)} parts to {target}")
+    return published
+
+
+def migrate_legacy_master(fs) -> bool:
+    """Move the old single-file master into the oldest partition (once)."""
+    legacy = f"{BUCKET}/{LEGACY_MASTER_KEY}"
+    if not fs.exists(legacy):
+        return False
+    fs.copy(legacy, f"{partition_dir(LEGACY_PARTITION)}/part-00000.parquet")
+    fs.rm(legacy)
+    logger.info(f"📦 Moved legacy master {legacy} into partition {LEGACY_PARTITION}")
+    return True
+
+
+# ----------------------------------------
+# Reading
+# ----------------------------------------
+def list_partitions(fs) -> List[str]:
+    """Sorted ingest dates present in the master."""
+    if not fs.exists(MASTER_DIR):
+        return []
+    prefix = f"{PARTITION_KEY}="
+    dates = [
+        os.path.basename(p.rstrip("/"))[len(prefix):]
+        for p in fs.ls(MASTER_DIR, detail=False)
+        if os.path.basename(p.rstrip("/")).startswith(prefix)
+    ]
+    return sorted(dates)
+
+
+def master_dataset(fs=None) -> ds.Dataset:
+    fs = fs or get_s3fs()
+    return ds.dataset(
+        MASTER_DIR,
+        schema=MASTER_SCHEMA.append(pa.field(PARTITION_KEY, pa.string())),
+        format="parquet",
+        filesystem=fs,
+        partitioning=PARTITIONING,
+    )
+
+
+def latest_per_movie(table: pa.Table) -> pa.Table:
+    """
+    Keep one row per tmdb_id: the one from the latest ingest_date. Within a
+    day, ingest parts ("part-*") win over a compacted file ("compacted-*");
+    later same-day parts win over earlier ones.
+    Expects tmdb_id, ingest_date and __filename; drops __filename.
+    """
+    if table.num_rows == 0:
+        return table.drop_columns([FILENAME_FIELD])
+    table = table.sort_by([(PARTITION_KEY, "descending"), (FILENAME_FIELD, "descending")])
+    # Index of the first (latest) row of every tmdb_id
+    idx = pa.array(range(table.num_rows), pa.int64())
+    firsts = (
+        pa.table({"tmdb_id": table["tmdb_id"], "idx": idx})
+        .group_by("tmdb_id", use_threads=False)
+        .aggregate([("idx", "min")])
+    )
+    keep = firsts["idx_min"]
+    return table.take(pc.take(keep, pc.sort_indices(keep))).drop_columns([FILENAME_FIELD])
+
+
+def scan_master(
+    columns: Optional[List[str]] = None,
+    filter: Optional[ds.Expression] = None,
+    dedupe: bool = True,
+    fs=None,
+) -> pa.Table:
+    """
+    Read the master with column projection and predicate pushdown.
+
+        scan_master(["tmdb_id", "title"], ds.field("release_year") >= 2020)
+        scan_master(filter=ds.field("ingest_date") >= "2025-12-01")   # partition pruning
+
+    With `dedupe`, tmdb_id and ingest_date are read as well to resolve movies
+    present in several partitions (before the next compaction).
+    """
+    dataset = master_dataset(fs)
+    if not dedupe:
+        return dataset.to_table(columns=columns, filter=filter)
+
+    wanted = columns or dataset.schema.names
+    read_cols = list(dict.fromkeys([*wanted, "tmdb_id", PARTITION_KEY, FILENAME_FIELD]))
+    table = latest_per_movie(dataset.to_table(columns=read_cols, filter=filter))
+    return table.select(wanted)
+
+
+# ----------------------------------------
+# Compaction
+# ----------------------------------------
+def compact_master(fs=None) -> dict:
+    """
+    Fold every partition into one deduplicated file in the latest partition.
+
+    The compacted file is written before older partitions are removed; a crash
+    in between only leaves duplicates that readers already resolve. It is not
+    added to DVC: it holds nothing the tracked daily deltas do not.
+    """
+    fs = fs or get_s3fs()
+    partitions = list_partitions(fs)
+    if len(partitions) <= 1:
+        logger.info("Master has at most one partition, nothing to compact")
+        return {"partitions": len(partitions), "compacted": False}
+
+    dataset = master_dataset(fs)
+    old_files = list(dataset.files)
+    rows_before = dataset.count_rows()
+
+    table = scan_master(MASTER_SCHEMA.names, fs=fs)
+    latest = partitions[-1]
+    target = f"{partition_dir(latest)}/compacted-{uuid.uuid4().hex[:8]}.parquet"
+    with fs.open(target, "wb") as f:
+        pq.write_table(table, f)
+
+    for path in old_files:
+        fs.rm(path)
+    for date in partitions[:-1]:
+        if fs.exists(partition_dir(date)):
+            fs.rm(partition_dir(date), recursive=True)
+
+    stats = {
+        "partitions": len(partitions),
+        "rows_before": rows_before,
+        "rows_after": table.num_rows,
+        "compacted": True,
+    }
+    logger.info(f"🗜️ Compacted master into {target}: {stats}")
+    return stats
+
+
+def master_stats(fs=None) -> dict:
+    """Row and file counts from Parquet footers only."""
+    fs = fs or get_s3fs()
+    dataset = master_dataset(fs)
+    return {
+        "partitions": len(list_partitions(fs)),
+        "files": len(dataset.files),
+        "rows": dataset.count_rows(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=["compact", "stats"])
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        logger.info(f"Compaction: {compact_master()}")
+    else:
+        logger.info(f"Master: {master_stats()}")
@@ -0,0 +1,295 @@
+"""
+Zero-downtime full reindex of the movie vectors.
+
+Streams every movie from Postgres (keyset on id), embeds it into a new
+versioned collection next to the live one, catches up with movies changed
+while it ran, verifies counts and sample queries, then atomically repoints
+the `settings.qdrant.collection` alias. Search keeps serving the old
+collection until the switch. An interrupted run resumes from its state file.
+
+One-off migration: while the live collection is still a plain (pre-alias)
+collection, the first switch has to drop it before the alias can be created,
+and searches fail until the alias exists (seconds). That run needs
+`--replace-legacy` and belongs in a maintenance window; without the flag the
+new collection is built and verified, and the state is kept so the switch
+can be done later with `--replace-legacy` alone.
+
+Usage (from backend/):
+    python -m app.pipelines.data.reindex_qdrant                 # resume or start
+    python -m app.pipelines.data.reindex_qdrant --fresh --drop-old
+    python -m app.pipelines.data.reindex_qdrant --processes 8 --no-switch
+    python -m app.pipelines.data.reindex_qdrant --sync-config   # HNSW / quantization settings only
+    python -m app.pipelines.data.reindex_qdrant --replace-legacy   # first switch, maintenance window
+
+A new collection is always created with the current HNSW and quantization
+settings; `--sync-config` applies them to the live collection in place instead.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Optional
+
+from loguru import logger
+from qdrant_client import models
+from sqlalchemy import func, select, text
+
+from app.core.db import SessionLocal
+from app.core.qdrant import PAYLOAD_FIELDS, Qdrant, get_qdrant_client, sync_collection_config
+from app.core.settings import settings
+from app.model_handlers.movie_handler import MovieHandler
+from app.models.movies import Movie
+from app.pipelines.utils.embedding_pool import EmbeddingPool
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+
+# Embedding text fields + payload fields
+REINDEX_FIELDS = list(dict.fromkeys([*PAYLOAD_FIELDS, "tagline", "keywords"]))
+
+
+# ----------------------------------------
+# Resume state
+# ----------------------------------------
+def state_path() -> str:
+    return os.path.join(BACKEND_DIR, settings.qdrant.reindex_state_path)
+
+
+def load_state() -> Optional[dict]:
+    path = state_path()
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(state: dict):
+    path = state_path()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def clear_state():
+    path = state_path()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+# ----------------------------------------
+# Reconciliation
+# ----------------------------------------
+def delete_missing(qdrant: Qdrant, db, target: str) -> int:
+    """Delete points of movies no longer in Postgres (deleted during the reindex)."""
+    db_ids = set(db.execute(select(Movie.id)).scalars())
+    stale, offset = [], None
+    while True:
+        points, offset = qdrant.client.scroll(
+            collection_name=target,
+            limit=settings.qdrant.reindex_batch_size,
+            offset=offset,
+            with_payload=False,
+            with_vectors=False,
+        )
+        stale.extend(int(p.id) for p in points if int(p.id) not in db_ids)
+        if offset is None:
+            break
+    if stale:
+        qdrant.client.delete(collection_name=target, points_selector=models.PointIdsList(points=stale))
+        logger.info(f"🗑️ Removed {len(stale)} movies deleted during the reindex")
+    return len(stale)
+
+
+# ----------------------------------------
+# Verification
+# ----------------------------------------
+def verify_collection(qdrant: Qdrant, db, target: str, samples: int) -> dict:
+    """Point count must match Postgres; sample movies must find themselves first."""
+    db_count = db.execute(select(func.count(Movie.id))).scalar()
+    indexed = qdrant.client.count(collection_name=target, exact=True).count
+
+    ids = db.execute(select(Movie.id).order_by(func.random()).limit(samples)).scalars().all()
+    points = qdrant.client.retrieve(collection_name=target, ids=ids, with_payload=False, with_vectors=True)
+
+    live = qdrant.get_alias_target()
+    compare_live = live is not None and live != target and (
+        qdrant.client.get_collection(live).config.params.vectors.size == qdrant.vector_size
+    )
+
+    self_hits, overlap = 0, []
+    for p in points:
+        hits = qdrant.client.search(collection_name=target, query_vector=p.vector, limit=10, with_payload=False)
+        if hits and int(hits[0].id) == int(p.id):
+            self_hits += 1
+        if compare_live:
+            old = qdrant.client.search(collection_name=live, query_vector=p.vector, limit=10, with_payload=False)
+            new_ids, old_ids = {int(h.id) for h in hits}, {int(h.id) for h in old}
+            if new_ids:
+                overlap.append(len(new_ids & old_ids) / len(new_ids))
+
+    report = {
+        "db_movies": db_count,
+        "indexed_points": indexed,
+        "samples": len(ids),
+        "sample_points_found": len(points),
+        "self_hit_rate": round(self_hits / len(points), 3) if points else None,
+        # Informational: how much the top-10 neighbourhoods moved vs the live collection
+        "top10_overlap_with_live": round(sum(overlap) / len(overlap), 3) if overlap else None,
+    }
+    report["ok"] = (
+        indexed == db_count
+        and len(points) == len(ids)
+        and (not points or self_hits / len(points) >= 0.95)
+    )
+    return report
+
+
+# ----------------------------------------
+# Reindex
+# ----------------------------------------
+def run_reindex(
+    fresh: bool = False,
+    processes: Optional[int] = None,
+    in_process: bool = False,
+    batch_size: Optional[int] = None,
+    switch: bool = True,
+    drop_old: bool = False,
+    replace_legacy: bool = False,
+) -> dict:
+    cfg = settings.qdrant
+    batch_size = batch_size or cfg.reindex_batch_size
+    qdrant = get_qdrant_client()
+    db = SessionLocal()
+
+    try:
+        state = None if fresh else load_state()
+        if state and not qdrant.client.collection_exists(state["collection"]):
+            logger.warning(f"⚠️ Collection '{state['collection']}' from the state file is gone, starting over.")
+            state = None
+
+        if state is None:
+            target = f"{qdrant.collection_name}_v{datetime.now():%Y%m%d%H%M%S}"
+            qdrant.create_movie_collection(target)
+            state = {
+                "collection": target,
+                "last_id": 0,
+                "indexed": 0,
+                "embed_seconds": 0.0,
+                # Snapshot xmin: movies written by this or later transactions are
+                # re-upserted in the catch-up pass (movies.xid, see migration 0009)
+                "started_xid": db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")).scalar(),
+            }
+            save_state(state)
+            logger.info(f"🚀 Reindexing into new collection '{target}'")
+        else:
+            target = state["collection"]
+            logger.info(f"♻️ Resuming reindex into '{target}' after movie id {state['last_id']} ({state['indexed']} done)")
+
+        # 1. Full pass, streamed in id order
+        handler = MovieHandler(db)
+        with EmbeddingPool(processes=processes) as pool:
+            encoder = None if in_process else pool
+            for rows in handler.iter_export_chunks(REINDEX_FIELDS, chunk_size=batch_size, after_id=state["last_id"]):
+                t0 = time.perf_counter()
+                qdrant.upsert_movies(rows, force=True, encoder=encoder, collection=target)
+                state["embed_seconds"] += time.perf_counter() - t0
+                state["last_id"] = rows[-1]["id"]
+                state["indexed"] += len(rows)
+                save_state(state)
+                logger.info(
+                    f"📈 {state['indexed']} movies indexed "
+                    f"({state['indexed'] / max(state['embed_seconds'], 1e-9):.1f} movies/s)"
+                )
+        db.rollback()  # end the streaming transaction
+
+        # 2. Catch up with movies the daily ingest touched meanwhile (only changed text is re-embedded)
+        changed = db.execute(
+            select(*[getattr(Movie, f) for f in REINDEX_FIELDS])
+            .where(Movie.xid >= state.get("started_xid", 0))
+        ).mappings().all()
+        if changed:
+            logger.info(f"🔁 Catching up {len(changed)} movies changed during the reindex")
+            qdrant.upsert_movies([dict(r) for r in changed], collection=target)
+        removed = delete_missing(qdrant, db, target)
+
+        # 3. Verify before switching
+        verification = verify_collection(qdrant, db, target, cfg.reindex_sample_queries)
+        logger.info(f"🔎 Verification: {verification}")
+
+        report = {
+            "collection": target,
+            "indexed": state["indexed"],
+            "caught_up": len(changed),
+            "removed": removed,
+            "embed_seconds": round(state["embed_seconds"], 1),
+            "movies_per_s": round(state["indexed"] / state["embed_seconds"], 1) if state["embed_seconds"] else None,
+            "verification": verification,
+            "switched": False,
+        }
+        if not verification["ok"]:
+            logger.error(f"❌ Verification failed, alias '{qdrant.collection_name}' left unchanged.")
+            return report
+
+        # 4. Atomic alias switch
+        if switch and qdrant.has_legacy_collection() and not replace_legacy:
+            logger.warning(
+                f"⚠️ '{qdrant.collection_name}' is still a plain collection. Switching drops it before the "
+                f"alias exists; re-run with --replace-legacy in a maintenance window. State kept."
+            )
+            return report
+        if switch:
+            previous = qdrant.switch_alias(target, replace_legacy=replace_legacy)
+            report["switched"] = True
+            report["previous"] = previous
+            if previous and drop_old:
+                qdrant.client.delete_collection(previous)
+                logger.info(f"🗑️ Dropped previous collection '{previous}'")
+            clear_state()
+        return report
+    finally:
+        db.close()
+
+
+# ----------------------------------------
+# In-place config update
+# ----------------------------------------
+def run_sync_config() -> dict:
+    """Apply HNSW / quantization settings to the live collection without re-embedding."""
+    qdrant = get_qdrant_client()
+    target = qdrant.get_alias_target() or qdrant.collection_name
+    drift = sync_collection_config(qdrant.client, target)
+    return {"collection": target, "updated": drift}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fresh", action="store_true", help="Ignore the state file and start a new collection")
+    parser.add_argument("--processes", type=int, default=None, help="Embedding worker processes")
+    parser.add_argument("--in-process", action="store_true", help="Encode with the local model, no worker pool")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--no-switch", action="store_true", help="Build and verify only")
+    parser.add_argument("--drop-old", action="store_true", help="Delete the previous collection after switching")
+    parser.add_argument("--replace-legacy", action="store_true", help="Allow dropping a pre-alias collection on the first switch")
+    parser.add_argument("--sync-config", action="store_true", help="Only apply HNSW / quantization settings to the live collection")
+    args = parser.parse_args()
+
+    if args.sync_config:
+        logger.info(f"Config sync: {run_sync_config()}")
+        sys.exit(0)
+
+    result = run_reindex(
+        fresh=args.fresh,
+        processes=args.processes,
+        in_process=args.in_process,
+        batch_size=args.batch_size,
+        switch=not args.no_switch,
+        drop_old=args.drop_old,
+        replace_legacy=args.replace_legacy,
+    )
+    logger.info(f"Reindex report: {result}")
+    sys.exit(0 if result["verification"]["ok"] else 1)
@@ -0,0 +1,19 @@
+from prefect import flow, task, get_run_logger
+from app.pipelines.data.master_dataset import compact_master
+
+
+@task
+def compaction_task():
+    logger = get_run_logger()
+    res = compact_master()
+    logger.info(f"Compaction Result: {res}")
+    return res
+
+
+@flow(name="compaction_flow")
+def run_compaction():
+    compaction_task()
+
+
+if __name__ == "__main__":
+    run_compaction()
@@ -1,25 +1,20 @@
 import os
-import psycopg2
-from datetime import datetime
 
 from prefect import flow, task, get_run_logger
 import mlflow
 
-from app.core.settings import settings
+from app.core.db import SessionLocal
+from app.model_handlers.feedback_change_handler import FeedbackChangeHandler
 from app.pipelines.training.train_implicit import train
 
-DB_USER = settings.db.username
-DB_PASS = settings.DB_PASSWORD
-DB_HOST = settings.db.host
-DB_NAME = settings.db.database
-DB_PORT = settings.db.port
-
-POSTGRES_DSN = f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 MLFLOW_URI = os.getenv("MLFLOW_TRACKING_URI", "http://mlflow:5000")
 MLFLOW_EXPERIMENT = os.getenv("MLFLOW_EXPERIMENT", "filmy_implicit_training")
 
 THRESHOLD = 100
 
+# Cursor name of this flow in feedback_consumers
+TRAINING_CONSUMER = "training"
+
 
 # ---------------------------------------------------------
 # Helper: Get timestamp of last successful MLflow training run
@@ -46,54 +41,52 @@ def get_last_training_time_from_mlflow():
 
 
 # ---------------------------------------------------------
-# Helper: count new feedback since last train
+# Helper: train, move the change-log cursor on success and prune the log
 # ---------------------------------------------------------
-def get_new_feedback_count(conn, last_train_time):
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        SELECT COUNT(*) 
-        FROM user_feedback
-        WHERE created_at > %s;
-        """,
-        (last_train_time,),
-    )
-
-    count = cur.fetchone()[0]
-    return count
+def train_and_advance(changes: FeedbackChangeHandler, head: int):
+    result = train()
+    changes.advance(TRAINING_CONSUMER, head)
+    changes.prune()
+    return result
 
 
 # ---------------------------------------------------------
-# Prefect Task: train only if enough new feedback
+# Prefect Task: train only if enough feedback changed
 # ---------------------------------------------------------
 @task
 def train_if_needed():
     logger = get_run_logger()
 
-    # 1. Get last training time from MLflow
-    last_train_time = get_last_training_time_from_mlflow()
+    db = SessionLocal()
+    try:
+        changes = FeedbackChangeHandler(db)
 
-    if last_train_time is None:
-        logger.info("No previous training run found in MLflow → training now.")
-        return train()
+        # Changes up to here are covered by this run's training data
+        head = changes.head()
 
-    logger.info(f"Last training time (from MLflow): {last_train_time}")
+        # 1. Get last training time from MLflow
+        last_train_time = get_last_training_time_from_mlflow()
 
-    # 2. Count new feedback rows since last training
-    conn = psycopg2.connect(POSTGRES_DSN)
-    new_count = get_new_feedback_count(conn, last_train_time)
-    conn.close()
+        if last_train_time is None:
+            logger.info("No previous training run found in MLflow → training now.")
+            return train_and_advance(changes, head)
 
-    logger.info(f"New feedback since last training: {new_count}")
+        logger.info(f"Last training time (from MLflow): {last_train_time}")
 
-    # 3. Only train if threshold reached
-    if new_count >= THRESHOLD:
-        logger.info(f"Threshold reached ({new_count} ≥ {THRESHOLD}) → training model.")
-        return train()
+        # 2. Count feedback inserts, rating/status updates and deletes since the last training
+        new_count = changes.count_pending(TRAINING_CONSUMER, upto=head)
 
-    logger.info(f"Only {new_count} new feedback rows (< {THRESHOLD}) → skipping training.")
-    return None
+        logger.info(f"Feedback changes since last training: {new_count}")
+
+        # 3. Only train if threshold reached
+        if new_count >= THRESHOLD:
+            logger.info(f"Threshold reached ({new_count} ≥ {THRESHOLD}) → training model.")
+            return train_and_advance(changes, head)
+
+        logger.info(f"Only {new_count} feedback changes (< {THRESHOLD}) → skipping training.")
+        return None
+    finally:
+        db.close()
 
 
 # ---------------------------------------------------------
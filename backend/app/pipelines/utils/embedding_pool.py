@@ -0,0 +1,161 @@
+"""
+Multi-process sentence-transformer encoding for large indexing jobs.
+
+One model replica per worker process, each pinned to its own set of cores
+with torch limited to that many threads, so N workers use N x threads cores
+without oversubscribing. Chunks are encoded in completion order, so callers
+can stream vectors to Qdrant while other chunks are still encoding.
+"""
+
+import itertools
+import multiprocessing as mp
+import os
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from app.core.settings import settings
+from app.utils.embedding_text import EMBED_MODEL_NAME
+
+
+# ----------------------------------------
+# Worker side
+# ----------------------------------------
+_worker_model = None
+_worker_ready = None
+
+
+def _init_worker(model_name: str, threads: int, core_sets, ready):
+    """Pin the process to one core set and load its model replica."""
+    global _worker_model, _worker_ready
+    _worker_ready = ready
+
+    cores = None
+    try:
+        cores = core_sets.get_nowait()
+    except Exception:
+        pass
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "TOKENIZERS_PARALLELISM"):
+        os.environ[var] = "false" if var == "TOKENIZERS_PARALLELISM" else str(threads)
+
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    torch.set_num_threads(threads)
+    _worker_model = SentenceTransformer(model_name, device="cpu")
+
+
+def _wait_ready(_) -> int:
+    # Holds this worker until every worker runs it, so each one takes exactly one
+    _worker_ready.wait()
+    return os.getpid()
+
+
+def _encode_chunk(task: Tuple[int, List[str], int]) -> Tuple[int, np.ndarray]:
+    idx, texts, batch_size = task
+    vectors = _worker_model.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+    return idx, np.asarray(vectors, dtype=np.float32)
+
+
+# ----------------------------------------
+# Pool
+# ----------------------------------------
+def default_processes(threads_per_process: int) -> int:
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    return max(1, cores // max(1, threads_per_process))
+
+
+class EmbeddingPool:
+    """
+    Usage:
+        with EmbeddingPool(processes=4) as pool:
+            for idx, vectors in pool.encode_chunks(chunks):
+                ...
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        threads_per_process: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        model_name: str = EMBED_MODEL_NAME,
+    ):
+        cfg = settings.embedding
+        self.threads = threads_per_process or cfg.threads_per_process
+        # processes: 0 in settings = one worker per `threads_per_process` cores
+        self.processes = processes or cfg.processes or default_processes(self.threads)
+        self.batch_size = batch_size or settings.qdrant.embed_batch_size
+        self.model_name = model_name
+        self._pool = None
+
+    def _core_sets(self) -> List[List[int]]:
+        if not hasattr(os, "sched_getaffinity"):
+            return []
+        cores = sorted(os.sched_getaffinity(0))
+        if len(cores) < self.processes * self.threads:
+            # Fewer cores than requested: let the scheduler place workers
+            return []
+        return [cores[i * self.threads:(i + 1) * self.threads] for i in range(self.processes)]
+
+    def start(self):
+        """Spawn the workers; called lazily so a job with nothing to encode costs nothing."""
+        if self._pool is not None:
+            return
+        # spawn: torch / tokenizers are not fork-safe once initialised
+        ctx = mp.get_context("spawn")
+        core_sets = ctx.Queue()
+        for cores in self._core_sets():
+            core_sets.put(cores)
+
+        self._pool = ctx.Pool(
+            processes=self.processes,
+            initializer=_init_worker,
+            initargs=(self.model_name, self.threads, core_sets, ctx.Barrier(self.processes)),
+        )
+        logger.info(f"⚙️ Embedding pool: {self.processes} processes x {self.threads} threads")
+
+    def wait_ready(self):
+        """Start the pool and block until every worker has loaded its model."""
+        self.start()
+        self._pool.map(_wait_ready, range(self.processes), chunksize=1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self._pool is None:
+            return
+        if exc[0] is not None:
+            self._pool.terminate()
+        else:
+            self._pool.close()
+        self._pool.join()
+        self._pool = None
+
+    def encode_chunks(self, chunks: Iterable[List[str]]) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield (chunk index, normalized vectors) as workers finish chunks."""
+        tasks = ((i, list(texts), self.batch_size) for i, texts in enumerate(chunks))
+        first = next(tasks, None)
+        if first is None:
+            return
+        # Workers are only spawned once there is a chunk to encode
+        self.start()
+        yield from self._pool.imap_unordered(_encode_chunk, itertools.chain([first], tasks))
+
+    def encode(self, texts: List[str], chunk_size: int = 256) -> np.ndarray:
+        """Encode texts across the pool, longest-first buckets, original order kept."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        buckets = [order[i:i + chunk_size] for i in range(0, len(order), chunk_size)]
+
+        out = None
+        for idx, vectors in self.encode_chunks([texts[j] for j in b] for b in buckets):
+            if out is None:
+                out = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            out[buckets[idx]] = vectors
+        return out
@@ -1,70 +1,33 @@
-from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct, Distance, VectorParams
+from typing import Optional
 
-from sentence_transformers import SentenceTransformer
-import numpy as np
-import pandas as pd
-
-
-# Load once globally for speed
-EMBED_MODEL = SentenceTransformer("sentence-transformers/all-mpnet-base-v2")
-
-QDRANT_URL = "http://localhost:6333"
-QDRANT_COLLECTION = "movies"
+from loguru import logger
 
+import pandas as pd
 
-def build_text(row):
-    return f"""
-Title: {row['title']}
-Overview: {row['overview']}
-Genres: {row['genres']}
-Tagline: {row['tagline']}
-Keywords: {row['keywords']}
-Language: {row['original_language']}
-""".strip()
+from app.core.qdrant import get_qdrant_client
+from app.core.settings import settings
+from app.pipelines.utils.embedding_pool import EmbeddingPool
 
 
-def embed_and_index(df_new: pd.DataFrame):
+def embed_and_index(df_new: pd.DataFrame, processes: Optional[int] = None):
+    """
+    Embed + index upserted movies through `Qdrant.upsert_movies`, which skips
+    re-embedding movies whose embedding text is unchanged. Jobs of at least
+    `embedding.pool_min_movies` movies (or an explicit `processes`) encode in
+    a multi-process EmbeddingPool.
+    """
     if df_new.empty:
         logger.info("No new movies to embed/index.")
         return
 
     logger.info(f"Embedding + indexing {len(df_new)} new movies into Qdrant...")
+    qdrant = get_qdrant_client()
+    records = df_new.to_dict(orient="records")
 
-    qdrant = QdrantClient(QDRANT_URL)
-
-    # Ensure collection exists
-    existing = qdrant.get_collections()
-    if QDRANT_COLLECTION not in {c.name for c in existing.collections}:
-        vec_dim = len(EMBED_MODEL.encode("hello world"))
-        qdrant.recreate_collection(
-            collection_name=QDRANT_COLLECTION,
-            vectors_config=VectorParams(size=vec_dim, distance=Distance.COSINE),
-        )
-
-    # Embed
-    texts = [build_text(row) for _, row in df_new.iterrows()]
-    vectors = EMBED_MODEL.encode(texts, show_progress_bar=True)
-
-    # Prepare points
-    points = []
-    for i, (_, row) in enumerate(df_new.iterrows()):
-        points.append(
-            PointStruct(
-                id=int(row["id"]),
-                vector=vectors[i].tolist(),
-                payload={
-                    "id": int(row["id"]),
-                    "tmdb_id": int(row["tmdb_id"]),
-                    "title": row["title"],
-                    "overview": row["overview"],
-                    "genres": row["genres"],
-                    "release_year": row["release_year"],
-                    "original_language": row["original_language"],
-                    "popularity": row["popularity"],
-                }
-            )
-        )
+    if processes or len(records) >= settings.embedding.pool_min_movies:
+        with EmbeddingPool(processes=processes) as pool:
+            stats = qdrant.upsert_movies(records, encoder=pool)
+    else:
+        stats = qdrant.upsert_movies(records)
 
-    qdrant.upsert(collection_name=QDRANT_COLLECTION, points=points)
-    logger.info(f"Indexed {len(points)} new movies into Qdrant.")
\ No newline at end of file
+    logger.info(f"Indexed {len(df_new)} movies into Qdrant: {stats}")
@@ -0,0 +1,186 @@
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+from loguru import logger
+from queue import Empty, Full, Queue
+
+
+# End-of-stream marker passed down the queues
+DONE = object()
+
+
+class PipelineAborted(Exception):
+    """Raised inside a stage when another stage failed."""
+
+
+class StageMetrics:
+    """Per-stage counters: chunks and items processed, busy time and time blocked on queues."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.chunks = 0
+        self.items = 0
+        self.busy = 0.0
+        self.waiting = 0.0
+        self.started = None
+        self.finished = None
+
+    def as_dict(self) -> dict:
+        elapsed = (self.finished or time.perf_counter()) - (self.started or time.perf_counter())
+        return {
+            "chunks": self.chunks,
+            "items": self.items,
+            "busy_s": round(self.busy, 2),
+            "waiting_s": round(self.waiting, 2),
+            "items_per_s": round(self.items / self.busy, 1) if self.busy else 0.0,
+            "elapsed_s": round(elapsed, 2),
+        }
+
+
+def _size(chunk) -> int:
+    if isinstance(chunk, dict) and "ids" in chunk:
+        return len(chunk["ids"])
+    try:
+        return len(chunk)
+    except TypeError:
+        return 1
+
+
+class StreamingPipeline:
+    """
+    Chain of stages running in their own threads, connected by bounded queues.
+
+    A full queue blocks its producer (backpressure), so at most
+    `maxsize` chunks wait between two stages. The first error in any stage
+    stops every other stage and is re-raised from `run()`.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.metrics = {}
+        self._threads = []
+        self._stop = threading.Event()
+        self._errors = []
+
+    def queue(self, maxsize: int) -> Queue:
+        return Queue(maxsize=maxsize)
+
+    # ----------------------------------------
+    # Queue helpers honouring the stop flag
+    # ----------------------------------------
+    def _put(self, q: Optional[Queue], item, metrics: StageMetrics):
+        if q is None:
+            return
+        t0 = time.perf_counter()
+        while True:
+            if self._stop.is_set():
+                raise PipelineAborted()
+            try:
+                q.put(item, timeout=0.5)
+                break
+            except Full:
+                continue
+        metrics.waiting += time.perf_counter() - t0
+
+    def _get(self, q: Queue, metrics: StageMetrics):
+        t0 = time.perf_counter()
+        while True:
+            if self._stop.is_set():
+                raise PipelineAborted()
+            try:
+                item = q.get(timeout=0.5)
+                break
+            except Empty:
+                continue
+        metrics.waiting += time.perf_counter() - t0
+        return item
+
+    def _fail(self, name: str, e: Exception):
+        if not isinstance(e, PipelineAborted):
+            logger.error(f"❌ Stage '{name}' failed: {e}")
+            self._errors.append(e)
+        self._stop.set()
+
+    def _finish(self, outbox: Optional[Queue], metrics: StageMetrics):
+        metrics.finished = time.perf_counter()
+        if outbox is None:
+            return
+        # Timed like _put: once a stage failed nobody may drain the queue anymore
+        while not self._stop.is_set():
+            try:
+                outbox.put(DONE, timeout=0.5)
+                return
+            except Full:
+                continue
+
+    # ----------------------------------------
+    # Stages
+    # ----------------------------------------
+    def source(self, name: str, produce: Callable[[], Iterable], outbox: Queue):
+        """Stage feeding chunks yielded by `produce()` into `outbox`."""
+        metrics = self.metrics[name] = StageMetrics(name)
+
+        def run():
+            metrics.started = time.perf_counter()
+            try:
+                chunks = iter(produce())
+                while True:
+                    t0 = time.perf_counter()
+                    chunk = next(chunks, DONE)
+                    metrics.busy += time.perf_counter() - t0
+                    if chunk is DONE:
+                        break
+                    metrics.chunks += 1
+                    metrics.items += _size(chunk)
+                    self._put(outbox, chunk, metrics)
+            except Exception as e:
+                self._fail(name, e)
+            finally:
+                self._finish(outbox, metrics)
+
+        self._threads.append(threading.Thread(target=run, name=f"{self.name}-{name}", daemon=True))
+
+    def stage(self, name: str, process: Callable, inbox: Queue, outbox: Optional[Queue] = None):
+        """Stage applying `process(chunk)` to every chunk; a None result is dropped."""
+        metrics = self.metrics[name] = StageMetrics(name)
+
+        def run():
+            metrics.started = time.perf_counter()
+            try:
+                while True:
+                    chunk = self._get(inbox, metrics)
+                    if chunk is DONE:
+                        break
+                    t0 = time.perf_counter()
+                    result = process(chunk)
+                    metrics.busy += time.perf_counter() - t0
+                    metrics.chunks += 1
+                    metrics.items += _size(chunk)
+                    if result is not None:
+                        self._put(outbox, result, metrics)
+            except Exception as e:
+                self._fail(name, e)
+            finally:
+                self._finish(outbox, metrics)
+
+        self._threads.append(threading.Thread(target=run, name=f"{self.name}-{name}", daemon=True))
+
+    # ----------------------------------------
+    # Run
+    # ----------------------------------------
+    def run(self) -> dict:
+        started = time.perf_counter()
+        for t in self._threads:
+            t.start()
+        for t in self._threads:
+            t.join()
+
+        stats = {name: m.as_dict() for name, m in self.metrics.items()}
+        for name, s in stats.items():
+            logger.info(f"📊 {self.name}.{name}: {s}")
+        logger.info(f"⏱️ {self.name} finished in {time.perf_counter() - started:.1f}s")
+
+        if self._errors:
+            raise self._errors[0]
+        return stats
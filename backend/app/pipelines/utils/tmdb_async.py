@@ -0,0 +1,280 @@
+import asyncio
+import os
+import random
+import time
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import httpx
+from loguru import logger
+
+from app.core.settings import settings
+from app.pipelines.utils.tmdb_cache import TMDBResponseCache, get_tmdb_cache
+
+
+TMDB_API_KEY = os.getenv("TMDB_API_KEY")
+TMDB_BASE = os.getenv("TMDB_BASE_URL", settings.tmdb.base_url)
+# Serve everything from the response cache, never the network
+TMDB_OFFLINE = os.getenv("TMDB_OFFLINE", "false").lower() in ("1", "true", "yes")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# TMDB never serves discover pages past 500
+MAX_DISCOVER_PAGES = 500
+
+
+# ----------------------------------------
+# Rate limiting
+# ----------------------------------------
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# ----------------------------------------
+# Client
+# ----------------------------------------
+class AsyncTMDBClient:
+    """
+    Concurrent TMDB client on a pooled httpx.AsyncClient.
+
+    - every request takes a token from a shared bucket (TMDB's request rate)
+    - at most `concurrency` requests are in flight
+    - 429 / 5xx / transport errors are retried with exponential backoff,
+      honouring Retry-After when TMDB sends it
+    - responses go through the on-disk TMDBResponseCache: fresh entries skip
+      the network, stale ones are revalidated with If-None-Match / If-Modified-Since
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        timeout: Optional[float] = None,
+        cache: Optional[TMDBResponseCache] = None,
+        offline: Optional[bool] = None,
+    ):
+        cfg = settings.tmdb
+        self.api_key = api_key or TMDB_API_KEY
+        self.base_url = base_url or TMDB_BASE
+        self.concurrency = concurrency or cfg.concurrency
+        self.max_retries = cfg.max_retries if max_retries is None else max_retries
+        self.timeout = timeout or cfg.timeout
+        self.bucket = TokenBucket(rate or cfg.requests_per_second, burst or cfg.burst)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._client: Optional[httpx.AsyncClient] = None
+        self.cache = cache if cache is not None else get_tmdb_cache()
+        self.offline = TMDB_OFFLINE if offline is None else offline
+
+        self.requests = 0
+        self.retries = 0
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.aclose()
+        self._client = None
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return min(30.0, 0.5 * 2 ** attempt) * (0.5 + random.random() / 2)
+
+    async def _request(self, path: str, params: dict, headers: dict) -> httpx.Response:
+        """GET with rate limiting and retries; returns the final 2xx/304 response."""
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            retry_after = None
+            try:
+                async with self._semaphore:
+                    self.requests += 1
+                    resp = await self._client.get(path, params=params, headers=headers)
+                if resp.status_code not in RETRY_STATUSES:
+                    if resp.status_code != 304:
+                        resp.raise_for_status()
+                    return resp
+                retry_after = resp.headers.get("Retry-After")
+                error = httpx.HTTPStatusError(f"{resp.status_code} for {path}", request=resp.request, response=resp)
+            except httpx.TransportError as e:
+                error = e
+
+            if attempt == self.max_retries:
+                raise error
+            self.retries += 1
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+    async def get(self, path: str, params: Optional[dict] = None) -> dict:
+        params = params or {}
+        cache = self.cache
+
+        cached = cache.get(path, params) if cache else None
+        if cached is not None and (cached.fresh or self.offline):
+            cache.hits += 1
+            return cached.body
+        if self.offline:
+            raise LookupError(f"{path} is not in the TMDB cache (offline mode)")
+
+        headers = cached.conditional_headers() if cached is not None else {}
+        resp = await self._request(path, {**params, "api_key": self.api_key}, headers)
+
+        if resp.status_code == 304 and cached is not None:
+            cache.revalidated += 1
+            cache.touch(path, params)
+            return cached.body
+
+        body = resp.json()
+        if cache:
+            cache.misses += 1
+            cache.put(path, params, body, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return body
+
+    # ----------------------------------------
+    # Endpoints
+    # ----------------------------------------
+    async def discover_movie_ids(self, from_date: str) -> List[int]:
+        """Walk /discover/movie: page 1 first for total_pages, then the rest in parallel."""
+        params = {"primary_release_date.gte": from_date, "sort_by": "primary_release_date.asc"}
+
+        first = await self.get("/discover/movie", {**params, "page": 1})
+        total_pages = min(first.get("total_pages", 1), MAX_DISCOVER_PAGES)
+
+        pages = await asyncio.gather(
+            *(self.get("/discover/movie", {**params, "page": p}) for p in range(2, total_pages + 1))
+        )
+
+        ids = []
+        for data in [first, *pages]:
+            ids.extend(m["id"] for m in data.get("results", []))
+        # Results shift between pages while walking; keep first occurrence
+        return list(dict.fromkeys(ids))
+
+    async def fetch_movie(self, movie_id: int) -> dict:
+        return await self.get(f"/movie/{movie_id}", {"append_to_response": "keywords"})
+
+    async def iter_movies(self, movie_ids: Iterable[int]) -> AsyncIterator[Tuple[int, Optional[dict]]]:
+        """
+        Yield (movie_id, details or None on failure) in completion order,
+        keeping at most 2 x concurrency fetches scheduled at a time.
+        """
+        pending = set()
+        ids = iter(movie_ids)
+        window = self.concurrency * 2
+
+        async def one(mid):
+            try:
+                return mid, await self.fetch_movie(mid)
+            except Exception as e:
+                logger.error(f"Error fetching movie {mid}: {e}")
+                return mid, None
+
+        for mid in ids:
+            pending.add(asyncio.create_task(one(mid)))
+            if len(pending) >= window:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+
+
+# ----------------------------------------
+# Sync entry points for the ingest pipeline
+# ----------------------------------------
+def discover_new_movie_ids_concurrent(from_date: str, **client_kwargs) -> List[int]:
+    async def run():
+        async with AsyncTMDBClient(**client_kwargs) as client:
+            return await client.discover_movie_ids(from_date)
+
+    return asyncio.run(run())
+
+
+def fetch_movies_concurrent(movie_ids: List[int], **client_kwargs) -> Dict[int, dict]:
+    """Fetch movie details concurrently; failed ids are logged and left out."""
+
+    async def run():
+        results = {}
+        started = time.perf_counter()
+        async with AsyncTMDBClient(**client_kwargs) as client:
+            async for mid, movie in client.iter_movies(movie_ids):
+                if movie is not None:
+                    results[mid] = movie
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"✅ Fetched {len(results)}/{len(movie_ids)} movies in {elapsed:.1f}s "
+                f"({client.requests} requests, {client.retries} retries)"
+            )
+            if client.cache:
+                client.cache.log_stats()
+        return results
+
+    return asyncio.run(run())
+
+
+def iter_movie_chunks(movie_ids: List[int], chunk_size: int, **client_kwargs) -> Iterator[List[Tuple[int, Optional[dict]]]]:
+    """
+    Sync generator over concurrent fetches: yields lists of (movie_id, details or None)
+    of `chunk_size` items as they complete. Fetches in flight make progress
+    while the generator waits for the next result.
+    """
+    loop = asyncio.new_event_loop()
+    client = AsyncTMDBClient(**client_kwargs)
+    try:
+        loop.run_until_complete(client.__aenter__())
+        results = client.iter_movies(movie_ids)
+        chunk = []
+        while True:
+            try:
+                item = loop.run_until_complete(results.__anext__())
+            except StopAsyncIteration:
+                break
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+        logger.info(f"✅ TMDB fetch done ({client.requests} requests, {client.retries} retries)")
+        if client.cache:
+            client.cache.log_stats()
+    finally:
+        # Stopped early: drop fetches still in flight
+        tasks = asyncio.all_tasks(loop)
+        if tasks:
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.run_until_complete(client.__aexit__(None, None, None))
+        loop.close()
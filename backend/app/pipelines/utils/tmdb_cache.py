@@ -0,0 +1,187 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Iterator, Optional
+from urllib.parse import urlencode
+
+import orjson
+from loguru import logger
+
+from app.core.settings import settings
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+
+# Never part of the cache key
+UNKEYED_PARAMS = {"api_key"}
+
+
+class CachedResponse:
+    __slots__ = ("body", "etag", "last_modified", "expires_at")
+
+    def __init__(self, body: dict, etag: Optional[str], last_modified: Optional[str], expires_at: float):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class TMDBResponseCache:
+    """
+    Persistent TMDB response cache in a single SQLite file.
+
+    - keyed by path + sorted params (api key excluded)
+    - bodies stored as zlib-compressed JSON
+    - per-endpoint TTLs (`tmdb.cache_ttl`); stale entries with an ETag or
+      Last-Modified are revalidated with a conditional request
+    - hit / revalidation / miss counters for the ingest logs
+    """
+
+    def __init__(self, path: Optional[str] = None, ttls: Optional[dict] = None):
+        path = path or os.getenv("TMDB_CACHE_PATH") or os.path.join(BACKEND_DIR, settings.tmdb.cache_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.ttls = dict(ttls or settings.tmdb.cache_ttl)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_responses_endpoint ON responses (endpoint)")
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stores = 0
+
+    # ----------------------------------------
+    # Keys / TTLs
+    # ----------------------------------------
+    @staticmethod
+    def endpoint(path: str) -> str:
+        """First path segment: /movie/123 -> movie, /discover/movie -> discover."""
+        return path.strip("/").split("/", 1)[0] or "default"
+
+    @staticmethod
+    def make_key(path: str, params: Optional[dict]) -> str:
+        items = sorted((k, str(v)) for k, v in (params or {}).items() if k not in UNKEYED_PARAMS)
+        return f"{path}?{urlencode(items)}" if items else path
+
+    def ttl_for(self, path: str) -> float:
+        return float(self.ttls.get(self.endpoint(path), self.ttls.get("default", 86400)))
+
+    # ----------------------------------------
+    # Read / write
+    # ----------------------------------------
+    def get(self, path: str, params: Optional[dict] = None) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, expires_at FROM responses WHERE key = ?",
+                (self.make_key(path, params),),
+            ).fetchone()
+        if row is None:
+            return None
+        body, etag, last_modified, expires_at = row
+        return CachedResponse(orjson.loads(zlib.decompress(body)), etag, last_modified, expires_at)
+
+    def put(self, path: str, params: Optional[dict], body: dict, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        now = time.time()
+        blob = zlib.compress(orjson.dumps(body), 6)
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO responses (key, endpoint, body, etag, last_modified, fetched_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    body = excluded.body, etag = excluded.etag, last_modified = excluded.last_modified,
+                    fetched_at = excluded.fetched_at, expires_at = excluded.expires_at
+                """,
+                (self.make_key(path, params), self.endpoint(path), blob, etag, last_modified, now, now + self.ttl_for(path)),
+            )
+        self.stores += 1
+
+    def touch(self, path: str, params: Optional[dict] = None):
+        """Extend a revalidated (304) entry by another TTL."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET expires_at = ? WHERE key = ?",
+                (time.time() + self.ttl_for(path), self.make_key(path, params)),
+            )
+
+    def iter_bodies(self, endpoint: str) -> Iterator[dict]:
+        """All cached bodies of an endpoint (e.g. 'movie'), for offline reprocessing."""
+        with self._lock:
+            rows = self._conn.execute("SELECT body FROM responses WHERE endpoint = ? ORDER BY key", (endpoint,)).fetchall()
+        for (body,) in rows:
+            yield orjson.loads(zlib.decompress(body))
+
+    def purge_expired(self, older_than: float = 0) -> int:
+        """Drop entries that expired more than `older_than` seconds ago."""
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time() - older_than,))
+        return cur.rowcount
+
+    # ----------------------------------------
+    # Metrics
+    # ----------------------------------------
+    def stats(self) -> dict:
+        lookups = self.hits + self.revalidated + self.misses
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_ratio": round((self.hits + self.revalidated) / lookups, 3) if lookups else 0.0,
+        }
+
+    def log_stats(self):
+        logger.info(f"📦 TMDB cache: {self.stats()}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# -----------------------------
+# ✅ Singleton instance helper
+# -----------------------------
+_tmdb_cache: Optional[TMDBResponseCache] = None
+_instance_lock = threading.Lock()
+
+
+def get_tmdb_cache() -> Optional[TMDBResponseCache]:
+    """Process-wide cache, or None when `tmdb.cache_enabled` is off."""
+    global _tmdb_cache
+    if not settings.tmdb.cache_enabled:
+        return None
+    with _instance_lock:
+        if _tmdb_cache is None:
+            _tmdb_cache = TMDBResponseCache()
+        return _tmdb_cache
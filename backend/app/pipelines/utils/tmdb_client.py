@@ -2,6 +2,7 @@ import os
 import time
 import requests
 from app.core.settings import settings
+from app.pipelines.utils.tmdb_cache import get_tmdb_cache
 
 TMDB_API_KEY = os.getenv("TMDB_API_KEY")
 TMDB_BASE = settings.tmdb.base_url
@@ -9,10 +10,27 @@ TMDB_SLEEP = float(os.getenv("TMDB_SLEEP", 0.25))
 
 def tmdb_get(path, params=None):
     params = params or {}
-    params["api_key"] = TMDB_API_KEY
-    resp = requests.get(f"{TMDB_BASE}{path}", params=params, timeout=20)
+    cache = get_tmdb_cache()
+
+    cached = cache.get(path, params) if cache else None
+    if cached is not None and cached.fresh:
+        cache.hits += 1
+        return cached.body
+
+    headers = cached.conditional_headers() if cached is not None else {}
+    resp = requests.get(f"{TMDB_BASE}{path}", params={**params, "api_key": TMDB_API_KEY}, headers=headers, timeout=20)
+
+    if resp.status_code == 304 and cached is not None:
+        cache.revalidated += 1
+        cache.touch(path, params)
+        return cached.body
+
     resp.raise_for_status()
-    return resp.json()
+    body = resp.json()
+    if cache:
+        cache.misses += 1
+        cache.put(path, params, body, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+    return body
 
 def discover_new_movie_ids(from_date: str):
     page = 1
@@ -0,0 +1,146 @@
+"""
+Local stand-in for the TMDB API, for exercising the ingest fetchers offline.
+
+Serves /discover/movie and /movie/{id} with synthetic payloads, optional
+latency and injected 429 / 500 responses (random, or a scripted sequence of
+`faults` for tests). Responses carry an ETag and If-None-Match is answered
+with 304.
+
+Usage (from backend/):
+    python -m app.pipelines.utils.tmdb_stub_server --port 8765 --movies 5000 --error-rate 0.02
+    TMDB_BASE_URL=http://127.0.0.1:8765/3 python -m app.pipelines.data.ingest_tmdb
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+PAGE_SIZE = 20
+
+
+def fake_movie(movie_id: int) -> dict:
+    rnd = random.Random(movie_id)
+    return {
+        "id": movie_id,
+        "title": f"Stub Movie {movie_id}",
+        "overview": f"Overview of stub movie {movie_id}.",
+        "tagline": "",
+        "status": "Released",
+        "adult": False,
+        "original_language": rnd.choice(["en", "hi", "fr", "es", "ja"]),
+        "genres": [{"id": 18, "name": "Drama"}, {"id": 35, "name": "Comedy"}][: rnd.randint(1, 2)],
+        "keywords": {"keywords": [{"id": 1, "name": "stub"}]},
+        "runtime": rnd.randint(70, 160),
+        "popularity": round(rnd.random() * 100, 3),
+        "poster_path": f"/stub{movie_id}.jpg",
+        "release_date": f"{rnd.randint(1990, 2025)}-01-01",
+    }
+
+
+def make_handler(movies: int, latency: float, error_rate: float, faults=(), retry_after: str = "1"):
+    """`faults`: statuses (429 / 5xx) served to the first requests, in order."""
+    total_pages = max(1, -(-movies // PAGE_SIZE))
+    scripted = deque(faults)
+    scripted_lock = threading.Lock()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body: dict, headers: dict = None):
+            payload = json.dumps(body).encode("utf-8")
+            if status == 200:
+                etag = '"' + hashlib.md5(payload).hexdigest() + '"'
+                headers = {**(headers or {}), "ETag": etag}
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+
+            with scripted_lock:
+                fault = scripted.popleft() if scripted else None
+            if fault is None:
+                roll = random.random()
+                fault = 429 if roll < error_rate / 2 else 500 if roll < error_rate else None
+            if fault == 429:
+                return self._send(429, {"status_message": "rate limited"}, {"Retry-After": retry_after})
+            if fault is not None:
+                return self._send(fault, {"status_message": "internal error"})
+
+            url = urlparse(self.path)
+            path = url.path[2:] if url.path.startswith("/3") else url.path
+            query = parse_qs(url.query)
+
+            if path == "/discover/movie":
+                page = int(query.get("page", ["1"])[0])
+                start = (page - 1) * PAGE_SIZE + 1
+                ids = range(start, min(start + PAGE_SIZE, movies + 1))
+                return self._send(200, {
+                    "page": page,
+                    "total_pages": total_pages,
+                    "total_results": movies,
+                    "results": [{"id": i} for i in ids],
+                })
+
+            if path.startswith("/movie/"):
+                try:
+                    movie_id = int(path.rsplit("/", 1)[1])
+                except ValueError:
+                    return self._send(404, {"status_message": "not found"})
+                if not 1 <= movie_id <= movies:
+                    return self._send(404, {"status_message": "not found"})
+                return self._send(200, fake_movie(movie_id))
+
+            return self._send(404, {"status_message": "not found"})
+
+    return StubHandler
+
+
+def start_stub_server(
+    port: int = 0,
+    movies: int = 1000,
+    latency: float = 0.05,
+    error_rate: float = 0.0,
+    faults=(),
+    retry_after: str = "1",
+):
+    """Start the stub in a daemon thread; returns (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(movies, latency, error_rate, faults, retry_after))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/3"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--movies", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of 429/500 responses")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args.movies, args.latency, args.error_rate))
+    print(f"TMDB stub listening on http://127.0.0.1:{args.port}/3")
+    server.serve_forever()
@@ -13,11 +13,11 @@ from app.utils.auth import create_access_token
 auth_router = APIRouter(prefix="/auth", tags=["auth"])
 
 @auth_router.post("/register", response_model=AppResponse, status_code=201)
-def register(
+async def register(
     user: UserCreate,
     db: Session = Depends(get_global_db_session)
 ):
-    new_user = AuthService(db).register(user)
+    new_user = await AuthService(db).register(user)
     return AppResponse(
         status="success",
         message="User registered",
@@ -25,11 +25,11 @@ def register(
     )
 
 @auth_router.post("/login", response_model=AppResponse)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_global_db_session)
 ):
-    tokens = AuthService(db).login(form_data.username, form_data.password)
+    tokens = await AuthService(db).login(form_data.username, form_data.password)
     return AppResponse(
         status="success",
         message="Login successful",
@@ -1,18 +1,22 @@
 from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from sqlalchemy.orm import Session
 
 from app.model_handlers.movie_handler import (
     MovieHandler,
     MovieCreate,
     MovieUpdate,
+    MOVIE_FIELDS,
 )
 from app.model_handlers.user_handler import UserResponse
 from app.routes import AppResponse
-from app.core.db import get_global_db_session
+from app.core.db import get_global_db_session, SessionLocal
+from app.utils.export import ndjson_stream, arrow_stream
+from app.utils.projection import parse_fields
 from app.dependencies.auth import get_current_user
 
-movie_router = APIRouter(prefix="/movies", tags=["Movies"])
+movie_router = APIRouter(prefix="/movies", tags=["Movies"], default_response_class=ORJSONResponse)
 
 
 # -----------------------------------
@@ -48,11 +52,13 @@ async def create_or_update_movie(
 @movie_router.get("/", response_model=AppResponse)
 async def get_movies(
     db: Session = Depends(get_global_db_session),
-    limit: int = Query(50, le=500000),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
 ):
     handler = MovieHandler(db)
 
     movies = handler.list_all(
+        skip=skip,
         limit=limit,
     )
 
@@ -63,6 +69,46 @@ async def get_movies(
     )
 
 
+# -----------------------------------
+# 🎬 Bulk Export (Streaming)
+# -----------------------------------
+@movie_router.get("/export")
+def export_movies(
+    format: str = Query("ndjson", pattern="^(ndjson|arrow)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to export (default: all)"),
+    chunk_size: int = Query(5000, ge=100, le=50000),
+):
+    """
+    Stream the full catalog as NDJSON or Arrow IPC. Rows are read with a
+    server-side cursor in chunks, so memory stays flat regardless of size.
+    """
+    selected = [f.strip() for f in fields.split(",") if f.strip()] if fields else list(MOVIE_FIELDS)
+    unknown = [f for f in selected if f not in MOVIE_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    def chunks():
+        # Own session: the stream outlives the request dependency scope
+        db = SessionLocal()
+        try:
+            yield from MovieHandler(db).iter_export_chunks(selected, chunk_size=chunk_size)
+        finally:
+            db.close()
+
+    if format == "arrow":
+        return StreamingResponse(
+            arrow_stream(chunks(), selected),
+            media_type="application/vnd.apache.arrow.stream",
+            headers={"Content-Disposition": 'attachment; filename="movies.arrow"'},
+        )
+
+    return StreamingResponse(
+        ndjson_stream(chunks()),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="movies.ndjson"'},
+    )
+
+
 # -----------------------------------
 # 🎬 Get Movie by TMDB ID (Public)
 # -----------------------------------
@@ -99,10 +145,40 @@ async def explore_movies(
     sort_by: Optional[str] = "popularity",
     order: Optional[str] = "desc", 
     search_bar: bool = Query(False),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (pagination=cursor)"),
+    fields: Optional[str] = Query(None, description="Comma-separated movie fields to return, e.g. id,title,poster_path,release_year"),
 ):
     handler = MovieHandler(db)
+    selected = parse_fields(fields, MOVIE_FIELDS)
+
+    # Keyset pagination (infinite scroll): no OFFSET, no count
+    if pagination == "cursor" or cursor:
+        movies, next_cursor = handler.query_movies_by_cursor(
+            limit=limit,
+            cursor=cursor,
+            title=title,
+            genre=genre,
+            language=language,
+            release_year=release_year,
+            sort_by=sort_by,
+            order=order,
+            search_bar=search_bar,
+            fields=selected,
+        )
 
-    movies, total = handler.query_movies_paginated(
+        return AppResponse(
+            status="success",
+            message="Movies retrieved successfully",
+            data={
+                "movies": movies,
+                "limit": limit,
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+            }
+        )
+
+    movies, total, approximate = handler.query_movies_paginated(
         page=page,
         limit=limit,
         title=title,
@@ -112,6 +188,7 @@ async def explore_movies(
         sort_by=sort_by,
         order=order,
         search_bar=search_bar,
+        fields=selected,
     )
 
     return AppResponse(
@@ -120,6 +197,7 @@ async def explore_movies(
         data={
             "movies": movies,
             "total": total,
+            "total_is_approximate": approximate,
             "page": page,
             "limit": limit,
             "total_pages": (total + limit - 1) // limit,
@@ -127,6 +205,42 @@ async def explore_movies(
     )
 
 
+# -----------------------------------
+# 🎬 Title Autocomplete (Public)
+# -----------------------------------
+@movie_router.get("/autocomplete", response_model=AppResponse)
+async def autocomplete_movies(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=25),
+    db: Session = Depends(get_global_db_session),
+):
+    handler = MovieHandler(db)
+    suggestions = handler.autocomplete(q, limit=limit)
+
+    # Index still warming up: fall back to a title prefix query
+    if suggestions is None:
+        movies, _, _ = handler.query_movies_paginated(
+            page=1, limit=limit, title=q, genre=None, language=None,
+            release_year=None, sort_by="popularity", order="desc",
+        )
+        suggestions = [
+            {
+                "id": m.id,
+                "tmdb_id": m.tmdb_id,
+                "title": m.title,
+                "release_year": m.release_year,
+                "poster_path": m.poster_path,
+            }
+            for m in movies
+        ]
+
+    return AppResponse(
+        status="success",
+        message="Suggestions retrieved successfully",
+        data=suggestions,
+    )
+
+
 # -----------------------------------
 # 🎬 Update Movie by ID (Auth)
 # -----------------------------------
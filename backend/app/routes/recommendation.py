@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 from typing import Optional, List
 from sqlalchemy.orm import Session
 from app.core.db import get_global_db_session
@@ -6,22 +7,30 @@ from app.services.recommendation_service import RecommendationService
 from app.model_handlers.user_handler import UserResponse
 from app.dependencies.auth import get_current_user
 from app.routes import AppResponse
+from app.model_handlers.movie_handler import MOVIE_FIELDS
+from app.utils.projection import parse_fields, project
 
-recommendation_router = APIRouter(prefix="/recommendations", tags=["recommendations"])
+recommendation_router = APIRouter(
+    prefix="/recommendations", tags=["recommendations"], default_response_class=ORJSONResponse
+)
+
+FIELDS_QUERY = Query(None, description="Comma-separated movie fields to return, e.g. id,title,poster_path,release_year")
 
 @recommendation_router.get("/guest", response_model=AppResponse)
 def guest_recommendations(
     genres: Optional[List[str]] = Query(None),
     examples: Optional[List[str]] = Query(None),
     limit: int = Query(10),
-    db: Session = Depends(get_global_db_session)
+    db: Session = Depends(get_global_db_session),
+    fields: Optional[str] = FIELDS_QUERY,
 ):
+    selected = parse_fields(fields, MOVIE_FIELDS)
     service = RecommendationService(db)
     movies = service.guest_recommendations(genres=genres, examples=examples, limit=limit)
     return AppResponse(
         status="success",
         message="Guest recommendations",
-        data=movies
+        data=project(movies, selected)
     )
 
 @recommendation_router.get("/personalized", response_model=AppResponse)
@@ -29,13 +38,15 @@ def personalized_recommendations(
     db: Session = Depends(get_global_db_session),
     current_user: UserResponse = Depends(get_current_user),
     limit: int = Query(10),
+    fields: Optional[str] = FIELDS_QUERY,
 ):
+    selected = parse_fields(fields, MOVIE_FIELDS)
     service = RecommendationService(db)
     movies = service.personalized_recommendations(current_user.id, limit=limit)
     return AppResponse(
         status="success",
         message="Personalized recommendations",
-        data=movies
+        data=project(movies, selected)
     )
 
 @recommendation_router.get("/recent", response_model=AppResponse)
@@ -43,13 +54,15 @@ def recent_activity_recommendations(
     db: Session = Depends(get_global_db_session),
     current_user: UserResponse = Depends(get_current_user),
     limit: int = Query(12),
+    fields: Optional[str] = FIELDS_QUERY,
 ):
+    selected = parse_fields(fields, MOVIE_FIELDS)
     service = RecommendationService(db)
     movies = service.recommendations_based_on_recent_activity(current_user.id, limit=limit)
     return AppResponse(
         status="success",
         message="Recommendations based on recent activity",
-        data=movies
+        data=project(movies, selected)
     )
 
 @recommendation_router.get("/recommend", response_model=AppResponse)
@@ -62,7 +75,9 @@ def search_recommendations(
     limit: int = 20,
     db: Session = Depends(get_global_db_session),
     current_user: Optional[UserResponse] = Depends(get_current_user),
+    fields: Optional[str] = FIELDS_QUERY,
 ):
+    selected = parse_fields(fields, MOVIE_FIELDS)
     service = RecommendationService(db)
     movies = service.search_recommendations(
         user_id=current_user.id if current_user else None,
@@ -76,7 +91,7 @@ def search_recommendations(
     return AppResponse(
         status="success",
         message="Search recommendations",
-        data=movies
+        data=project(movies, selected)
     )
 
 @recommendation_router.get("/similar-movies", response_model=AppResponse)
@@ -84,11 +99,13 @@ def similar_movies(
     id: int = Query(..., description="Movie ID to find similar movies for"),
     limit: int = Query(10, description="Number of similar movies to return"),
     db: Session = Depends(get_global_db_session),
+    fields: Optional[str] = FIELDS_QUERY,
 ):
+    selected = parse_fields(fields, MOVIE_FIELDS)
     service = RecommendationService(db)
     movies = service.similar_movies(movie_id=id, limit=limit)
     return AppResponse(
         status="success",
         message=f"Similar movies for ID {id}",
-        data=movies
+        data=project(movies, selected)
     )
@@ -1,19 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from collections import defaultdict
+from typing import List, Optional
 
-from app.model_handlers.movie_handler import MovieHandler
 from app.model_handlers.user_handler import UserResponse
+from app.model_handlers.movie_handler import MOVIE_FIELDS
 from app.model_handlers.user_feedback_handler import (
     UserFeedbackHandler,
     UserFeedbackCreate,
-    UserFeedbackUpdate,
 )
+from app.utils.projection import parse_fields
+from app.model_handlers.feedback_import_handler import FeedbackImportHandler, FeedbackImportCreate
+from app.services.feedback_import_service import detect_format, run_feedback_import
+from app.core.settings import settings
 from app.routes import AppResponse
 from app.core.db import get_global_db_session
 from app.dependencies.auth import get_current_user
 
-user_feedback_router = APIRouter(prefix="/feedbacks", tags=["user_feedback"])
+user_feedback_router = APIRouter(prefix="/feedbacks", tags=["user_feedback"], default_response_class=ORJSONResponse)
+
+
+MAX_FEEDBACK_BATCH = 500
+
+MOVIE_FIELDS_QUERY = Query(None, description="Comma-separated nested movie fields, e.g. title,poster_path")
+
+
+def _page(items, next_cursor) -> dict:
+    return {"items": items, "next_cursor": next_cursor, "has_more": next_cursor is not None}
 
 
 @user_feedback_router.post("/", response_model=AppResponse, status_code=status.HTTP_201_CREATED)
@@ -27,51 +40,118 @@ async def create_or_update_feedback(
     """
     feedback_handler = UserFeedbackHandler(db)
 
-    # attach current user ID
-    user_id = current_user.id
-    movie_id = feedback_in.movie_id
-
-    existing = feedback_handler.get_by_user_movie(user_id=user_id, movie_id=movie_id)
-
-    if existing:
-        updated = feedback_handler.update(existing.id, UserFeedbackUpdate(rating=feedback_in.rating, review=feedback_in.review, status=feedback_in.status))
-        return AppResponse(
-            status="success",
-            message="Feedback updated successfully",
-            data=updated,
-        )
-
-    feedback = UserFeedbackCreate(
-        user_id=user_id,
-        movie_id=feedback_in.movie_id,
-        rating=feedback_in.rating,
-        review=feedback_in.review,
-        status=feedback_in.status,
+    # single INSERT ... ON CONFLICT DO UPDATE for the current user
+    feedback, inserted = feedback_handler.upsert(current_user.id, feedback_in)
+
+    return AppResponse(
+        status="success",
+        message="Feedback created successfully" if inserted else "Feedback updated successfully",
+        data=feedback,
+    )
+
+
+@user_feedback_router.post("/batch", response_model=AppResponse)
+async def create_or_update_feedbacks(
+    feedbacks_in: List[UserFeedbackCreate],
+    db: Session = Depends(get_global_db_session),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """
+    Create or update several feedbacks of the current user in one statement.
+    """
+    if len(feedbacks_in) > MAX_FEEDBACK_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_FEEDBACK_BATCH} feedbacks per batch")
+
+    feedback_handler = UserFeedbackHandler(db)
+    results = feedback_handler.upsert_many(current_user.id, feedbacks_in)
+
+    return AppResponse(
+        status="success",
+        message="Feedbacks saved successfully",
+        data={
+            "created": sum(1 for _, inserted in results if inserted),
+            "updated": sum(1 for _, inserted in results if not inserted),
+            "feedbacks": [feedback for feedback, _ in results],
+        },
+    )
+
+
+@user_feedback_router.post("/import", response_model=AppResponse, status_code=status.HTTP_202_ACCEPTED)
+async def import_feedbacks(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="CSV or NDJSON with tmdb_id or title, rating, status[, review]"),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Defaults to the file extension"),
+    db: Session = Depends(get_global_db_session),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """
+    Start a bulk ratings import for the current user.
+    Rows are loaded in the background; poll /feedbacks/import/{import_id} for progress.
+    """
+    content = await file.read()
+    if len(content) > settings.feedback.import_max_bytes:
+        raise HTTPException(status_code=413, detail="Import file too large")
+
+    fmt = format or detect_format(file.filename, file.content_type)
+    job = FeedbackImportHandler(db).create(FeedbackImportCreate(user_id=current_user.id))
+    background_tasks.add_task(run_feedback_import, job.id, current_user.id, content, fmt)
+
+    return AppResponse(
+        status="success",
+        message="Feedback import started",
+        data=job,
     )
-    created = feedback_handler.create(feedback)
+
+
+@user_feedback_router.get("/import/{import_id}", response_model=AppResponse)
+async def get_import_status(
+    import_id: int,
+    db: Session = Depends(get_global_db_session),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """
+    Get the status and progress of one of the current user's imports.
+    """
+    job = FeedbackImportHandler(db).get_user_import(current_user.id, import_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import not found")
 
     return AppResponse(
         status="success",
-        message="Feedback created successfully",
-        data=created,
+        message="Import status fetched successfully",
+        data=job,
     )
 
 
 @user_feedback_router.get("/", response_model=AppResponse)
 async def get_my_feedbacks(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    status: Optional[str] = Query(None, pattern="^(watched|watchlist)$"),
+    min_rating: Optional[float] = Query(None, ge=0.5, le=5),
+    max_rating: Optional[float] = Query(None, ge=0.5, le=5),
+    movie_fields: Optional[str] = MOVIE_FIELDS_QUERY,
     db: Session = Depends(get_global_db_session),
     current_user: UserResponse = Depends(get_current_user),
 ):
     """
-    Get all feedbacks given by the current logged-in user.
+    Get the current user's feedbacks, newest first, one cursor page at a time.
     """
     feedback_handler = UserFeedbackHandler(db)
-    feedbacks = feedback_handler.get_user_feedbacks(current_user.id)
+    feedbacks, next_cursor = feedback_handler.get_user_feedbacks_page(
+        current_user.id,
+        limit=limit,
+        cursor=cursor,
+        status=status,
+        min_rating=min_rating,
+        max_rating=max_rating,
+        movie_fields=parse_fields(movie_fields, MOVIE_FIELDS),
+    )
 
     return AppResponse(
         status="success",
         message="Your feedbacks fetched successfully",
-        data=feedbacks,
+        data=_page(feedbacks, next_cursor),
     )
 
 @user_feedback_router.get("/stats", response_model=AppResponse)
@@ -80,9 +160,8 @@ async def get_user_stats(
     current_user: UserResponse = Depends(get_current_user),
 ):
     handler = UserFeedbackHandler(db)
-    movie_handler = MovieHandler(db)
 
-    stats = handler.get_user_stats(current_user.id, movie_handler)
+    stats = handler.get_user_stats(current_user.id)
 
     return AppResponse(
         status="success",
@@ -92,19 +171,28 @@ async def get_user_stats(
 
 @user_feedback_router.get("/watchlist", response_model=AppResponse)
 async def get_user_watchlist(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    movie_fields: Optional[str] = MOVIE_FIELDS_QUERY,
     db: Session = Depends(get_global_db_session),
     current_user: UserResponse = Depends(get_current_user),
-):  
+):
     """
-    Get all movies in user's watchlist.
+    Get movies in user's watchlist, most recently added first, one cursor page at a time.
     """
     handler = UserFeedbackHandler(db)
-    watchlist = handler.get_user_watchlist(current_user.id)
+    watchlist, next_cursor = handler.get_user_feedbacks_page(
+        current_user.id,
+        limit=limit,
+        cursor=cursor,
+        status="watchlist",
+        movie_fields=parse_fields(movie_fields, MOVIE_FIELDS),
+    )
 
     return AppResponse(
         status="success",
         message="User watchlist fetched successfully",
-        data=watchlist,
+        data=_page(watchlist, next_cursor),
     )
 
 
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.model_handlers.user_handler import UserHandler, UserUpdate, UserResponse
-from app.dependencies.auth import get_current_user
+from app.dependencies.auth import get_current_user, invalidate_user_cache
 from app.core.db import get_global_db_session
 from app.core.qdrant import get_qdrant_client
 from app.routes import AppResponse
-from app.utils.auth import verify_password, hash_password
+from app.utils.auth import verify_password_async, hash_password_async
 
 user_router = APIRouter(prefix="/users", tags=["users"])
 
@@ -48,10 +48,13 @@ async def update_user(
     if user.id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    updated = user_handler.update(user_id, user_update)
+    invalidate_user_cache(current_user.email, updated.email)
+
     return AppResponse(
         status="success",
         message="User updated successfully",
-        data=user_handler.update(user_id, user_update)
+        data=updated
     )
 
 @user_router.post("/change-password", response_model=AppResponse)
@@ -64,11 +67,12 @@ async def change_password(
     user_handler = UserHandler(db)
     user = user_handler.read(current_user.id)
     
-    if not verify_password(current_password, user.password):
+    if not await verify_password_async(current_password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     
-    hashed_new = hash_password(new_password)
+    hashed_new = await hash_password_async(new_password)
     user_handler.update(user.id, UserUpdate(hashed_password=hashed_new))
+    invalidate_user_cache(current_user.email)
     
     return AppResponse(
         status="success",
@@ -93,6 +97,7 @@ async def delete_user(
 
     # Delete all sessions and documents associated with the user
     user_handler.delete(user_id)
+    invalidate_user_cache(current_user.email)
     return AppResponse(
         status="success",
         message="User deleted successfully"
@@ -1,7 +1,7 @@
 from fastapi import HTTPException
 from app.utils.auth import (
-    verify_password,
-    hash_password,
+    verify_password_async,
+    hash_password_async,
     create_access_token,
     create_refresh_token,
     decode_token
@@ -12,21 +12,21 @@ class AuthService:
     def __init__(self, db):
         self.user_handler = UserHandler(db)
 
-    def register(self, user_data: UserCreate):
+    async def register(self, user_data: UserCreate):
         if self.user_handler.get_by_email(user_data.email):
             raise HTTPException(400, "Email already registered")
 
-        user_data.hashed_password = hash_password(user_data.hashed_password)
+        user_data.hashed_password = await hash_password_async(user_data.hashed_password)
 
         return self.user_handler.create(user_data)
 
 
-    def login(self, email: str, password: str):
+    async def login(self, email: str, password: str):
         user = self.user_handler.get_by_email(email, with_password=True)
         if not user:
             raise HTTPException(401, "User not found")
 
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             raise HTTPException(401, "Invalid credentials")
 
         return {
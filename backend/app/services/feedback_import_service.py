@@ -0,0 +1,221 @@
+import csv
+import io
+from typing import List, Optional, Tuple
+
+import orjson
+from loguru import logger
+from sqlalchemy import func
+
+from app.core.db import SessionLocal
+from app.core.search_index import get_search_index, normalize_text
+from app.core.settings import settings
+from app.model_handlers.feedback_import_handler import FeedbackImportHandler, FeedbackImportUpdate
+from app.model_handlers.user_feedback_handler import invalidate_feedback_caches
+from app.models.movies import Movie
+
+
+VALID_STATUSES = {"watched", "watchlist"}
+
+# Staged rows live only for the import transaction
+CREATE_STAGE_SQL = """
+    CREATE TEMP TABLE feedback_import_stage (
+        seq INTEGER,
+        movie_id INTEGER,
+        tmdb_id INTEGER,
+        rating DOUBLE PRECISION,
+        status TEXT,
+        review TEXT
+    ) ON COMMIT DROP
+"""
+
+COPY_STAGE_SQL = "COPY feedback_import_stage (seq, movie_id, tmdb_id, rating, status, review) FROM STDIN WITH (FORMAT csv)"
+
+# tmdb ids are resolved by the join; the last row per movie wins
+MERGE_STAGE_SQL = """
+    INSERT INTO user_feedback (user_id, movie_id, rating, review, status, created_at, updated_at)
+    SELECT DISTINCT ON (COALESCE(s.movie_id, m.id))
+        %(user_id)s, COALESCE(s.movie_id, m.id), s.rating, s.review, s.status, now(), now()
+    FROM feedback_import_stage s
+    LEFT JOIN movies m ON s.movie_id IS NULL AND m.tmdb_id = s.tmdb_id
+    WHERE COALESCE(s.movie_id, m.id) IS NOT NULL
+    ORDER BY COALESCE(s.movie_id, m.id), s.seq DESC
+    ON CONFLICT ON CONSTRAINT _user_movie_uc DO UPDATE SET
+        rating = EXCLUDED.rating,
+        review = COALESCE(EXCLUDED.review, user_feedback.review),
+        status = EXCLUDED.status,
+        updated_at = EXCLUDED.updated_at
+"""
+
+UNRESOLVED_STAGE_SQL = """
+    SELECT count(*)
+    FROM feedback_import_stage s
+    LEFT JOIN movies m ON s.movie_id IS NULL AND m.tmdb_id = s.tmdb_id
+    WHERE COALESCE(s.movie_id, m.id) IS NULL
+"""
+
+
+# --------------------------
+# Parsing
+# --------------------------
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in (content_type or ""):
+        return "ndjson"
+    return "csv"
+
+
+def _iter_records(content: bytes, fmt: str):
+    text = content.decode("utf-8-sig")
+    if fmt == "ndjson":
+        for line in text.splitlines():
+            line = line.strip()
+            if line:
+                try:
+                    yield orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    yield None
+    else:
+        yield from csv.DictReader(io.StringIO(text))
+
+
+def _clean(record) -> Optional[dict]:
+    """Validate one uploaded record; returns None when it cannot be imported."""
+    if not isinstance(record, dict):
+        return None
+
+    tmdb_id = record.get("tmdb_id")
+    title = (record.get("title") or "").strip() or None
+    try:
+        tmdb_id = int(tmdb_id) if tmdb_id not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+    if tmdb_id is None and title is None:
+        return None
+
+    rating = record.get("rating")
+    try:
+        rating = float(rating) if rating not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+    if rating is not None and not 0.5 <= rating <= 5:
+        return None
+
+    status = (record.get("status") or "watched").strip().lower()
+    if status not in VALID_STATUSES:
+        return None
+
+    return {
+        "tmdb_id": tmdb_id,
+        "title": title,
+        "rating": rating,
+        "status": status,
+        "review": (record.get("review") or None),
+    }
+
+
+def parse_upload(content: bytes, fmt: str) -> Tuple[List[dict], int]:
+    """Return (valid rows, invalid row count)."""
+    rows, invalid = [], 0
+    for record in _iter_records(content, fmt):
+        row = _clean(record)
+        if row is None:
+            invalid += 1
+        else:
+            rows.append(row)
+    return rows, invalid
+
+
+# --------------------------
+# Title resolution
+# --------------------------
+def resolve_titles(db, titles) -> dict:
+    """
+    Map normalized titles to movie ids: in memory through the search index
+    when it is ready, otherwise with a single query picking the most popular match.
+    """
+    wanted = {normalize_text(t) for t in titles}
+    wanted.discard("")
+    if not wanted:
+        return {}
+
+    index = get_search_index()
+    if index.ready:
+        resolved = {t: index.resolve_title(t) for t in wanted}
+        return {t: mid for t, mid in resolved.items() if mid is not None}
+
+    lowered = sorted({t.lower() for t in titles})
+    rows = (
+        db.query(Movie.id, Movie.title)
+        .filter(func.lower(Movie.title).in_(lowered))
+        .order_by(Movie.popularity.desc().nullslast())
+        .all()
+    )
+    resolved = {}
+    for movie_id, title in rows:
+        resolved.setdefault(normalize_text(title), movie_id)
+    return resolved
+
+
+# --------------------------
+# Job
+# --------------------------
+def _progress(import_id: int, **fields):
+    db = SessionLocal()
+    try:
+        FeedbackImportHandler(db).update(import_id, FeedbackImportUpdate(**fields))
+    finally:
+        db.close()
+
+
+def run_feedback_import(import_id: int, user_id: int, content: bytes, fmt: str):
+    """
+    Background job: parse the upload, resolve titles, COPY rows into a temp
+    staging table and merge them into user_feedback with one
+    INSERT ... SELECT ... ON CONFLICT statement in a single transaction.
+    """
+    db = SessionLocal()
+    try:
+        _progress(import_id, status="running")
+
+        rows, invalid = parse_upload(content, fmt)
+        if len(rows) + invalid > settings.feedback.import_max_rows:
+            raise ValueError(f"At most {settings.feedback.import_max_rows} rows per import")
+        _progress(import_id, total_rows=len(rows) + invalid, invalid=invalid)
+
+        titles = resolve_titles(db, [r["title"] for r in rows if r["tmdb_id"] is None])
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        unresolved = 0
+        for seq, row in enumerate(rows):
+            movie_id = None
+            if row["tmdb_id"] is None:
+                movie_id = titles.get(normalize_text(row["title"]))
+                if movie_id is None:
+                    unresolved += 1
+                    continue
+            writer.writerow([seq, movie_id, row["tmdb_id"], row["rating"], row["status"], row["review"]])
+        buffer.seek(0)
+
+        # Raw psycopg2 cursor on the session's connection keeps COPY and merge in one transaction
+        cursor = db.connection().connection.cursor()
+        cursor.execute(CREATE_STAGE_SQL)
+        cursor.copy_expert(COPY_STAGE_SQL, buffer)
+        _progress(import_id, processed_rows=len(rows) + invalid)
+
+        cursor.execute(UNRESOLVED_STAGE_SQL)
+        unresolved += cursor.fetchone()[0]
+        cursor.execute(MERGE_STAGE_SQL, {"user_id": user_id})
+        imported = cursor.rowcount
+        db.commit()
+
+        invalidate_feedback_caches(user_id)
+        _progress(import_id, status="completed", imported=imported, unresolved=unresolved)
+        logger.info(f"✅ Feedback import {import_id}: {imported} imported, {unresolved} unresolved, {invalid} invalid.")
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Feedback import {import_id} failed: {e}")
+        _progress(import_id, status="failed", error=str(e))
+    finally:
+        db.close()
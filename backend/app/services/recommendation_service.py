@@ -4,11 +4,13 @@ import numpy as np
 import os
 import pickle
 
-from app.core.qdrant import get_qdrant_client
+from app.core.qdrant import get_qdrant_client, merge_hits
 from app.model_handlers.movie_handler import MovieHandler
 from app.model_handlers.user_handler import UserHandler
 from app.model_handlers.user_feedback_handler import UserFeedbackHandler
 from app.utils.model_loader import load_latest_production_model
+from app.utils.genres import split_genres
+from app.utils.embedding_text import build_movie_text
 
 from app.model_state import MODEL_CACHE
 
@@ -74,18 +76,18 @@ class RecommendationService:
             popular = self.movie_handler.list_all(skip=0, limit=limit*3)
             return [self.movie_handler._response_schema.model_validate(m) for m in popular[:limit]]
 
-        genres = [g.strip() for g in user.genre_preferences.split(",") if g.strip()]
+        genres = split_genres(user.genre_preferences)
         if not genres:
             popular = self.movie_handler.list_all(skip=0, limit=limit*3)
             return [self.movie_handler._response_schema.model_validate(m) for m in popular[:limit]]
 
         query = f"Movies in genres: {', '.join(genres)}. Recommend good movies."
         vec = self.qdrant.embedding_model.encode(query, normalize_embeddings=True).tolist()
-        results = self.qdrant.search_similar(movie_vector=vec, top=limit * 50)
+        results = self.qdrant.search_ids(vec, top=limit * 50)
         filtered = []
         for r in results:
             movie = self.movie_handler.get_by_id(int(r["id"]))
-            if movie and any(g.lower() in (movie.genres or "").lower() for g in genres):
+            if movie and set(genres) & set(split_genres(movie.genres)):
                 filtered.append(movie)
         filtered = sorted(filtered, key=lambda m: m.popularity or 0, reverse=True)
         return [self.movie_handler._response_schema.model_validate(m) for m in filtered[:limit]]
@@ -97,27 +99,20 @@ class RecommendationService:
         limit: int = 10
     ):
         if examples:
-            docs = []
             movie_ids = []
+            texts = []
             for ex in examples:
                 movie = self.movie_handler.get_by_title(ex)
                 if movie:
                     movie_ids.append(movie.id)
-                    movie_text = f"""
-                        Title: {movie.title}
-                        Overview: {movie.overview}
-                        Genres: {movie.genres}
-                        Tagline: {movie.tagline}
-                        Keywords: {movie.keywords}
-                        Language: {movie.original_language}
-                    """.strip()
-                    docs.append(movie_text)
                 else:
-                    docs.append(ex)
-            query = " ".join(docs)
-            vec = self.qdrant.embedding_model.encode(query, normalize_embeddings=True).tolist()
-            qres = self.qdrant.search_similar(movie_vector=vec, top=limit * 2)
-            candidate_ids = [int(r["id"]) for r in qres if int(r["id"]) not in movie_ids]
+                    texts.append(ex)
+            # Known titles search from their indexed vectors, free text is encoded in one batch
+            seeds = list(movie_ids)
+            if texts:
+                seeds.extend(self.qdrant.embedding_model.encode(texts, normalize_embeddings=True))
+            batches = self.qdrant.search_similar_batch(seeds, top=limit * 2)
+            candidate_ids, _ = merge_hits(batches, exclude=movie_ids)
             movies = [self.movie_handler.get_by_id(id) for id in candidate_ids]
             # keep order and remove Nones
             ordered = [m for m in (movies) if m]
@@ -131,8 +126,8 @@ class RecommendationService:
 
 
     def personalized_recommendations(self, user_id: int, limit: int = 10):
-        feedbacks = self.feedback_handler.get_user_feedbacks(user_id)
-        if not feedbacks:
+        watched = self.feedback_handler.get_watched_set(user_id)
+        if not len(watched):
             return self.recommend_for_cold_start(user_id, limit)
 
         if not self.implicit_model or not self.dataset_map:
@@ -146,22 +141,15 @@ class RecommendationService:
 
         model_user_index = user_map[user_id]
 
-        # Candidate generation using recent watched
-        recent = feedbacks[-10:]
-        movie_ids = [f.movie_id for f in recent]
-        texts = []
-        for mid in movie_ids:
-            m = self.movie_handler.get_by_id(mid)
-            if m:
-                texts.append(f"{m.title}. {m.overview or ''}. Genres: {m.genres or ''}")
-        query = " ".join(texts) if texts else None
+        # Candidate generation using recent watched: one batched search seeded by their vectors
+        movie_ids = self.feedback_handler.get_recent_movie_ids(user_id, limit=10)
 
         candidate_ids = []
-        if query:
-            vec = self.qdrant.embedding_model.encode(query, normalize_embeddings=True).tolist()
-            # fetch a much larger pool to give ALS room to rerank
-            qres = self.qdrant.search_similar(movie_vector=vec, top=limit * 200)
-            candidate_ids = [int(r["id"]) for r in qres]
+        if movie_ids:
+            # fetch a much larger pool to give ALS room to rerank, split across the seeds
+            per_seed = max(limit * 200 // len(movie_ids), limit * 20)
+            batches = self.qdrant.search_similar_batch(movie_ids, top=per_seed)
+            candidate_ids, _ = merge_hits(batches, limit=limit * 200)
         else:
             candidate_rows = self.movie_handler.list_all(skip=0, limit=limit * 200)
             candidate_ids = [m.id for m in candidate_rows]
@@ -173,8 +161,7 @@ class RecommendationService:
         ranked_candidate_ids = self._rerank_with_implicit(user_id, candidate_ids)
 
         # Filter watched: only remove movies the user has actually watched (lifetime)
-        watched = {fb.movie_id for fb in feedbacks}
-        final_ids = [mid for mid in ranked_candidate_ids if mid not in watched]
+        final_ids = watched.exclude(ranked_candidate_ids)
 
         # If not enough after filtering, fill with popularity-based items not watched
         if len(final_ids) < limit:
@@ -194,40 +181,15 @@ class RecommendationService:
         limit: int = 12,
         last_n: int = 3
     ):
-        fb_q = (
-            self.db.query(self.feedback_handler._model)
-            .filter(self.feedback_handler._model.user_id == user_id, self.feedback_handler._model.status == "watched")
-            .order_by(self.feedback_handler._model.created_at.desc())
-            .limit(last_n)
-            .all()
-        )
-        if not fb_q:
+        recent_ids = self.feedback_handler.get_recent_movie_ids(user_id, limit=last_n, status="watched")
+        if not recent_ids:
             return []
 
-        candidate_scores = {}
-        for fb in fb_q:
-            movie = self.movie_handler.get_by_id(fb.movie_id)
-            if not movie: 
-                continue
-            movie_text = f"""
-                    Title: {movie.title}
-                    Overview: {movie.overview}
-                    Genres: {movie.genres}
-                    Tagline: {movie.tagline}
-                    Keywords: {movie.keywords}
-                    Language: {movie.original_language}
-                """.strip()
-            vec = self.qdrant.embedding_model.encode(movie_text, normalize_embeddings=True).tolist()
-            qres = self.qdrant.search_similar(movie_vector=vec, top=limit*2)
-            for r in qres:
-                mid = int(r["id"])
-                candidate_scores[mid] = max(candidate_scores.get(mid, 0.0), r["score"])
-
-        # remove watched
-        watched = {fb.movie_id for fb in self.feedback_handler.get_user_feedbacks(user_id)}
-        candidates = [(mid, score) for mid, score in candidate_scores.items() if mid not in watched]
-        top = sorted(candidates, key=lambda x: -x[1])[:limit]
-        movies = [self.movie_handler.get_by_id(mid) for mid, _ in top]
+        # One batched search for all seeds, best score per candidate, watched removed
+        batches = self.qdrant.search_similar_batch(recent_ids, top=limit * 2)
+        watched = self.feedback_handler.get_watched_set(user_id)
+        top_ids, _ = merge_hits(batches, exclude=watched.ids, limit=limit)
+        movies = [self.movie_handler.get_by_id(mid) for mid in top_ids]
         return [self.movie_handler._response_schema.model_validate(m) for m in movies if m]
 
 
@@ -266,8 +228,8 @@ class RecommendationService:
             query = "movies recommended to watch"
             vector = self.qdrant.embedding_model.encode(query, normalize_embeddings=True).tolist()
 
-            raw_results = self.qdrant.search_similar(
-                movie_vector=vector,
+            raw_results = self.qdrant.search_ids(
+                vector,
                 top=limit * 40,
                 filters=q_filters
             )
@@ -282,8 +244,7 @@ class RecommendationService:
 
         # Remove watched movies
         if user_id:
-            watched = {f.movie_id for f in self.feedback_handler.get_user_feedbacks(user_id)}
-            ranked_ids = [mid for mid in ranked_ids if mid not in watched]
+            ranked_ids = self.feedback_handler.get_watched_set(user_id).exclude(ranked_ids)
 
         # Build final movie responses
         movies = [self.movie_handler.get_by_id(mid) for mid in ranked_ids[:limit]]
@@ -297,20 +258,13 @@ class RecommendationService:
             return []
         
         # Create a text representation of the movie for embedding
-        movie_text = f"""
-                Title: {movie.title}
-                Overview: {movie.overview}
-                Genres: {movie.genres}
-                Tagline: {movie.tagline}
-                Keywords: {movie.keywords}
-                Language: {movie.original_language}
-            """.strip()
+        movie_text = build_movie_text(movie)
         
         # Create vector from the movie text
         vec = self.qdrant.embedding_model.encode(movie_text, normalize_embeddings=True).tolist()
         
         # Search for similar movies (get extra to account for filtering)
-        qres = self.qdrant.search_similar(movie_vector=vec, top=limit + 10)
+        qres = self.qdrant.search_ids(vec, top=limit + 10)
         
         # Filter out the input movie and get movie objects
         candidate_ids = [int(r["id"]) for r in qres if int(r["id"]) != movie_id]
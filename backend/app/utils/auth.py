@@ -1,19 +1,47 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime, timedelta
+from typing import List, Optional
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
 from app.core.settings import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.auth.bcrypt_rounds,
+)
+
+# bcrypt releases the GIL, so a small bounded pool keeps hashing off the
+# event loop and caps how much CPU a login spike can take. Request paths await
+# it directly; blocking on it from a threadpool route would tie up that thread too.
+HASH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.auth.hash_workers,
+    thread_name_prefix="pwd-hash",
+)
 
 # ---------------------------
 # Password utils
 # ---------------------------
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password_async(plain_password, hashed_password):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(HASH_EXECUTOR, pwd_context.verify, plain_password, hashed_password)
+
+async def hash_password_async(password):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(HASH_EXECUTOR, pwd_context.hash, password)
+
+def _hash_with_rounds(args):
+    password, rounds = args
+    return pwd_context.hash(password, rounds=rounds) if rounds else pwd_context.hash(password)
 
-def hash_password(password):
-    return pwd_context.hash(password)
+def hash_passwords_parallel(passwords: List[str], processes: Optional[int] = None, rounds: Optional[int] = None) -> List[str]:
+    """Hash many passwords across processes (bulk provisioning / seeding)."""
+    if not passwords:
+        return []
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_hash_with_rounds, [(p, rounds) for p in passwords], chunksize=64))
 
 # ---------------------------
 # Token creation
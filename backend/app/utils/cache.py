@@ -0,0 +1,64 @@
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache with per-entry expiry.
+    Used for short-lived derived data (totals, lookups) that is cheap to
+    recompute but expensive to compute on every request.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                self._data.pop(key, None)
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        with self._lock:
+            if len(self._data) >= self.maxsize:
+                self._evict()
+            self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[Hashable], bool]):
+        """Drop every entry whose key matches `predicate`."""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def _evict(self):
+        # Drop expired entries first, then the oldest half if still full
+        now = time.monotonic()
+        self._data = {k: v for k, v in self._data.items() if v[0] >= now}
+        if len(self._data) >= self.maxsize:
+            ordered = sorted(self._data.items(), key=lambda kv: kv[1][0])
+            self._data = dict(ordered[len(ordered) // 2:])
@@ -0,0 +1,36 @@
+import hashlib
+from typing import Any
+
+
+# Sentence-transformer used for every movie / query embedding
+EMBED_MODEL_NAME = "sentence-transformers/all-mpnet-base-v2"
+
+
+def _field(movie: Any, key: str):
+    if isinstance(movie, dict):
+        return movie.get(key)
+    return getattr(movie, key, None)
+
+
+def build_movie_text(movie: Any) -> str:
+    """
+    Embedding text of a movie (dict, DataFrame row or ORM object). Every
+    indexing and query path goes through here so their vectors stay comparable.
+    """
+    genres = _field(movie, "genres")
+    if isinstance(genres, (list, tuple)):
+        genres = ",".join(genres)
+
+    return f"""
+Title: {_field(movie, 'title')}
+Overview: {_field(movie, 'overview')}
+Genres: {genres}
+Tagline: {_field(movie, 'tagline')}
+Keywords: {_field(movie, 'keywords')}
+Language: {_field(movie, 'original_language')}
+""".strip()
+
+
+def embedding_text_hash(text: str, model: str = EMBED_MODEL_NAME) -> str:
+    """Content hash stored with each vector; a new model or text changes it."""
+    return hashlib.sha1(f"{model}\n{text}".encode("utf-8")).hexdigest()
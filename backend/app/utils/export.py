@@ -0,0 +1,59 @@
+import io
+import json
+from datetime import datetime
+from typing import Iterable, Iterator, List
+
+import pyarrow as pa
+
+
+# Arrow types for exportable movie columns
+ARROW_TYPES = {
+    "id": pa.int64(),
+    "tmdb_id": pa.int64(),
+    "title": pa.string(),
+    "overview": pa.string(),
+    "genres": pa.string(),
+    "original_language": pa.string(),
+    "tagline": pa.string(),
+    "keywords": pa.string(),
+    "runtime": pa.int32(),
+    "popularity": pa.float64(),
+    "poster_path": pa.string(),
+    "release_year": pa.int32(),
+    "created_at": pa.timestamp("us", tz="UTC"),
+    "updated_at": pa.timestamp("us", tz="UTC"),
+}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def ndjson_stream(chunks: Iterable[List[dict]]) -> Iterator[bytes]:
+    """One JSON object per line, one write per chunk."""
+    for rows in chunks:
+        yield "".join(
+            json.dumps(r, default=_json_default, ensure_ascii=False) + "\n" for r in rows
+        ).encode("utf-8")
+
+
+def arrow_stream(chunks: Iterable[List[dict]], fields: List[str]) -> Iterator[bytes]:
+    """Arrow IPC stream: schema first, then one record batch per chunk."""
+    schema = pa.schema([(f, ARROW_TYPES[f]) for f in fields])
+    sink = io.BytesIO()
+    writer = pa.ipc.new_stream(sink, schema)
+
+    def drain() -> bytes:
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    for rows in chunks:
+        writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=schema))
+        yield drain()
+
+    writer.close()
+    yield drain()
@@ -0,0 +1,33 @@
+from typing import Iterable, List, Optional
+
+
+# Official TMDB movie genres
+TMDB_GENRES = [
+    "Action", "Adventure", "Animation", "Comedy", "Crime", "Documentary", "Drama",
+    "Family", "Fantasy", "History", "Horror", "Music", "Mystery", "Romance",
+    "Science Fiction", "TV Movie", "Thriller", "War", "Western"
+]
+
+_CANONICAL = {g.lower(): g for g in TMDB_GENRES}
+
+
+def normalize_genres(genres: Optional[Iterable[str]]) -> List[str]:
+    """
+    Map genre names to their canonical spelling (case-insensitive), dropping
+    blanks and duplicates. Unknown genres are kept as given so they still
+    match exactly.
+    """
+    out = []
+    for g in genres or []:
+        g = (g or "").strip()
+        if not g:
+            continue
+        g = _CANONICAL.get(g.lower(), g)
+        if g not in out:
+            out.append(g)
+    return out
+
+
+def split_genres(genres: Optional[str]) -> List[str]:
+    """Split the comma-joined `movies.genres` text into canonical names."""
+    return normalize_genres(genres.split(",")) if genres else []
@@ -0,0 +1,34 @@
+import base64
+import json
+from typing import Any, Optional
+
+from fastapi import HTTPException
+
+
+# ---------------------------
+# Keyset cursor helpers
+# ---------------------------
+def encode_cursor(sort_by: str, order: str, last_key: Any, last_id: int) -> str:
+    """Encode the last (sort key, id) seen into an opaque url-safe token."""
+    raw = json.dumps({"s": sort_by, "o": order, "k": last_key, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, order: str) -> Optional[dict]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+    The cursor must have been issued for the same sort column and direction.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        last_id = int(data["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if data.get("s") != sort_by or data.get("o") != order:
+        raise HTTPException(status_code=400, detail="Cursor does not match sort_by/order")
+
+    return {"key": data.get("k"), "id": last_id}
@@ -0,0 +1,32 @@
+from typing import Iterable, List, Optional
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """
+    Parse a `fields=` query parameter into a validated column list.
+    `id` is always included; None means "all fields".
+    """
+    if not fields:
+        return None
+    allowed = set(allowed)
+    selected = ["id"]
+    for f in fields.split(","):
+        f = f.strip()
+        if f and f not in selected:
+            selected.append(f)
+
+    unknown = [f for f in selected if f not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return selected
+
+
+def project(items: List[BaseModel], fields: Optional[List[str]]) -> list:
+    """Trim already-built response models down to the requested fields."""
+    if not fields:
+        return items
+    include = set(fields)
+    return [item.model_dump(include=include) for item in items]
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Embedding throughput by core count: one in-process model (torch using every
+core) vs EmbeddingPool with 1..N worker processes of `--threads` threads each.
+
+Usage (from backend/):
+    python -m benchmarks.embedding_throughput --texts 4000 --threads 2
+"""
+
+import argparse
+import os
+import time
+
+from app.core.settings import settings
+from app.pipelines.utils.embedding_pool import EmbeddingPool, default_processes
+from app.pipelines.utils.tmdb_stub_server import fake_movie
+from app.utils.embedding_text import EMBED_MODEL_NAME, build_movie_text
+
+
+def synthetic_texts(n: int):
+    texts = []
+    for i in range(1, n + 1):
+        m = fake_movie(i)
+        # Vary lengths like real overviews do
+        m["overview"] = " ".join([m["overview"]] * (1 + i % 12))
+        m["genres"] = ",".join(g["name"] for g in m["genres"])
+        texts.append(build_movie_text(m))
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", type=int, default=4000)
+    parser.add_argument("--threads", type=int, default=settings.embedding.threads_per_process)
+    parser.add_argument("--batch-size", type=int, default=settings.qdrant.embed_batch_size)
+    parser.add_argument("--chunk-size", type=int, default=settings.qdrant.upsert_batch_size)
+    parser.add_argument("--skip-single", action="store_true")
+    args = parser.parse_args()
+
+    texts = synthetic_texts(args.texts)
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    rows = []
+
+    if not args.skip_single:
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        torch.set_num_threads(cores)
+        model = SentenceTransformer(EMBED_MODEL_NAME, device="cpu")
+        model.encode(texts[:32], batch_size=args.batch_size)  # warm-up
+        t0 = time.perf_counter()
+        model.encode(texts, batch_size=args.batch_size, normalize_embeddings=True)
+        rows.append(("in-process", cores, time.perf_counter() - t0))
+
+    max_procs = default_processes(args.threads)
+    procs = sorted({p for p in (1, 2, 4, 8, 16, 32, max_procs) if p <= max_procs})
+    for p in procs:
+        with EmbeddingPool(processes=p, threads_per_process=args.threads, batch_size=args.batch_size) as pool:
+            pool.wait_ready()  # spawn workers + load every model replica, not timed
+            pool.encode(texts[: p * 8], chunk_size=8)  # first-batch warm-up
+            t0 = time.perf_counter()
+            pool.encode(texts, chunk_size=args.chunk_size)
+            rows.append((f"pool x{p}", p * args.threads, time.perf_counter() - t0))
+
+    base = rows[0][2]
+    print(f"{len(texts)} texts, {cores} cores available")
+    print(f"{'mode':>12} {'cores':>6} {'seconds':>9} {'texts/s':>9} {'speedup':>8}")
+    for name, used, secs in rows:
+        print(f"{name:>12} {used:>6} {secs:>9.2f} {len(texts) / secs:>9.1f} {base / secs:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Deep-page latency benchmark for /movies/explore:
+OFFSET pagination vs keyset (cursor) pagination against the local database.
+
+Usage (from backend/):
+    python -m benchmarks.explore_pagination --limit 50 --pages 1 10 100 1000
+"""
+
+import argparse
+import statistics
+import time
+
+from app.core.db import SessionLocal
+from app.model_handlers.movie_handler import MovieHandler
+
+
+FILTERS = dict(title=None, genre=None, language=None, release_year=None, search_bar=False)
+
+
+def time_call(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def cursor_for_page(handler: MovieHandler, page: int, limit: int, sort_by: str, order: str):
+    """Walk the cursor chain up to `page` (not timed) to get its starting cursor."""
+    cursor = None
+    for _ in range(page - 1):
+        _, cursor = handler.query_movies_by_cursor(
+            limit=limit, cursor=cursor, sort_by=sort_by, order=order, **FILTERS
+        )
+        if cursor is None:
+            break
+    return cursor
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--sort-by", default="popularity")
+    parser.add_argument("--order", default="desc")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    handler = MovieHandler(db)
+
+    print(f"{'page':>8} {'offset_ms':>12} {'cursor_ms':>12}")
+    try:
+        for page in args.pages:
+            offset_ms = time_call(
+                lambda: handler.query_movies_paginated(
+                    page=page, limit=args.limit, sort_by=args.sort_by, order=args.order, **FILTERS
+                ),
+                args.repeat,
+            )
+
+            cursor = cursor_for_page(handler, page, args.limit, args.sort_by, args.order)
+            if page > 1 and cursor is None:
+                print(f"{page:>8} {offset_ms:>12.2f} {'(past end)':>12}")
+                continue
+
+            cursor_ms = time_call(
+                lambda: handler.query_movies_by_cursor(
+                    limit=args.limit, cursor=cursor, sort_by=args.sort_by, order=args.order, **FILTERS
+                ),
+                args.repeat,
+            )
+            print(f"{page:>8} {offset_ms:>12.2f} {cursor_ms:>12.2f}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
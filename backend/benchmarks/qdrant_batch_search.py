@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Qdrant search latency on the live collection:
+- multi-seed: N sequential `search_similar` calls vs one `search_similar_batch`
+- candidate pool: full-payload `search_similar` vs lean `search_ids` (ids + scores)
+
+Usage (from backend/, Qdrant running with indexed movies):
+    python -m benchmarks.qdrant_batch_search --seeds 1 3 10 --top 24 --pool 2000 --rounds 20
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from app.core.qdrant import get_qdrant_client
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1, 3, 10])
+    parser.add_argument("--top", type=int, default=24)
+    parser.add_argument("--pool", type=int, default=2000, help="Candidate pool size for the payload comparison")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    qdrant = get_qdrant_client()
+    points, _ = qdrant.client.scroll(qdrant.collection_name, limit=2000, with_payload=False, with_vectors=True)
+    vectors = {int(p.id): p.vector for p in points}
+    ids = list(vectors)
+
+    print(f"{'seeds':>6} {'sequential_ms':>14} {'batch_ms':>9} {'speedup':>8}")
+    for n in args.seeds:
+        seq, batch = [], []
+        for _ in range(args.rounds):
+            seeds = random.sample(ids, n)
+
+            t0 = time.perf_counter()
+            for mid in seeds:
+                qdrant.search_similar(movie_vector=vectors[mid], top=args.top)
+            seq.append((time.perf_counter() - t0) * 1000)
+
+            t0 = time.perf_counter()
+            qdrant.search_similar_batch(seeds, top=args.top)
+            batch.append((time.perf_counter() - t0) * 1000)
+
+        s, b = np.median(seq), np.median(batch)
+        print(f"{n:>6} {s:>14.2f} {b:>9.2f} {s / b:>7.2f}x")
+
+    full, lean = [], []
+    for _ in range(args.rounds):
+        vec = vectors[random.choice(ids)]
+
+        t0 = time.perf_counter()
+        qdrant.search_similar(movie_vector=vec, top=args.pool)
+        full.append((time.perf_counter() - t0) * 1000)
+
+        t0 = time.perf_counter()
+        qdrant.search_ids(vec, top=args.pool)
+        lean.append((time.perf_counter() - t0) * 1000)
+
+    f, l = np.median(full), np.median(lean)
+    print(f"\ncandidate pool of {args.pool}: full payload {f:.2f} ms, ids + scores {l:.2f} ms ({f / l:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Filtered vector search latency against a local Qdrant: no payload indexes vs
+payload indexes vs payload indexes + quantization (with rescoring), on
+synthetic movie points shaped like the real payload.
+
+Usage (from backend/, Qdrant running at settings.qdrant.url):
+    python -m benchmarks.qdrant_filtered_search --points 50000 --queries 200
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+from qdrant_client import QdrantClient, models
+
+from app.core.qdrant import build_filter, create_movie_collection, search_params
+from app.core.settings import settings
+from app.utils.genres import TMDB_GENRES
+
+
+LANGUAGES = ["English", "Hindi", "French", "Spanish", "Japanese", "Korean", "German", "Italian", "Tamil", "Telugu"]
+
+FILTERS = {
+    "genre": lambda r: {"genres": [r.choice(TMDB_GENRES)]},
+    "language": lambda r: {"original_language": [r.choice(LANGUAGES)]},
+    "year_range": lambda r: {"release_year": {"gte": (y := r.randint(1960, 2015)), "lte": y + 5}},
+    "combined": lambda r: {
+        "genres": [r.choice(TMDB_GENRES)],
+        "original_language": [r.choice(LANGUAGES)],
+        "release_year": {"gte": (y := r.randint(1960, 2015)), "lte": y + 10},
+    },
+}
+
+VARIANTS = [
+    ("no_index", "none", False),
+    ("indexed", "none", True),
+    ("indexed_scalar", "scalar", True),
+    ("indexed_product", "product", True),
+]
+
+
+def synthetic_points(n: int, dim: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n, dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    r = random.Random(seed)
+    payloads = [
+        {
+            "id": i,
+            "genres": r.sample(TMDB_GENRES, r.randint(1, 3)),
+            "original_language": r.choices(LANGUAGES, weights=[50, 10, 8, 8, 6, 5, 5, 4, 2, 2])[0],
+            "release_year": r.randint(1950, 2025),
+            "popularity": round(r.expovariate(0.1), 3),
+        }
+        for i in range(1, n + 1)
+    ]
+    return vectors, payloads
+
+
+def wait_green(client: QdrantClient, name: str, timeout: float = 600):
+    started = time.time()
+    while client.get_collection(name).status != models.CollectionStatus.GREEN:
+        if time.time() - started > timeout:
+            raise TimeoutError(f"{name} not indexed after {timeout}s")
+        time.sleep(1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=settings.qdrant.url)
+    parser.add_argument("--points", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark collections")
+    args = parser.parse_args()
+
+    client = QdrantClient(url=args.url)
+    vectors, payloads = synthetic_points(args.points, args.dim)
+    rng = np.random.default_rng(7)
+    queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+    r = random.Random(7)
+    query_filters = {name: [make(r) for _ in range(args.queries)] for name, make in FILTERS.items()}
+
+    rows = []
+    exact_ids = {}
+    for variant, quantization, indexed in VARIANTS:
+        name = f"bench_filtered_{variant}"
+        if client.collection_exists(name):
+            client.delete_collection(name)
+        create_movie_collection(client, name, args.dim, quantization=quantization, payload_indexes=indexed)
+
+        t0 = time.perf_counter()
+        client.upload_collection(
+            collection_name=name,
+            vectors=vectors,
+            payload=payloads,
+            ids=[p["id"] for p in payloads],
+            batch_size=512,
+            parallel=2,
+        )
+        wait_green(client, name)
+        load_s = time.perf_counter() - t0
+
+        try:
+            for filter_name, filters in query_filters.items():
+                latencies, recalls = [], []
+                for i, (vec, flt) in enumerate(zip(queries, filters)):
+                    qfilter = build_filter(flt)
+                    t0 = time.perf_counter()
+                    hits = client.search(
+                        collection_name=name,
+                        query_vector=vec.tolist(),
+                        query_filter=qfilter,
+                        search_params=search_params(quantization),
+                        limit=args.top,
+                        with_payload=False,
+                    )
+                    latencies.append((time.perf_counter() - t0) * 1000)
+
+                    # Ground truth: exact search on the first (unquantized) collection
+                    key = (filter_name, i)
+                    if key not in exact_ids:
+                        exact = client.search(
+                            collection_name=name,
+                            query_vector=vec.tolist(),
+                            query_filter=qfilter,
+                            search_params=models.SearchParams(exact=True),
+                            limit=args.top,
+                            with_payload=False,
+                        )
+                        exact_ids[key] = {h.id for h in exact}
+                    if exact_ids[key]:
+                        recalls.append(len({h.id for h in hits} & exact_ids[key]) / len(exact_ids[key]))
+
+                lat = np.array(latencies)
+                rows.append((
+                    variant, filter_name, load_s,
+                    np.percentile(lat, 50), np.percentile(lat, 95),
+                    np.mean(recalls) if recalls else float("nan"),
+                ))
+        finally:
+            if not args.keep:
+                client.delete_collection(name)
+
+    print(f"{args.points} points x {args.dim} dims, {args.queries} queries per filter, top {args.top}")
+    print(f"{'variant':>16} {'filter':>11} {'load_s':>7} {'p50_ms':>7} {'p95_ms':>7} {'recall':>7}")
+    for variant, filter_name, load_s, p50, p95, recall in rows:
+        print(f"{variant:>16} {filter_name:>11} {load_s:>7.1f} {p50:>7.2f} {p95:>7.2f} {recall:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""AsyncTMDBClient against the local TMDB stub server (no network, no cache)."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core.settings import settings
+from app.pipelines.utils.tmdb_async import MAX_DISCOVER_PAGES, AsyncTMDBClient
+from app.pipelines.utils.tmdb_stub_server import PAGE_SIZE, start_stub_server
+
+
+@pytest.fixture(autouse=True)
+def no_response_cache(monkeypatch):
+    # Every request must reach the stub
+    monkeypatch.setattr(settings.tmdb, "cache_enabled", False)
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(**kwargs):
+        server, base_url = start_stub_server(**{"latency": 0.0, **kwargs})
+        servers.append(server)
+        return base_url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def run_client(base_url: str, call, **client_kwargs):
+    """Run `call(client)` inside an AsyncTMDBClient; returns (result, client, seconds)."""
+    kwargs = {"api_key": "test", "base_url": base_url, "rate": 1000, "burst": 1000, **client_kwargs}
+
+    async def main():
+        async with AsyncTMDBClient(**kwargs) as client:
+            started = time.perf_counter()
+            result = await call(client)
+            return result, client, time.perf_counter() - started
+
+    return asyncio.run(main())
+
+
+def test_429_waits_for_retry_after(stub):
+    base_url = stub(faults=[429], retry_after="1")
+
+    movie, client, elapsed = run_client(base_url, lambda c: c.fetch_movie(7))
+
+    assert movie["id"] == 7
+    assert client.retries == 1
+    assert client.requests == 2
+    assert elapsed >= 1.0
+
+
+def test_5xx_is_retried(stub):
+    base_url = stub(faults=[500, 503])
+
+    movie, client, _ = run_client(base_url, lambda c: c.fetch_movie(3), max_retries=3)
+
+    assert movie["id"] == 3
+    assert client.retries == 2
+
+
+def test_5xx_gives_up_after_max_retries(stub):
+    base_url = stub(faults=[500, 502, 503])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run_client(base_url, lambda c: c.fetch_movie(3), max_retries=2)
+
+
+def test_token_bucket_caps_request_rate(stub):
+    base_url = stub(movies=100)
+    rate, burst, n = 20, 5, 25
+
+    async def fetch_all(client):
+        return await asyncio.gather(*(client.fetch_movie(i) for i in range(1, n + 1)))
+
+    movies, client, elapsed = run_client(base_url, fetch_all, rate=rate, burst=burst, concurrency=10)
+
+    assert len(movies) == n
+    assert client.requests == n
+    # The burst is free, every further request waits for a token
+    assert elapsed >= (n - burst) / rate * 0.9
+
+
+def test_discover_stops_at_500_pages(stub):
+    pages = MAX_DISCOVER_PAGES + 50
+    base_url = stub(movies=pages * PAGE_SIZE)
+
+    ids, client, _ = run_client(base_url, lambda c: c.discover_movie_ids("2025-01-01"), concurrency=50)
+
+    assert client.requests == MAX_DISCOVER_PAGES
+    assert len(ids) == MAX_DISCOVER_PAGES * PAGE_SIZE
+    assert ids[:3] == [1, 2, 3]
@@ -202,6 +202,7 @@ export const moviesAPI = {
     page?: number;
     limit?: number;
     search_bar?: boolean;
+    cursor?: string;
   }) => {
     const sp = new URLSearchParams();
 
@@ -221,7 +222,13 @@ export const moviesAPI = {
       sp.append("language", params.language.join(","));
     }
 
-    sp.append("page", params.page?.toString() || "1");
+    // Keyset pagination (infinite scroll): pass next_cursor from the previous page
+    if (params.cursor !== undefined) {
+      sp.append("pagination", "cursor");
+      if (params.cursor) sp.append("cursor", params.cursor);
+    } else {
+      sp.append("page", params.page?.toString() || "1");
+    }
     sp.append("limit", params.limit?.toString() || "50");
 
     const response = await api.get(`/movies/explore?${sp.toString()}`);
@@ -295,7 +302,8 @@ export const recommendationsAPI = {
 
 export const userAPI = {
   stats: () => api.get("/feedbacks/stats"),
-  getWatchlist: () => api.get("/feedbacks/watchlist"),
+  getWatchlist: (params?: { limit?: number; cursor?: string }) =>
+    api.get("/feedbacks/watchlist", { params }),
 };
 
 export default api;
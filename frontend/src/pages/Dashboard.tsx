@@ -1,9 +1,9 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import Navbar from "@/components/Navbar";
 import Footer from "@/components/Footer";
 import DashboardMovieCard from "@/components/DashboardMovieCard";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
-import { Carousel, CarouselContent, CarouselItem, CarouselNext, CarouselPrevious } from "@/components/ui/carousel";
+import { Carousel, CarouselContent, CarouselItem, CarouselNext, CarouselPrevious, type CarouselApi } from "@/components/ui/carousel";
 import { Sparkles } from "lucide-react";
 import { recommendationsAPI, userAPI } from "@/lib/api";
 import { toast } from "sonner";
@@ -13,6 +13,7 @@ import MoreLikeThisModal from "@/components/MoreLikeThisModal";
 import type { MovieDB } from "@/types";
 
 const TMDB_IMAGE_BASE = "https://image.tmdb.org/t/p/w500";
+const WATCHLIST_PAGE_SIZE = 50;
 
 import { useStatsStore } from "@/stores/statsStore";
 import { useAuthStore } from "@/stores/authStore";
@@ -22,6 +23,10 @@ export default function Dashboard() {
   const [personalized, setPersonalized] = useState<MovieDB[]>([]);
   const [recentActivityRecs, setRecentActivityRecs] = useState<MovieDB[]>([]);
   const [watchlist, setWatchlist] = useState<MovieDB[]>([]);
+  const [watchlistCursor, setWatchlistCursor] = useState<string | null>(null);
+  const [watchlistApi, setWatchlistApi] = useState<CarouselApi>();
+  const watchlistRequest = useRef(0);
+  const watchlistLoading = useRef(false);
 
   const [selectedTmdbId, setSelectedTmdbId] = useState<number | null>(null);
 
@@ -103,30 +108,52 @@ export default function Dashboard() {
   // ------------------------------------
   // Watchlist
   // ------------------------------------
-  const fetchWatchlist = async () => {
+  // No cursor: (re)load the first page; with a cursor: append the next page
+  const fetchWatchlist = async (cursor?: string) => {
+    if (cursor && watchlistLoading.current) return;
+    const request = ++watchlistRequest.current;
+    watchlistLoading.current = true;
     try {
-      const res = await userAPI.getWatchlist();
+      const res = await userAPI.getWatchlist({ limit: WATCHLIST_PAGE_SIZE, cursor });
+      // A reload started meanwhile owns the list now
+      if (request !== watchlistRequest.current) return;
       if (res.data?.status === "success") {
-        setWatchlist(
-          res.data.data.map((m: any) => ({
-            id: m.id,
-            tmdbId: m.movie?.tmdb_id || m.tmdb_id,
-            title: m.title || m.movie?.title, // if joined
-            overview: m.overview || m.movie?.overview || "",
-            genres: Array.isArray(m.genres) ? m.genres.join(", ") : m.genres ?? "",
-            poster_url: m.poster_path ? `${TMDB_IMAGE_BASE}${m.poster_path}` : (m.movie?.poster_path ? `${TMDB_IMAGE_BASE}${m.movie.poster_path}` : "/poster-not-found.png"),
-            release_year: m.release_year || m.movie?.release_year || "",
-            popularity: m.popularity || m.movie?.popularity
-          }))
-        );
+        const { items, next_cursor, has_more } = res.data.data;
+        const page: MovieDB[] = items.map((m: any) => ({
+          id: m.id,
+          tmdbId: m.movie?.tmdb_id || m.tmdb_id,
+          title: m.title || m.movie?.title, // if joined
+          overview: m.overview || m.movie?.overview || "",
+          genres: Array.isArray(m.genres) ? m.genres.join(", ") : m.genres ?? "",
+          poster_url: m.poster_path ? `${TMDB_IMAGE_BASE}${m.poster_path}` : (m.movie?.poster_path ? `${TMDB_IMAGE_BASE}${m.movie.poster_path}` : "/poster-not-found.png"),
+          release_year: m.release_year || m.movie?.release_year || "",
+          popularity: m.popularity || m.movie?.popularity
+        }));
+        setWatchlist((prev) => (cursor ? [...prev, ...page] : page));
+        setWatchlistCursor(has_more ? next_cursor : null);
       }
-    } catch { }
+    } catch { } finally {
+      if (request === watchlistRequest.current) watchlistLoading.current = false;
+    }
   };
 
   useEffect(() => {
     fetchWatchlist();
   }, []);
 
+  // Load the next page as the carousel approaches the end of the loaded items
+  useEffect(() => {
+    if (!watchlistApi || !watchlistCursor) return;
+    const onSelect = () => {
+      const remaining = watchlistApi.scrollSnapList().length - 1 - watchlistApi.selectedScrollSnap();
+      if (remaining <= 2) fetchWatchlist(watchlistCursor);
+    };
+    watchlistApi.on("select", onSelect);
+    return () => {
+      watchlistApi.off("select", onSelect);
+    };
+  }, [watchlistApi, watchlistCursor]);
+
   const handleMoreLikeThis = (movie: MovieDB) => {
     setMoreLikeThisMovie({ id: movie.id, title: movie.title });
     setMoreLikeThisOpen(true);
@@ -260,6 +287,7 @@ export default function Dashboard() {
               </h2>
 
               <Carousel
+                setApi={setWatchlistApi}
                 opts={{ align: "start", loop: true }}
                 plugins={[Autoplay({ delay: 3500, stopOnInteraction: false, stopOnMouseEnter: true })]}
                 className="w-full"
@@ -292,7 +320,7 @@ export default function Dashboard() {
           <MovieModal
             tmdbId={selectedTmdbId}
             onClose={() => setSelectedTmdbId(null)}
-            onWatchlistUpdate={fetchWatchlist}
+            onWatchlistUpdate={() => fetchWatchlist()}
           />
         )
       }